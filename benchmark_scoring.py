@@ -0,0 +1,227 @@
+import os
+import io
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime
+import numpy as np
+import psutil
+import torch
+import cosine_sim
+from cosine_sim import preprocess, preprocess_batch, calculate_similarity_scores, get_model
+
+# Same intent sentences the scrapers score against
+BENCHMARK_INTENTS = [
+    "What are the latest AI breakthroughs?",
+    "How can AI improve productivity?",
+    "Will AI replace human jobs?",
+    "What are the ethical concerns of AI?",
+    "What is the best AI model for my use case?",
+    "How can AI help small businesses grow?",
+    "Which AI tools are worth using in 2025?",
+    "Best AI research papers to read this year?",
+    "How can I start learning AI development?",
+    "What's the future of AI in creative industries?",
+]
+
+# Vocabulary for synthetic posts: common English filler (mostly stopwords) mixed
+# with the kind of topical words, hashtags and links found in scraped AI posts
+FILLER_WORDS = [
+    "the", "a", "an", "and", "or", "but", "is", "are", "was", "were", "to", "of",
+    "in", "on", "for", "with", "this", "that", "it", "we", "you", "they", "our",
+    "your", "what", "how", "can", "will", "just", "not", "so", "very", "more",
+]
+TOPIC_WORDS = [
+    "AI", "artificial", "intelligence", "model", "models", "data", "learning",
+    "machine", "deep", "GPT", "LLM", "agents", "productivity", "jobs", "future",
+    "ethics", "research", "paper", "startup", "tools", "2025", "breakthrough",
+    "automation", "creative", "business", "growth", "Python", "course", "free",
+    "hashtag#AI", "hashtag#MachineLearning", "https://lnkd.in/gBjbwiZW", "👇", "🔥",
+]
+
+
+def synthetic_posts(n, min_words=5, max_words=60, seed=0):
+    """Generate n post-like strings, with a few empty and duplicate entries like real scrapes."""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.01:
+            posts.append(rng.choice(["", "   ", None]))
+        elif roll < 0.05 and posts:
+            posts.append(rng.choice(posts))  # reposts
+        else:
+            words = [rng.choice(FILLER_WORDS if rng.random() < 0.45 else TOPIC_WORDS)
+                     for _ in range(rng.randint(min_words, max_words))]
+            posts.append(" ".join(words) + rng.choice(["", ".", "!", "?", " ..."]))
+    return posts
+
+
+def benchmark_preprocess(n=100_000, seed=0):
+    """Time preprocess (one text at a time) against preprocess_batch on n synthetic posts."""
+    posts = synthetic_posts(n, seed=seed)
+    preprocess_batch(posts[:10])  # load stopwords outside the timed region
+
+    start = time.perf_counter()
+    expected = [preprocess(post) for post in posts]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = preprocess_batch(posts)
+    batch_seconds = time.perf_counter() - start
+
+    if actual != expected:
+        raise AssertionError("preprocess_batch output differs from preprocess")
+
+    result = {
+        "texts": n,
+        "preprocess_seconds": round(loop_seconds, 4),
+        "preprocess_batch_seconds": round(batch_seconds, 4),
+        "speedup": round(loop_seconds / batch_seconds, 2) if batch_seconds else None,
+    }
+    print(f"preprocess: {loop_seconds:.3f}s, preprocess_batch: {batch_seconds:.3f}s "
+          f"on {n} posts ({result['speedup']}x)")
+    return result
+
+
+def synthetic_comments(n, seed=0):
+    """Generate n reply/comment-like strings (short, 2-20 words)."""
+    return synthetic_posts(n, min_words=2, max_words=20, seed=seed)
+
+
+class PeakRSS:
+    """Samples this process's resident set size in a background thread and keeps the peak."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def run_stage(name, func, texts, batch_size):
+    """
+    Run `func` over `texts` in batches and report throughput, per-batch latency
+    percentiles and peak RSS. Anything the stage prints is swallowed.
+    """
+    latencies = []
+    with PeakRSS() as rss, redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for offset in range(0, len(texts), batch_size):
+            batch_start = time.perf_counter()
+            func(texts[offset:offset + batch_size])
+            latencies.append(time.perf_counter() - batch_start)
+        total = time.perf_counter() - start
+
+    result = {
+        "stage": name,
+        "texts": len(texts),
+        "batches": len(latencies),
+        "seconds": round(total, 4),
+        "texts_per_sec": round(len(texts) / total, 1) if total else None,
+        "p50_batch_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p99_batch_ms": round(float(np.percentile(latencies, 99)) * 1000, 3),
+        "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+    }
+    print(f"{name:<32} {result['texts_per_sec']:>10} texts/s  p50 {result['p50_batch_ms']:>9} ms  "
+          f"p99 {result['p99_batch_ms']:>9} ms  peak RSS {result['peak_rss_mb']} MB")
+    return result
+
+
+def run_benchmarks(n_posts=2000, n_comments=5000, batch_size=64, seed=0, use_cache=False):
+    """Benchmark every stage of the scoring path on synthetic posts and comments."""
+    if not use_cache:
+        # Measure the model, not the on-disk embedding cache
+        cosine_sim.EMBEDDING_CACHE_DIR = ""
+
+    # Load the model, stopwords and intent bank before anything is timed
+    with redirect_stdout(io.StringIO()):
+        cosine_sim.preload(BENCHMARK_INTENTS)
+    model = get_model()
+
+    corpora = {
+        "posts": synthetic_posts(n_posts, seed=seed),
+        "comments": synthetic_comments(n_comments, seed=seed + 1),
+    }
+    stages = [
+        ("preprocess", lambda batch: [preprocess(text) for text in batch]),
+        ("preprocess_batch", preprocess_batch),
+        ("model.encode", lambda batch: model.encode(preprocess_batch(batch), batch_size=batch_size)),
+        ("calculate_similarity_scores", lambda batch: calculate_similarity_scores(batch, BENCHMARK_INTENTS)),
+    ]
+
+    results = []
+    for corpus_name, texts in corpora.items():
+        print(f"\n{corpus_name}: {len(texts)} texts, batch size {batch_size}")
+        for stage_name, func in stages:
+            result = run_stage(stage_name, func, texts, batch_size)
+            result["corpus"] = corpus_name
+            results.append(result)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "model": cosine_sim.embedding_model_id(),
+            "backend": cosine_sim.EMBEDDING_BACKEND,
+            "embedding_workers": cosine_sim.EMBEDDING_WORKERS,
+            "torch_threads": torch.get_num_threads(),
+            "embedding_cache": use_cache,
+            "batch_size": batch_size,
+            "n_posts": n_posts,
+            "n_comments": n_comments,
+            "seed": seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cosine_sim scoring path")
+    parser.add_argument("--posts", type=int, default=2000, help="number of synthetic posts")
+    parser.add_argument("--comments", type=int, default=5000, help="number of synthetic comments")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--use-cache", action="store_true", help="keep the on-disk embedding cache enabled")
+    parser.add_argument("--preprocess-only", action="store_true",
+                        help="only compare preprocess and preprocess_batch on 100k posts")
+    parser.add_argument("--output", default=None, help="JSON results path (default benchmark_results/<time>.json)")
+    args = parser.parse_args()
+
+    if args.preprocess_only:
+        report = {"timestamp": datetime.now().isoformat(timespec="seconds"),
+                  "results": [benchmark_preprocess(seed=args.seed)]}
+    else:
+        report = run_benchmarks(args.posts, args.comments, args.batch_size, args.seed, args.use_cache)
+
+    output = args.output or os.path.join("benchmark_results", f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
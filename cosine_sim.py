@@ -1,23 +1,131 @@
 import time
+import os
+import hashlib
+import json
+import atexit
+import struct
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from itertools import filterfalse
 import psutil
 from datetime import datetime
 import requests
 import pandas as pd
 import io
 import re
+import numpy as np
 import torch
-import nltk
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer, util
+import torch.nn.functional as F
 
-# Download stopwords if not already present
-nltk.download("stopwords")
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-# Load stopwords from nltk
-STOP_WORDS = set(stopwords.words("english"))
+# NLP model used for every embedding. The model and the nltk stopwords are
+# only loaded the first time they are needed (see get_model / get_stop_words),
+# so importing this module stays cheap and works offline.
+MODEL_NAME = "paraphrase-MiniLM-L6-v2"
 
-# Load NLP model
-model = SentenceTransformer("paraphrase-MiniLM-L6-v2")
+# Inference backend for the model: "fp32" (default), "int8" (dynamic
+# quantization of the Linear layers) or "onnx" (needs optimum[onnxruntime]).
+# Use check_backend_drift() to see how far a backend moves the scores.
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "fp32")
+EMBEDDING_BACKENDS = ("fp32", "int8", "onnx")
+
+_model = None
+_stop_words = None
+_load_lock = threading.Lock()
+
+def load_model(backend=None, model_name=None):
+    """Build a fresh SentenceTransformer running on the given inference backend."""
+    from sentence_transformers import SentenceTransformer
+
+    backend = backend or EMBEDDING_BACKEND
+    model_name = model_name or MODEL_NAME
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {EMBEDDING_BACKENDS}")
+    print(f"Loading sentence model {model_name} ({backend})...")
+
+    if backend == "onnx":
+        # Exported to ONNX on first load; needs sentence-transformers>=3.2 with optimum[onnxruntime]
+        return SentenceTransformer(model_name, backend="onnx")
+
+    if backend == "int8":
+        # Dynamic int8 quantization only runs on CPU
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return SentenceTransformer(model_name)
+
+def embedding_model_id(backend=None):
+    """Name identifying the model and backend, used to key the on-disk caches."""
+    backend = backend or EMBEDDING_BACKEND
+    return MODEL_NAME if backend == "fp32" else f"{MODEL_NAME}-{backend}"
+
+def get_model():
+    """Return the SentenceTransformer, loading it on first use."""
+    global _model
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                _model = load_model()
+    return _model
+
+def get_stop_words():
+    """Return the English stopword set, downloading it only if nltk doesn't have it yet."""
+    global _stop_words
+    if _stop_words is None:
+        with _load_lock:
+            if _stop_words is None:
+                import nltk
+                from nltk.corpus import stopwords
+                try:
+                    words = stopwords.words("english")
+                except LookupError:
+                    nltk.download("stopwords", quiet=True)
+                    words = stopwords.words("english")
+                _stop_words = set(words)
+    return _stop_words
+
+def preload(intents=None):
+    """
+    Load the model and stopwords up front (and embed `intents` if given), for
+    long-running workers that would rather pay the start-up cost before the
+    first batch arrives.
+    """
+    get_stop_words()
+    get_model()
+    if intents:
+        get_intent_bank(intents).embeddings
+
+def __getattr__(name):
+    # Keep `cosine_sim.model` and `cosine_sim.STOP_WORDS` working for callers
+    # that used the old module-level globals.
+    if name == "model":
+        return get_model()
+    if name == "STOP_WORDS":
+        return get_stop_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Directory where embedded intent banks are persisted between runs
+INTENT_CACHE_DIR = os.environ.get("INTENT_CACHE_DIR", ".intent_cache")
+
+# On-disk cache of embeddings for scraped text (set EMBEDDING_CACHE_DIR="" to disable)
+EMBEDDING_CACHE_DIR = os.environ.get("EMBEDDING_CACHE_DIR", ".embedding_cache")
+EMBEDDING_CACHE_SIZE = int(os.environ.get("EMBEDDING_CACHE_SIZE", "100000"))
+# New entries written between flushes to disk (the cache is also flushed at exit)
+EMBEDDING_CACHE_FLUSH_EVERY = int(os.environ.get("EMBEDDING_CACHE_FLUSH_EVERY", "1000"))
+
+# Intent banks at least this large are searched with an approximate index
+INTENT_ANN_THRESHOLD = int(os.environ.get("INTENT_ANN_THRESHOLD", "5000"))
+INTENT_INDEX_BACKEND = os.environ.get("INTENT_INDEX_BACKEND", "auto")  # auto, faiss, hnswlib or ivf
+
+# Encode scraped text in a pool of CPU worker processes when EMBEDDING_WORKERS > 0
+EMBEDDING_WORKERS = int(os.environ.get("EMBEDDING_WORKERS", "0"))
+EMBEDDING_TORCH_THREADS = int(os.environ.get("EMBEDDING_TORCH_THREADS", "1"))
 
 # Function to preprocess text
 def preprocess(text):
@@ -26,36 +134,806 @@ def preprocess(text):
     
     # Tokenization using regex (alternative to Spacy)
     tokens = re.findall(r'\b\w+\b', text.lower())  # Extract words only
-    tokens = [word for word in tokens if word not in STOP_WORDS]  # Remove stopwords
+    stop_words = get_stop_words()
+    tokens = [word for word in tokens if word not in stop_words]  # Remove stopwords
 
     return " ".join(tokens) if tokens else "empty_text"
 
+# Same tokens as preprocess's r'\b\w+\b' (a greedy \w+ run is always bounded by
+# \b on both sides), without the boundary checks, compiled once for batch use
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# For pure-ASCII text, \w is [a-z0-9_] once lowercased, so mapping every other
+# ASCII character to a space and splitting gives the same tokens much faster
+_ASCII_NON_WORD = str.maketrans({c: " " for c in range(128) if not (chr(c).isalnum() or chr(c) == "_")})
+
+def preprocess_batch(texts):
+    """
+    Preprocess a list (or pandas Series) of texts in one pass.
+
+    Output is identical to calling preprocess on each text, including the
+    "empty_text" placeholder. ASCII texts are tokenized with str.translate
+    instead of the regex, stopwords are filtered at C level and repeated texts
+    are only processed once. A Series comes back as a Series with the same
+    index, anything else as a list.
+    """
+    is_stop_word = get_stop_words().__contains__
+    find_tokens = TOKEN_PATTERN.findall
+    join = " ".join
+
+    values = texts.tolist() if isinstance(texts, pd.Series) else list(texts)
+    seen = {}
+    results = []
+    for text in values:
+        if not isinstance(text, str):
+            results.append("empty_text")
+            continue
+        result = seen.get(text)
+        if result is None:
+            lowered = text.lower()
+            tokens = lowered.translate(_ASCII_NON_WORD).split() if lowered.isascii() else find_tokens(lowered)
+            result = join(filterfalse(is_stop_word, tokens)) or "empty_text"
+            seen[text] = result
+        results.append(result)
+
+    if isinstance(texts, pd.Series):
+        return pd.Series(results, index=texts.index, name=texts.name)
+    return results
+
 # Function to calculate cosine similarity
 def calculate_similarity(embedding1, embedding2):
+    from sentence_transformers import util
     return util.pytorch_cos_sim(embedding1, embedding2)
 
+class IntentBank:
+    """
+    Holds the normalized embeddings of a fixed list of intent sentences.
+
+    The intents are encoded once per process and saved to disk under a key made
+    from the model name and a hash of the sentences, so a restart with the same
+    intents loads the tensor instead of running the model again.
+    """
+
+    def __init__(self, intents, model_name=None, cache_dir=INTENT_CACHE_DIR):
+        model_name = model_name or embedding_model_id()
+        self.intents = list(intents)
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.key = intent_bank_key(self.intents, model_name)
+        self._embeddings = None
+
+    def __len__(self):
+        return len(self.intents)
+
+    @property
+    def cache_path(self):
+        safe_model_name = re.sub(r'[^\w.-]', '_', self.model_name)
+        return os.path.join(self.cache_dir, f"{safe_model_name}_{self.key[:16]}.pt")
+
+    @property
+    def embeddings(self):
+        """Normalized intent embeddings, loaded from disk or encoded on first use."""
+        if self._embeddings is None:
+            self._embeddings = self._load()
+            if self._embeddings is None:
+                self._embeddings = self._encode()
+                self._save()
+        return self._embeddings
+
+    def _encode(self):
+        preprocessed = preprocess_batch(self.intents)
+        embeddings = get_model().encode(preprocessed, convert_to_tensor=True)
+        return F.normalize(embeddings, p=2, dim=1)
+
+    def _load(self):
+        if not self.cache_dir or not os.path.exists(self.cache_path):
+            return None
+        try:
+            cached = torch.load(self.cache_path, map_location="cpu")
+            if cached.get("key") != self.key:
+                return None
+            return cached["embeddings"]
+        except Exception as e:
+            print(f"Ignoring unreadable intent cache {self.cache_path}: {str(e)}")
+            return None
+
+    def _save(self):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            torch.save({"key": self.key, "embeddings": self._embeddings.cpu()}, tmp_path)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"Could not save intent cache {self.cache_path}: {str(e)}")
+
+    def scores(self, embeddings):
+        """Cosine similarity between already computed embeddings and every intent."""
+        bank = self.embeddings.to(embeddings.device)
+        return torch.mm(F.normalize(embeddings, p=2, dim=1), bank.transpose(0, 1))
+
+
+def intent_bank_key(intents, model_name=None):
+    """Hash identifying a model and an ordered list of intent sentences."""
+    model_name = model_name or embedding_model_id()
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for intent in intents:
+        digest.update(b"\0")
+        digest.update(str(intent).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Intent banks already built in this process, keyed by intent_bank_key
+_intent_banks = {}
+
+def get_intent_bank(intents):
+    """Return the shared IntentBank for this list of intent sentences."""
+    key = intent_bank_key(intents)
+    bank = _intent_banks.get(key)
+    if bank is None:
+        bank = IntentBank(intents)
+        _intent_banks[key] = bank
+    return bank
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _top_k(similarities, k):
+    """Row-wise top-k (indices, scores) of a 2-D similarity array, best first."""
+    k = min(k, similarities.shape[1])
+    if k < similarities.shape[1]:
+        candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(similarities.shape[1]), (similarities.shape[0], 1))
+    candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    indices = np.take_along_axis(candidates, order, axis=1)
+    return indices.astype(np.int64), np.take_along_axis(candidate_scores, order, axis=1).astype(np.float32)
+
+
+class _IVFIndex:
+    """
+    Inverted-file index in plain NumPy: intents are clustered with spherical
+    k-means and a query only scores the intents in its `nprobe` closest clusters.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, vectors, nlist=None, nprobe=8, iterations=10, seed=0, centroids=None):
+        self.vectors = vectors
+        self.nlist = nlist or max(1, int(np.sqrt(len(vectors))))
+        self.nprobe = min(nprobe, self.nlist)
+        self.centroids = centroids if centroids is not None else self._train(iterations, seed)
+        self.trained_size = len(vectors)
+        self.lists = [np.empty(0, dtype=np.int64) for _ in range(self.nlist)]
+        self._assign_lists(np.arange(len(vectors)))
+
+    def _train(self, iterations, seed):
+        rng = np.random.default_rng(seed)
+        # k-means on a sample is plenty to place the centroids
+        sample_size = min(len(self.vectors), 256 * self.nlist)
+        sample = self.vectors[rng.choice(len(self.vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=self.nlist)
+            filled = counts > 0
+            centroids[filled] = _normalize_rows(sums[filled])
+        return centroids
+
+    def _assign_lists(self, ids):
+        assignments = np.argmax(self.vectors[ids] @ self.centroids.T, axis=1)
+        for cluster in np.unique(assignments):
+            self.lists[cluster] = np.concatenate([self.lists[cluster], ids[assignments == cluster]])
+
+    def add(self, vectors):
+        start = len(self.vectors)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self._assign_lists(np.arange(start, len(self.vectors)))
+
+    def search(self, queries, k):
+        probes = _top_k(queries @ self.centroids.T, self.nprobe)[0]
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.empty((len(queries), k), dtype=np.float32)
+        for row, query in enumerate(queries):
+            candidates = np.concatenate([self.lists[cluster] for cluster in probes[row]])
+            if len(candidates) < k:
+                # Too few intents in the probed clusters, fall back to a full scan
+                candidates = np.arange(len(self.vectors))
+            top_indices, top_scores = _top_k((self.vectors[candidates] @ query).reshape(1, -1), k)
+            indices[row] = candidates[top_indices[0]]
+            scores[row] = top_scores[0]
+        return indices, scores
+
+
+class _FaissIndex:
+    """HNSW graph from faiss, used when faiss is installed."""
+
+    kind = "faiss"
+
+    def __init__(self, vectors):
+        import faiss
+        self.index = faiss.IndexHNSWFlat(vectors.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        self.index.add(vectors)
+
+    def add(self, vectors):
+        self.index.add(vectors)
+
+    def search(self, queries, k):
+        self.index.hnsw.efSearch = max(64, k)
+        scores, indices = self.index.search(queries, k)
+        return indices.astype(np.int64), scores.astype(np.float32)
+
+
+class _HnswlibIndex:
+    """HNSW graph from hnswlib, used when hnswlib is installed and faiss isn't."""
+
+    kind = "hnswlib"
+
+    def __init__(self, vectors):
+        import hnswlib
+        self.index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        self.index.init_index(max_elements=max(1024, 2 * len(vectors)), ef_construction=200, M=16)
+        self.size = 0
+        self.add(vectors)
+
+    def add(self, vectors):
+        if self.size + len(vectors) > self.index.get_max_elements():
+            self.index.resize_index(2 * (self.size + len(vectors)))
+        self.index.add_items(vectors, np.arange(self.size, self.size + len(vectors)))
+        self.size += len(vectors)
+
+    def search(self, queries, k):
+        self.index.set_ef(max(64, k))
+        labels, distances = self.index.knn_query(queries, k=k)
+        # hnswlib's "ip" space reports 1 - inner product
+        return labels.astype(np.int64), (1.0 - distances).astype(np.float32)
+
+
+def _build_ann_index(vectors, backend):
+    """Build the approximate index for `backend` ("auto", "faiss", "hnswlib" or "ivf")."""
+    if backend in ("auto", "faiss"):
+        try:
+            return _FaissIndex(vectors)
+        except ImportError:
+            if backend == "faiss":
+                raise
+    if backend in ("auto", "hnswlib"):
+        try:
+            return _HnswlibIndex(vectors)
+        except ImportError:
+            if backend == "hnswlib":
+                raise
+    return _IVFIndex(vectors)
+
+
+class IntentIndex:
+    """
+    Searchable bank of intent sentences.
+
+    Small banks are searched exactly with one matrix product. Once the bank
+    reaches `ann_threshold` intents an approximate nearest-neighbour index is
+    built (faiss or hnswlib when installed, otherwise a NumPy IVF index), and
+    later additions go straight into it.
+    """
+
+    def __init__(self, ann_threshold=INTENT_ANN_THRESHOLD, backend=INTENT_INDEX_BACKEND):
+        self.ann_threshold = ann_threshold
+        self.backend = backend
+        self.intents = []
+        self.vectors = None
+        self._ann = None
+
+    def __len__(self):
+        return len(self.intents)
+
+    @property
+    def is_approximate(self):
+        return self._ann is not None
+
+    def add(self, intents, embeddings=None):
+        """Add intent sentences, embedding them unless `embeddings` is given."""
+        intents = list(intents)
+        if not intents:
+            return
+        if embeddings is None:
+            embeddings = get_model().encode(preprocess_batch(intents), convert_to_numpy=True)
+        elif isinstance(embeddings, torch.Tensor):
+            embeddings = embeddings.cpu().numpy()
+        vectors = _normalize_rows(embeddings)
+
+        self.intents.extend(intents)
+        self.vectors = vectors if self.vectors is None else np.vstack([self.vectors, vectors])
+        if self._ann is not None:
+            self._ann.add(vectors)
+            if isinstance(self._ann, _IVFIndex) and len(self.vectors) > 4 * self._ann.trained_size:
+                # The bank has outgrown its clusters, retrain them
+                self._ann = _IVFIndex(self.vectors, nprobe=self._ann.nprobe)
+        elif len(self.intents) >= self.ann_threshold:
+            print(f"Intent bank reached {len(self.intents)} intents, building approximate index")
+            self._ann = _build_ann_index(self.vectors, self.backend)
+
+    def search(self, embeddings, k=1):
+        """Top-k (indices, scores) NumPy arrays for each query embedding, best first."""
+        if isinstance(embeddings, torch.Tensor):
+            embeddings = embeddings.cpu().numpy()
+        queries = _normalize_rows(embeddings)
+        k = max(1, min(k, len(self.intents)))
+        if not len(queries) or self.vectors is None:
+            return np.empty((0, k), dtype=np.int64), np.empty((0, k), dtype=np.float32)
+        if self._ann is None:
+            return _top_k(queries @ self.vectors.T, k)
+        return self._ann.search(queries, k)
+
+    def save(self, path):
+        """Save intents, vectors and any IVF clustering to an .npz file."""
+        state = {
+            "intents": np.array(json.dumps(self.intents)),
+            "vectors": self.vectors if self.vectors is not None else np.empty((0, 0), dtype=np.float32),
+            "ann_threshold": np.array(self.ann_threshold),
+            "backend": np.array(self.backend),
+        }
+        if isinstance(self._ann, _IVFIndex):
+            state["centroids"] = self._ann.centroids
+            state["nprobe"] = np.array(self._ann.nprobe)
+        np.savez(path, **state)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save(). HNSW graphs are rebuilt from the vectors."""
+        with np.load(path) as state:
+            index = cls(ann_threshold=int(state["ann_threshold"]), backend=str(state["backend"]))
+            index.intents = json.loads(str(state["intents"]))
+            if index.intents:
+                index.vectors = state["vectors"]
+            if "centroids" in state:
+                index._ann = _IVFIndex(index.vectors, nlist=len(state["centroids"]),
+                                       nprobe=int(state["nprobe"]), centroids=state["centroids"])
+            elif len(index.intents) >= index.ann_threshold:
+                index._ann = _build_ann_index(index.vectors, index.backend)
+        return index
+
+
+# Intent indexes already built in this process, keyed by intent_bank_key
+_intent_indexes = {}
+
+def get_intent_index(intents):
+    """Return the shared IntentIndex for this list of intent sentences."""
+    key = intent_bank_key(intents)
+    index = _intent_indexes.get(key)
+    if index is None:
+        index = IntentIndex()
+        index.add(intents, embeddings=get_intent_bank(intents).embeddings)
+        _intent_indexes[key] = index
+    return index
+
+
+def text_key(preprocessed_text):
+    """Content hash used to address a preprocessed text in the embedding cache."""
+    return hashlib.sha1(preprocessed_text.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on path shared by every process on this machine (fcntl, or msvcrt on Windows)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingCache:
+    """
+    Bounded, content-addressed cache of text embeddings, shared by every process
+    using the same cache directory (e.g. the Twitter and LinkedIn scrapers).
+
+    Vectors live in a memory-mapped float32 matrix with one row per slot. A second
+    memory-mapped file holds the key (text hash) stored in each row, next to a
+    header with the next free row. Rows are allocated and written under a file
+    lock, and every read checks the row's key before and after copying the
+    vector, so a row another process has reused reads as a miss instead of
+    returning the wrong embedding. Each process keeps its own LRU view of the
+    rows; when the cache is full its least recently used row is reused.
+    """
+
+    KEYS_HEADER = struct.Struct("<8sQQQQ")  # magic, capacity, dim, next free row, eviction clock
+    KEYS_MAGIC = b"IBEMBED1"
+    KEY_BYTES = 20  # sha1 digest
+
+    def __init__(self, cache_dir=EMBEDDING_CACHE_DIR, model_name=None, capacity=EMBEDDING_CACHE_SIZE,
+                 flush_every=EMBEDDING_CACHE_FLUSH_EVERY):
+        model_name = model_name or embedding_model_id()
+        self.cache_dir = cache_dir
+        self.capacity = capacity
+        self.flush_every = flush_every
+        safe_model_name = re.sub(r'[^\w.-]', '_', model_name)
+        self.matrix_path = os.path.join(cache_dir, f"{safe_model_name}_embeddings.f32")
+        self.keys_path = os.path.join(cache_dir, f"{safe_model_name}_keys.bin")
+        self.lock_path = os.path.join(cache_dir, f"{safe_model_name}.lock")
+        self.hits = 0
+        self.misses = 0
+        self.dim = None
+        self._slots = OrderedDict()  # text hash -> row in the matrix, oldest first (this process's view)
+        self._matrix = None
+        self._keys = None
+        self._unflushed = 0  # entries written since the last flush
+        self._lock = threading.Lock()
+        self._open_existing()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def _open_existing(self):
+        """Map the cache files if another run created them, and index the rows they hold."""
+        if not os.path.exists(self.keys_path) or not os.path.exists(self.matrix_path):
+            return
+        try:
+            with _file_lock(self.lock_path):
+                self._map_files()
+        except Exception as e:
+            print(f"Ignoring unreadable embedding cache {self.keys_path}: {str(e)}")
+            self.dim = None
+            self._slots = OrderedDict()
+            self._matrix = None
+            self._keys = None
+
+    def _map_files(self, dim=None):
+        """
+        Map both files, creating them for dim if they don't exist yet. Never truncates:
+        files are only ever created or grown. Call with the file lock held.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        header_size = self.KEYS_HEADER.size
+        if not os.path.exists(self.keys_path) or os.path.getsize(self.keys_path) < header_size:
+            if dim is None:
+                return
+            with open(self.keys_path, "wb") as f:
+                f.write(self.KEYS_HEADER.pack(self.KEYS_MAGIC, self.capacity, dim, 0, 0))
+                f.truncate(header_size + self.capacity * self.KEY_BYTES)
+        with open(self.keys_path, "rb") as f:
+            magic, capacity, file_dim, _, _ = self.KEYS_HEADER.unpack(f.read(header_size))
+        if magic != self.KEYS_MAGIC:
+            raise ValueError("not an embedding cache key file")
+        if capacity != self.capacity:
+            raise ValueError(f"cache was created with capacity {capacity}, not {self.capacity}")
+
+        matrix_size = capacity * file_dim * 4
+        with open(self.matrix_path, "ab") as f:
+            if f.tell() < matrix_size:
+                f.truncate(matrix_size)
+        self.dim = file_dim
+        self._keys = np.memmap(self.keys_path, dtype=np.uint8, mode="r+")
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(capacity, file_dim))
+
+        # Index every row some process has filled
+        next_row = self._header()[3]
+        rows = np.asarray(self._keys[header_size:header_size + next_row * self.KEY_BYTES]).reshape(-1, self.KEY_BYTES)
+        self._slots = OrderedDict((row.tobytes().hex(), slot) for slot, row in enumerate(rows) if row.any())
+
+    def _header(self):
+        return self.KEYS_HEADER.unpack(self._keys[:self.KEYS_HEADER.size].tobytes())
+
+    def _set_header(self, next_row, clock):
+        self._keys[:self.KEYS_HEADER.size] = np.frombuffer(
+            self.KEYS_HEADER.pack(self.KEYS_MAGIC, self.capacity, self.dim, next_row, clock), dtype=np.uint8)
+
+    def _row_key(self, slot):
+        start = self.KEYS_HEADER.size + slot * self.KEY_BYTES
+        return self._keys[start:start + self.KEY_BYTES].tobytes()
+
+    def _set_row_key(self, slot, key_bytes):
+        start = self.KEYS_HEADER.size + slot * self.KEY_BYTES
+        self._keys[start:start + self.KEY_BYTES] = np.frombuffer(key_bytes, dtype=np.uint8)
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys that are cached, updating LRU order and counters."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    # The row must hold this key before and after the copy; otherwise
+                    # another process reused it and this entry is gone
+                    key_bytes = bytes.fromhex(key)
+                    if self._row_key(slot) == key_bytes:
+                        vector = np.array(self._matrix[slot])
+                        if self._row_key(slot) == key_bytes:
+                            self.hits += 1
+                            self._slots.move_to_end(key)
+                            found[key] = vector
+                            continue
+                    del self._slots[key]
+                self.misses += 1
+        return found
+
+    def _allocate(self):
+        """A row for a new entry: the next unused one, else this process's least recently used. Needs the file lock."""
+        next_row, clock = self._header()[3:]
+        if next_row < self.capacity:
+            self._set_header(next_row + 1, clock)
+            return next_row
+        if self._slots:
+            return self._slots.popitem(last=False)[1]
+        # Nothing of ours to evict: reuse rows round-robin
+        self._set_header(next_row, clock + 1)
+        return clock % self.capacity
+
+    def put_many(self, keys, vectors):
+        """Store one vector per key, evicting least recently used entries when full."""
+        if self.capacity <= 0 or not len(keys):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, _file_lock(self.lock_path):
+            if self._matrix is None:
+                try:
+                    self._map_files(vectors.shape[1])
+                except ValueError as e:
+                    # Files another process created with other settings: run without the cache
+                    print(f"Not caching embeddings in {self.keys_path}: {str(e)}")
+                    self.capacity = 0
+                    return
+            if vectors.shape[1] != self.dim:
+                print(f"Embedding dimension changed ({self.dim} -> {vectors.shape[1]}), not caching")
+                return
+
+            for key, vector in zip(keys, vectors):
+                key_bytes = bytes.fromhex(key)
+                slot = self._slots.get(key)
+                if slot is None or self._row_key(slot) != key_bytes:
+                    slot = self._allocate()
+                    # Clear the key first so readers never pair it with a half-written vector
+                    self._set_row_key(slot, bytes(self.KEY_BYTES))
+                    self._matrix[slot] = vector
+                    self._set_row_key(slot, key_bytes)
+                    self._unflushed += 1
+                self._slots[key] = slot
+                self._slots.move_to_end(key)
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write the matrix and the row keys to disk. put_many calls this every flush_every new entries."""
+        with self._lock:
+            if not self._unflushed or self._matrix is None:
+                return
+            try:
+                self._matrix.flush()
+                self._keys.flush()
+                self._unflushed = 0
+            except Exception as e:
+                print(f"Could not save embedding cache {self.matrix_path}: {str(e)}")
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._slots),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_embedding_cache = None
+
+def get_embedding_cache():
+    """Return the process-wide EmbeddingCache, or None when caching is disabled."""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_DIR or EMBEDDING_CACHE_SIZE <= 0:
+        return None
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+        atexit.register(_embedding_cache.flush)
+    return _embedding_cache
+
+def _encode_with_model(preprocessed_texts, batch_size=32):
+    """Run the model over texts, through the CPU worker pool if one is configured."""
+    if EMBEDDING_WORKERS > 0:
+        from embedding_pool import get_embedding_pool
+        return get_embedding_pool(EMBEDDING_WORKERS, EMBEDDING_TORCH_THREADS, EMBEDDING_BACKEND).encode(
+            preprocessed_texts, batch_size=batch_size)
+    return get_model().encode(preprocessed_texts, batch_size=batch_size, convert_to_numpy=True)
+
+def encode_texts(preprocessed_texts, batch_size=32):
+    """
+    Embed already preprocessed texts, only running the model on texts that are
+    not in the embedding cache. Returns a tensor with one row per input text.
+    """
+    cache = get_embedding_cache()
+    if cache is None:
+        return torch.from_numpy(_encode_with_model(preprocessed_texts, batch_size))
+
+    keys = [text_key(text) for text in preprocessed_texts]
+    vectors = cache.get_many(keys)
+
+    # Encode each unseen text once, even if it appears several times in the batch
+    missing = {}
+    for key, text in zip(keys, preprocessed_texts):
+        if key not in vectors and key not in missing:
+            missing[key] = text
+    if missing:
+        new_vectors = _encode_with_model(list(missing.values()), batch_size)
+        cache.put_many(list(missing.keys()), new_vectors)
+        vectors.update(zip(missing.keys(), new_vectors))
+
+    if not keys:
+        return torch.empty((0, cache.dim or 0))
+    return torch.from_numpy(np.stack([vectors[key] for key in keys]).astype(np.float32))
+
 # Function to compute similarity scores
 def calculate_similarity_scores(new_comments, base_comments):
-    new_comments_preprocessed = [preprocess(comment) for comment in new_comments]
-    base_comments_preprocessed = [preprocess(comment) for comment in base_comments]
+    new_comments_preprocessed = preprocess_batch(new_comments)
     
-    if not new_comments_preprocessed or not base_comments_preprocessed:
+    if not new_comments_preprocessed or not base_comments:
         print("Warning: Empty input provided to similarity function.")
         return torch.tensor([])  
-    new_embeddings = model.encode(new_comments_preprocessed, convert_to_tensor=True)
-    base_embeddings = model.encode(base_comments_preprocessed, convert_to_tensor=True)
-    
-    print("New embeddings shape:", new_embeddings.shape)
-    print("Base embeddings shape:", base_embeddings.shape)
-    
-    if new_embeddings.shape[0] == 0 or base_embeddings.shape[0] == 0:
+    new_embeddings = encode_texts(new_comments_preprocessed)
+    intent_bank = get_intent_bank(base_comments)
+
+    if new_embeddings.shape[0] == 0 or intent_bank.embeddings.shape[0] == 0:
         print("Error: One of the embeddings is empty!")
         return torch.tensor([])
 
-    similarity_matrix = calculate_similarity(new_embeddings, base_embeddings) 
+    similarity_matrix = intent_bank.scores(new_embeddings)
     return similarity_matrix 
 
 
+
+def match_intents(texts, intents, k=1):
+    """
+    Top-k intent matches for every text in one batched operation.
+
+    Returns (indices, scores) as NumPy arrays of shape (len(texts), k), best match
+    first: indices are positions in `intents`, scores are cosine similarities.
+    """
+    k = max(1, min(k, len(intents)))
+    if not len(texts) or not len(intents):
+        return np.empty((0, k), dtype=np.int64), np.empty((0, k), dtype=np.float32)
+
+    if len(intents) >= INTENT_ANN_THRESHOLD:
+        embeddings = encode_texts(preprocess_batch(texts))
+        return get_intent_index(intents).search(embeddings, k)
+
+    similarity_matrix = calculate_similarity_scores(texts, intents)
+    scores, indices = torch.topk(similarity_matrix, k, dim=1)
+    return indices.cpu().numpy(), scores.cpu().numpy()
+
+def build_intent_frame(records, fields, intents, indices, scores):
+    """
+    Build the analysis DataFrame for `records` from match_intents output.
+
+    `fields` is a list of (column, record_key, default) tuples copied from each
+    record; the intent columns are filled straight from the match arrays.
+    """
+    df = pd.DataFrame({column: [record.get(key, default) for record in records]
+                       for column, key, default in fields})
+    intents = np.asarray(intents, dtype=object)
+    scores = np.round(np.asarray(scores, dtype=np.float64), 6)
+
+    df["Best Matched Intent"] = intents[indices[:, 0]] if len(df) else []
+    df["Similarity Score"] = scores[:, 0] if len(df) else []
+    for rank in range(1, indices.shape[1]):
+        df[f"Matched Intent {rank + 1}"] = intents[indices[:, rank]]
+        df[f"Similarity Score {rank + 1}"] = scores[:, rank]
+    return df
+
+
+def _iter_chunks(source, chunk_size):
+    """Yield lists of row dicts from a CSV path or any iterable of dicts/strings."""
+    if isinstance(source, str):
+        for frame in pd.read_csv(source, chunksize=chunk_size):
+            yield frame.to_dict("records")
+        return
+
+    chunk = []
+    for row in source:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def score_chunks(source, intents, text_field, chunk_size=1000, batch_size=32, k=1):
+    """
+    Score `source` chunk by chunk, yielding one list of scored records per chunk.
+
+    `source` is a CSV path or an iterable of dicts (plain strings are treated as
+    {text_field: text}). Only one chunk of rows, embeddings and scores is held
+    in memory at a time.
+    """
+    intent_bank = get_intent_bank(intents)
+    k = max(1, min(k, len(intents)))
+
+    for chunk in _iter_chunks(source, chunk_size):
+        rows = [row if isinstance(row, dict) else {text_field: row} for row in chunk]
+        texts = preprocess_batch([row.get(text_field) for row in rows])
+        embeddings = encode_texts(texts, batch_size=batch_size)
+        scores, indices = torch.topk(intent_bank.scores(embeddings), k, dim=1)
+
+        scored = []
+        for row, row_indices, row_scores in zip(rows, indices.tolist(), scores.tolist()):
+            record = dict(row)
+            record["Best Matched Intent"] = intents[row_indices[0]]
+            record["Similarity Score"] = round(row_scores[0], 6)
+            for rank in range(1, k):
+                record[f"Matched Intent {rank + 1}"] = intents[row_indices[rank]]
+                record[f"Similarity Score {rank + 1}"] = round(row_scores[rank], 6)
+            scored.append(record)
+        yield scored
+
+def score_stream(source, intents, text_field, chunk_size=1000, batch_size=32, k=1):
+    """Generator version of score_chunks that yields scored records one at a time."""
+    for scored in score_chunks(source, intents, text_field, chunk_size, batch_size, k):
+        yield from scored
+
+def score_csv(input_path, output_path, intents, text_field, chunk_size=1000, batch_size=32):
+    """Re-score a (possibly huge) CSV, appending results to output_path chunk by chunk."""
+    total = 0
+    header = True
+    for scored in score_chunks(input_path, intents, text_field, chunk_size, batch_size):
+        pd.DataFrame(scored).to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+        header = False
+        total += len(scored)
+        print(f"Scored {total} rows from {input_path}")
+    return total
+
+
+def check_backend_drift(backend, sample_texts, intents):
+    """
+    Compare intent scores from `backend` against the fp32 model on a sample.
+
+    Returns a dict with the max/mean absolute score difference, how often the
+    best matched intent agrees, and the encode time of both models.
+    """
+    texts = preprocess_batch(sample_texts)
+    intent_texts = preprocess_batch(intents)
+    report = {"backend": backend, "samples": len(texts), "intents": len(intent_texts)}
+
+    scores = {}
+    for name in ("fp32", backend):
+        candidate = load_model(name)
+        start = time.perf_counter()
+        embeddings = candidate.encode(texts, convert_to_tensor=True)
+        report[f"{name}_seconds"] = round(time.perf_counter() - start, 4)
+        intent_embeddings = candidate.encode(intent_texts, convert_to_tensor=True)
+        scores[name] = torch.mm(F.normalize(embeddings, p=2, dim=1),
+                                F.normalize(intent_embeddings, p=2, dim=1).transpose(0, 1)).cpu()
+
+    diff = (scores[backend] - scores["fp32"]).abs()
+    report["max_abs_diff"] = round(diff.max().item(), 6)
+    report["mean_abs_diff"] = round(diff.mean().item(), 6)
+    agreement = (scores[backend].argmax(dim=1) == scores["fp32"].argmax(dim=1)).float().mean()
+    report["top1_agreement"] = round(agreement.item(), 4)
+    if report[f"{backend}_seconds"]:
+        report["speedup"] = round(report["fp32_seconds"] / report[f"{backend}_seconds"], 2)
+
+    print(f"Backend {backend} vs fp32 on {len(texts)} texts: max drift {report['max_abs_diff']}, "
+          f"mean drift {report['mean_abs_diff']}, top-1 agreement {report['top1_agreement']:.1%}")
+    return report
+
 if __name__ == "__main__":
     start_time = datetime.now()
     
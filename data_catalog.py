@@ -0,0 +1,126 @@
+import os
+import threading
+from datetime import datetime
+import pandas as pd
+
+# Run-scoped view of the result stores. The main flow used to parse the same
+# CSV several times per run: once for the URLs, again for the rows to pick
+# reply targets from, and twice more just to count rows for the summary. A
+# DataCatalog loads each dataset at most once and keeps row counts, the last
+# write time and the loaded rows current as the pipelines append, so later
+# questions are answered from memory.
+
+
+class Dataset:
+    """
+    One result table for the duration of a run.
+
+    Args:
+        name: Label used in the summary (e.g. "tweets")
+        store: Result store holding the table (see result_store.py)
+        columns: Columns frame() loads; None loads every column
+    """
+
+    def __init__(self, name, store, columns=None):
+        self.name = name
+        self.store = store
+        self.columns = columns
+        self._row_count = None  # asked of the store when first shown, then kept up to date by append
+        self._last_modified = None
+        self._frame = None
+        self._recent = None
+        self._lock = threading.Lock()
+
+    @property
+    def last_modified(self):
+        """Newest write to the store's files, looked up once."""
+        with self._lock:
+            if self._last_modified is None:
+                modified = [os.path.getmtime(path) for path in self.store.files() if os.path.exists(path)]
+                if modified:
+                    self._last_modified = datetime.fromtimestamp(max(modified))
+            return self._last_modified
+
+    def append(self, df):
+        """Write df to the store and fold the rows actually written into the metadata and loaded frame."""
+        written = self.store.append(df)
+        if written is None or written.empty:
+            return written
+        with self._lock:
+            if self._row_count is not None:
+                self._row_count += len(written)
+            if self._frame is not None:
+                new_rows = written[[column for column in self._frame.columns if column in written.columns]]
+                self._frame = pd.concat([self._frame, new_rows], ignore_index=True)
+                self._recent = None
+            self._last_modified = datetime.now()
+        return written
+
+    def count(self):
+        """
+        Rows stored, keyed or not. The store counts them on first use (the row count
+        in its key index, the Parquet footers or a COUNT query, never a full read);
+        append keeps the number current.
+        """
+        with self._lock:
+            if self._row_count is None:
+                self._row_count = self.store.count()
+            return self._row_count
+
+    def frame(self):
+        """The stored rows (the configured columns), read from the store on first use only."""
+        with self._lock:
+            if self._frame is None:
+                self._frame = self.store.read(columns=self.columns)
+            return self._frame
+
+    def recent(self):
+        """Rows newest first by Date and Time (or Posted At), sorted once per change."""
+        frame = self.frame()
+        with self._lock:
+            if self._recent is None:
+                if "Posted At" in frame.columns:
+                    posted_at = pd.to_datetime(frame["Posted At"], errors="coerce")
+                elif "Date" in frame.columns and "Time" in frame.columns:
+                    posted_at = pd.to_datetime(frame["Date"].astype(str) + " " + frame["Time"].astype(str),
+                                               errors="coerce")
+                else:
+                    posted_at = None
+                if posted_at is None:
+                    self._recent = frame
+                else:
+                    order = posted_at.sort_values(ascending=False, na_position="last").index
+                    self._recent = frame.loc[order].reset_index(drop=True)
+            return self._recent
+
+    def describe(self):
+        return {"name": self.name, "rows": self.count(), "loaded": self._frame is not None,
+                "last_modified": self.last_modified.isoformat(timespec="seconds") if self.last_modified else None}
+
+
+class DataCatalog:
+    """The datasets one run works with, by name."""
+
+    def __init__(self):
+        self.datasets = {}
+
+    def register(self, name, store, columns=None):
+        dataset = self.datasets[name] = Dataset(name, store, columns)
+        return dataset
+
+    def __getitem__(self, name):
+        return self.datasets[name]
+
+    def summary(self):
+        """
+        One line per dataset. Counts and write times are looked up once per dataset
+        (index metadata, file footers or file stats, no rows are read) and then
+        kept current by append.
+        """
+        lines = []
+        for dataset in self.datasets.values():
+            info = dataset.describe()
+            if info["rows"]:
+                lines.append(f"Total {dataset.name} in database: {info['rows']} "
+                             f"(last written {info['last_modified']})")
+        return "\n".join(lines)
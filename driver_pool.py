@@ -0,0 +1,138 @@
+import threading
+from contextlib import contextmanager
+
+# Reusable browser sessions for the scrapers. Launching undetected Chrome takes
+# several seconds, so instead of one browser per post the scrapers borrow a warm
+# session from a DriverPool and hand it back when they are done with the page.
+
+
+def driver_is_alive(driver):
+    """Cheap health check: a crashed or closed browser raises on any command."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions.
+
+    Args:
+        factory: Function returning a new driver (e.g. a scraper's setup_driver)
+        size: Maximum number of browsers alive at once
+        max_uses: Recycle a browser after it has served this many sessions
+    """
+
+    def __init__(self, factory, size=1, max_uses=25):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.launched = 0
+        self.recycled = 0
+        self._idle = []
+        self._uses = {}  # id(driver) -> sessions served
+        self._alive = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Take an idle browser, launching one if the pool isn't full, otherwise wait for one."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._alive < self.size:
+                    self._alive += 1
+                    break
+                self._condition.wait()
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._alive -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.launched += 1
+            self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver, broken=False):
+        """Return a browser to the pool, quitting it if it crashed or has been used max_uses times."""
+        alive = not broken and driver_is_alive(driver)  # a WebDriver call, kept outside the lock
+        with self._condition:
+            uses = self._uses.get(id(driver), 0) + 1
+            if alive and not self._closed and uses < self.max_uses:
+                self._uses[id(driver)] = uses
+                self._idle.append(driver)
+                self._condition.notify()
+                return
+
+            if not self._closed:
+                reason = "crashed" if not alive else f"served {uses} sessions"
+                print(f"Recycling browser session ({reason})")
+                self.recycled += 1
+            self._uses.pop(id(driver), None)
+        quit_driver(driver)
+        with self._condition:
+            self._alive -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def session(self):
+        """Borrow a browser for the duration of a with-block."""
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """Quit every idle browser; browsers still in use are quit when released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+            self._condition.notify_all()
+            for driver in idle:
+                self._uses.pop(id(driver), None)
+        for driver in idle:
+            quit_driver(driver)
+        print(f"Driver pool closed ({self.launched} browsers launched, {self.recycled} recycled)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def driver_session(driver_pool, factory):
+    """Borrow a browser from driver_pool, or launch a throwaway one with factory if there is no pool."""
+    if driver_pool is not None:
+        with driver_pool.session() as driver:
+            yield driver
+        return
+
+    driver = factory()
+    try:
+        yield driver
+    finally:
+        quit_driver(driver)
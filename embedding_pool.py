@@ -0,0 +1,112 @@
+import os
+import atexit
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+# Process pool that spreads SentenceTransformer encoding over several CPU
+# worker processes. Each worker loads the model once; shards of texts go out
+# through the task queue and embeddings come back through one shared memory
+# block, so large result arrays are never pickled.
+
+_worker_model = None
+
+
+def _init_worker(model_name, torch_threads, backend):
+    """Load the model once per worker and pin its torch thread count."""
+    global _worker_model
+    import torch
+    from cosine_sim import load_model
+
+    torch.set_num_threads(torch_threads)
+    _worker_model = load_model(backend, model_name)
+
+
+def _embedding_dim():
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+def _encode_shard(shm_name, shape, start, texts, batch_size):
+    """Encode one shard and write it into rows [start, start + len(texts)) of the shared block."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[start:start + len(texts)] = _worker_model.encode(texts, batch_size=batch_size,
+                                                             convert_to_numpy=True)
+        del out
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class EmbeddingPool:
+    """
+    CPU worker pool for embedding large batches of text.
+
+    Args:
+        workers: Number of worker processes (defaults to the CPU count)
+        torch_threads: torch intra-op threads per worker; workers * threads
+            should not exceed the number of physical cores
+        model_name: SentenceTransformer to load in every worker
+        backend: Inference backend passed to cosine_sim.load_model
+        shard_size: Texts sent to a worker per task
+    """
+
+    def __init__(self, workers=None, torch_threads=1, model_name=None, backend=None, shard_size=256):
+        if model_name is None:
+            from cosine_sim import MODEL_NAME
+            model_name = MODEL_NAME
+        self.workers = workers or os.cpu_count() or 1
+        self.torch_threads = torch_threads
+        self.shard_size = shard_size
+        print(f"Starting embedding pool with {self.workers} workers x {torch_threads} torch threads...")
+        # spawn so workers don't inherit a half-initialised torch runtime from the parent
+        context = mp.get_context("spawn")
+        self._pool = context.Pool(self.workers, initializer=_init_worker,
+                                  initargs=(model_name, torch_threads, backend))
+        self.dim = self._pool.apply(_embedding_dim)
+
+    def encode(self, texts, batch_size=32):
+        """Embed `texts` across the workers; returns a float32 array of shape (len(texts), dim)."""
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+
+        shape = (len(texts), self.dim)
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+        try:
+            tasks = [
+                self._pool.apply_async(_encode_shard, (shm.name, shape, start,
+                                                       texts[start:start + self.shard_size], batch_size))
+                for start in range(0, len(texts), self.shard_size)
+            ]
+            for task in tasks:
+                task.get()
+            return np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_embedding_pool = None
+
+
+def get_embedding_pool(workers, torch_threads=1, backend=None):
+    """Return the process-wide EmbeddingPool, starting it on first use."""
+    global _embedding_pool
+    if _embedding_pool is None:
+        _embedding_pool = EmbeddingPool(workers=workers, torch_threads=torch_threads, backend=backend)
+        atexit.register(_embedding_pool.close)
+    return _embedding_pool
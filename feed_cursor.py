@@ -0,0 +1,33 @@
+import uuid
+
+# Incremental feed processing. After each scroll the scrapers used to re-read
+# every post on the page, so a scroll deep into a feed cost as much as all the
+# scrolls before it. A FeedCursor tags every node it has handled with a
+# data attribute, so the next pass only reads nodes without the tag.
+
+SEEN_ATTRIBUTE = "data-intentbot-seen"
+
+MARK_JS = """
+var elements = arguments[0], attribute = arguments[1], token = arguments[2];
+for (var i = 0; i < elements.length; i++) elements[i].setAttribute(attribute, token);
+"""
+
+
+class FeedCursor:
+    """
+    Marks feed nodes as processed, scoped to one scrape so a reused page or a
+    second scraper on the same tab doesn't skip nodes it never read.
+    """
+
+    def __init__(self):
+        self.attribute = SEEN_ATTRIBUTE
+        self.token = uuid.uuid4().hex[:12]
+
+    def unseen_xpath(self, xpath):
+        """`xpath` restricted to nodes this cursor hasn't marked (a single path, not a union)."""
+        return f'{xpath}[not(@{self.attribute}="{self.token}")]'
+
+    def mark(self, driver, elements):
+        """Tag WebElements as processed in one script call."""
+        if elements:
+            driver.execute_script(MARK_JS, list(elements), self.attribute, self.token)
@@ -8,13 +8,29 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from cosine_sim import calculate_similarity_scores  # Ensure cosine_sim.py exists
+from cosine_sim import match_intents, build_intent_frame  # Ensure cosine_sim.py exists
+from driver_pool import DriverPool, driver_session
+from scrape_scheduler import DomainRateLimiter, scrape_concurrently, worker_driver_pools
+from selector_strategy import SelectorStrategy
+from scroll_wait import ScrollWaiter
+from feed_cursor import FeedCursor
+from lean_browsing import LEAN_BROWSING, HEADLESS, lean_chrome_options, block_heavy_requests
+from result_store import open_result_store
 import random
 import re
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import os
 
+# Local output. By default every run replaces the CSVs with its own results;
+# LINKEDIN_WRITE_MODE=append instead adds the posts and comments it found to the
+# result store and skips ones stored before.
+LINKEDIN_WRITE_MODE = os.environ.get("LINKEDIN_WRITE_MODE", "overwrite")
+POSTS_CSV_FILENAME = "LinkedIn_posts_result.csv"
+COMMENTS_CSV_FILENAME = "LinkedIn_comments.csv"
+# A comment has no URL of its own; post, author and text identify it
+COMMENT_KEY = ("Original Post URL", "Profile Link", "Comment Text")
+
 # Predefined intent sentences for comparison
 intent_data = [
     "What are the latest AI breakthroughs?",
@@ -29,6 +45,103 @@ intent_data = [
     "What's the future of AI in creative industries?",
 ]
 
+# Candidate XPaths for LinkedIn posts, most reliable first. LinkedIn's markup
+# changes often, so every field has fallbacks.
+POST_XPATHS = [
+    '//div[contains(@class, "feed-shared-update-v2")]',
+    '//div[contains(@class, "update-components-actor")]//ancestor::div[contains(@class, "feed-shared")]',
+    '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@data-urn, "urn:li:activity")]',
+    '//div[contains(@class, "search-results__cluster-content")]//div[contains(@class, "feed-shared")]'
+]
+POST_PROFILE_NAME_XPATHS = [
+    './/span[contains(@class, "update-components-actor__name")]',
+    './/span[contains(@class, "feed-shared-actor__name")]',
+    './/span[contains(@class, "update-components-actor__title")]',
+    './/a[contains(@class, "app-aware-link") and contains(@href, "/in/")]//span',
+    './/a[contains(@href, "/in/")]//span[1]'
+]
+POST_PROFILE_LINK_XPATHS = [
+    './/div[contains(@class, "update-components-actor")]//a[contains(@class, "update-components-actor__container-link")]',
+    './/a[contains(@class, "app-aware-link") and contains(@href, "/in/")]',
+    './/a[contains(@class, "feed-shared-actor__container-link")]',
+    './/span[contains(@class, "update-components-actor__name")]//ancestor::a[contains(@href, "/in/")]',
+    './/a[contains(@href, "/in/")]'
+]
+POST_CONTENT_XPATHS = [
+    './/div[contains(@class, "update-components-text")]',
+    './/div[contains(@class, "feed-shared-update-v2__description")]',
+    './/div[contains(@class, "feed-shared-text")]',
+    './/span[contains(@class, "break-words")]'
+]
+POST_URL_XPATHS = [
+    './/a[contains(@class, "app-aware-link") and contains(@href, "/feed/update/")]',
+    './/a[contains(@href, "activities/shares")]',
+    './/div[contains(@class, "feed-shared-control-menu")]//ancestor::div[contains(@data-urn, "urn:li:activity")]'
+]
+POST_TIME_XPATHS = [
+    './/span[contains(@class, "update-components-actor__sub-description")]',
+    './/span[contains(@class, "feed-shared-actor__sub-description")]',
+    './/span[contains(@class, "visually-hidden") and contains(text(), "ago")]',
+    './/time'
+]
+
+# Candidate XPaths for comments on a post
+COMMENT_XPATHS = [
+    '//article[contains(@class, "comments-comment-item")]',
+    '//div[contains(@class, "comments-comment-item")]',
+    '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@class, "comments-comment-item")]',
+    '//div[contains(@data-test-id, "comments-container")]//article',
+    '//div[contains(@class, "comments-comment-social-activity")]//ancestor::article'
+]
+COMMENT_PROFILE_XPATHS = [
+    './/a[contains(@class, "comments-post-meta__actor-link")]',
+    './/a[contains(@class, "tap-target")]',
+    './/a[contains(@class, "comment-actor")]',
+    './/a[contains(@href, "/in/")]'
+]
+COMMENT_NAME_XPATHS = [
+    './/span[contains(@class, "comments-post-meta__name")]',
+    './/span[contains(@class, "feed-shared-actor__name")]',
+    './/span[contains(@class, "hoverable-link-text")]',
+    './/span[contains(@aria-hidden, "true")]',
+    './/span[contains(@class, "actor__name")]'
+]
+COMMENT_TEXT_XPATHS = [
+    './/div[contains(@class, "comments-comment-item__main-content")]',
+    './/div[contains(@class, "feed-shared-text")]',
+    './/span[contains(@class, "comments-comment-item__main-content")]',
+    './/div[contains(@class, "comments-comment-text-container")]',
+    './/p'
+]
+COMMENT_TIME_XPATHS = [
+    './/span[contains(@class, "comments-comment-item__timestamp")]',
+    './/time',
+    './/span[contains(@class, "feed-shared-actor__sub-description")]',
+    './/span[contains(@class, "artdeco-text-duration")]',
+    './/span[contains(@class, "comments-comment-item__time-string")]'
+]
+
+# Batched extractors over the same candidates: one execute_script per scroll
+# instead of one WebDriver call per candidate per element. Each remembers the
+# selector that won last time and tries it first.
+POST_SELECTORS = SelectorStrategy(POST_XPATHS, {
+    "Profile Handle": POST_PROFILE_NAME_XPATHS + [{"xpath": './/a[contains(@href, "/in/")]', "read": "textContent"}],
+    "Profile Link": [{"xpath": xpath, "read": "href", "contains": "/in/"} for xpath in POST_PROFILE_LINK_XPATHS],
+    "Post": POST_CONTENT_XPATHS,
+    "DocURL": [{"xpath": xpath, "read": "href"} for xpath in POST_URL_XPATHS[:2]],
+    "URN": [{"xpath": ".", "read": "data-urn", "contains": "urn:li:activity"}],
+    "Timestamp": POST_TIME_XPATHS,
+}, required=["Post", ("DocURL", "URN")])  # what scrape_linkedin_posts needs to keep a post
+COMMENT_SELECTORS = SelectorStrategy(COMMENT_XPATHS, {
+    "Comment ID": [{"xpath": ".", "read": "id"}, {"xpath": ".", "read": "data-id"}],
+    "Comment ID Text": ['.//p'],  # fallback ID when the element has no id attribute
+    "Profile Link": [{"xpath": xpath, "read": "href"} for xpath in COMMENT_PROFILE_XPATHS],
+    "Profile Text": COMMENT_PROFILE_XPATHS,
+    "Author Name": COMMENT_NAME_XPATHS,
+    "Comment Text": COMMENT_TEXT_XPATHS,
+    "Timestamp": COMMENT_TIME_XPATHS,
+}, required=["Comment Text"])
+
 def setup_google_sheets():
     """
     Set up Google Sheets API connection
@@ -100,12 +213,21 @@ def upload_to_sheets(client, data_df, sheet_name, spreadsheet_key=None):
     
 
 
-def setup_driver():
+# Logged-in Chrome profile used by the scraper
+CHROME_USER_DATA_DIR = r'C:\Users\Shubham Dutta\AppData\Local\Google\Chrome\User Data'
+CHROME_PROFILE_DIRECTORY = 'Profile 2'
+
+def setup_driver(user_data_dir=CHROME_USER_DATA_DIR, profile_directory=CHROME_PROFILE_DIRECTORY,
+                 lean=LEAN_BROWSING, headless=HEADLESS):
+    """
+    Launch undetected Chrome on the given profile. lean blocks images, media,
+    fonts and trackers (see lean_browsing.py); headless runs without a window.
+    """
     print("Setting up Chrome driver...")
     chrome_options = uc.ChromeOptions()
 
-    chrome_options.add_argument(r'--user-data-dir=C:\Users\Shubham Dutta\AppData\Local\Google\Chrome\User Data')
-    chrome_options.add_argument(r'--profile-directory=Profile 2')
+    chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+    chrome_options.add_argument(f'--profile-directory={profile_directory}')
 
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
@@ -120,7 +242,14 @@ def setup_driver():
     ]
     chrome_options.add_argument(f"user-agent={random.choice(user_agents)}")
 
+    if lean:
+        lean_chrome_options(chrome_options, headless=headless)
+    elif headless:
+        chrome_options.add_argument("--headless=new")
+
     driver = uc.Chrome(options=chrome_options)
+    if lean:
+        block_heavy_requests(driver)
     return driver
 
 def clean_timestamp(timestamp_text):
@@ -188,271 +317,251 @@ def safe_click(driver, element):
             except Exception:
                 return False
 
-def scrape_linkedin_post_comments(post_url, max_comments=50):
-    """Scrape comments for a specific LinkedIn post with enhanced comment loading."""
-    driver = setup_driver()
-    print(f"Opening LinkedIn post URL: {post_url}")
-    
+def extract_comment_dom(comment):
+    """Extract (comment_id, comment_info) from one comment element with per-field find_elements calls."""
+    comment_info = {}
+
+    # Try to get a unique identifier for the comment
+    comment_id = None
     try:
-        driver.get(post_url)
-        # Random sleep between 4-7 seconds to mimic human behavior
-        time.sleep(random.uniform(4, 7))
-        
-        comments_data = []
-        comment_ids_seen = set()  # Track comment IDs to avoid duplicates
-        
-        # Try to expand all comments first
-        expand_comments_xpath_options = [
-            '//button[contains(@class, "comments-comment-box__expand-btn") or contains(text(), "View comments")]',
-            '//button[contains(text(), "View") and contains(text(), "comments")]',
-            '//span[contains(text(), "comments")]/ancestor::button'
-        ]
-        
-        for xpath in expand_comments_xpath_options:
-            expand_buttons = safe_find_elements(driver, By.XPATH, xpath)
-            for button in expand_buttons:
-                if button.is_displayed():
-                    try:
-                        print("Found 'View comments' button, clicking to expand comments section...")
-                        safe_click(driver, button)
-                        time.sleep(random.uniform(2, 4))
-                    except Exception as e:
-                        print(f"Error clicking expand comments button: {str(e)}")
-        
-        # Now try to load more comments - multiple approaches
-        load_more_attempts = 0
-        max_load_attempts = 10  # Try up to 10 times to load more comments
-        consecutive_no_new = 0
-        max_consecutive_no_new = 3  # Give up after 3 tries with no new comments
-        
-        print("Starting to load more comments...")
-        
-        while load_more_attempts < max_load_attempts and consecutive_no_new < max_consecutive_no_new and len(comments_data) < max_comments:
-            load_more_attempts += 1
-            
-            # Current count of comments before loading more
-            current_comment_count = len(comments_data)
-            
-            # Multiple XPath options for "Load more comments" buttons
-            load_more_buttons_xpath = [
-                '//button[contains(@class, "comments-comments-list__show-previous") or contains(text(), "Load more comments")]',
-                '//button[contains(@class, "comments-comments-list__load-more-comments-button")]',
-                '//button[contains(text(), "Load") and contains(text(), "comments")]',
-                '//button[contains(text(), "Show previous comments")]',
-                '//span[contains(text(), "previous comments")]/ancestor::button',
-                '//button[contains(@class, "artdeco-button") and contains(@class, "comments")]'
+        comment_id = comment.get_attribute('id') or comment.get_attribute('data-id')
+        if not comment_id:
+            # If no ID, try to create a composite key from the comment's text
+            comment_text_elems = comment.find_elements(By.XPATH, './/p')
+            if comment_text_elems:
+                comment_text = comment_text_elems[0].text.strip()
+                # Use just first 50 chars as part of ID to avoid issues with long comments
+                comment_id = comment_text[:50] if comment_text else None
+    except:
+        pass
+
+    profile_element = None
+    for xpath in COMMENT_PROFILE_XPATHS:
+        profile_elements = comment.find_elements(By.XPATH, xpath)
+        if profile_elements:
+            profile_element = profile_elements[0]
+            break
+
+    if profile_element:
+        comment_info["Profile Link"] = profile_element.get_attribute('href')
+
+        # Get the author name more reliably
+        author_name = ""
+        for name_xpath in COMMENT_NAME_XPATHS:
+            name_elements = comment.find_elements(By.XPATH, name_xpath)
+            if name_elements:
+                author_name = name_elements[0].text.strip()
+                break
+
+        # If we got a name, use it, otherwise use the profile element text
+        if author_name:
+            comment_info["Profile Handle"] = author_name
+        else:
+            comment_info["Profile Handle"] = profile_element.text.strip()
+
+    for xpath in COMMENT_TEXT_XPATHS:
+        text_elements = comment.find_elements(By.XPATH, xpath)
+        if text_elements:
+            comment_info["Comment Text"] = text_elements[0].text.strip()
+            break
+
+    for xpath in COMMENT_TIME_XPATHS:
+        time_elements = comment.find_elements(By.XPATH, xpath)
+        if time_elements:
+            raw_timestamp = time_elements[0].text
+            comment_info["Timestamp"] = clean_timestamp(raw_timestamp)
+            break
+    
+    return comment_id, comment_info
+
+def comment_info_from_item(item):
+    """Build (comment_id, comment_info) from one COMMENT_SELECTORS item."""
+    comment_info = {}
+    if "Profile Link" in item:
+        comment_info["Profile Link"] = item["Profile Link"]
+        # Prefer the author name, otherwise use the profile link's text
+        comment_info["Profile Handle"] = item.get("Author Name") or item.get("Profile Text", "")
+    if "Comment Text" in item:
+        comment_info["Comment Text"] = item["Comment Text"]
+    if "Timestamp" in item:
+        comment_info["Timestamp"] = clean_timestamp(item["Timestamp"])
+    comment_id = item.get("Comment ID")
+    if not comment_id:
+        # No ID attribute: use just first 50 chars of the text to avoid issues with long comments
+        comment_id = item.get("Comment ID Text", "")[:50] or None
+    return comment_id, comment_info
+
+def scrape_linkedin_post_comments(post_url, max_comments=50, driver_pool=None, extraction_mode="js"):
+    """
+    Scrape comments for a specific LinkedIn post with enhanced comment loading.
+    Uses a warm browser from driver_pool when given, otherwise launches its own.
+    extraction_mode "js" reads all visible comments with one COMMENT_SELECTORS script;
+    "dom" walks each comment element with find_elements calls.
+    """
+    with driver_session(driver_pool, setup_driver) as driver:
+        print(f"Opening LinkedIn post URL: {post_url}")
+    
+        try:
+            driver.get(post_url)
+            # Random sleep between 4-7 seconds to mimic human behavior
+            time.sleep(random.uniform(4, 7))
+        
+            comments_data = []
+            comment_ids_seen = set()  # Track comment IDs to avoid duplicates
+            comment_cursor = FeedCursor()  # Skips comments already read on an earlier pass
+        
+            # Try to expand all comments first
+            expand_comments_xpath_options = [
+                '//button[contains(@class, "comments-comment-box__expand-btn") or contains(text(), "View comments")]',
+                '//button[contains(text(), "View") and contains(text(), "comments")]',
+                '//span[contains(text(), "comments")]/ancestor::button'
             ]
-            
-            load_button_clicked = False
-            
-            # Try each XPath for load more buttons
-            for xpath in load_more_buttons_xpath:
-                buttons = safe_find_elements(driver, By.XPATH, xpath)
-                for button in buttons:
+        
+            for xpath in expand_comments_xpath_options:
+                expand_buttons = safe_find_elements(driver, By.XPATH, xpath)
+                for button in expand_buttons:
                     if button.is_displayed():
                         try:
-                            print(f"Attempting to load more comments (attempt {load_more_attempts}/{max_load_attempts})...")
+                            print("Found 'View comments' button, clicking to expand comments section...")
                             safe_click(driver, button)
                             time.sleep(random.uniform(2, 4))
-                            load_button_clicked = True
-                            break
                         except Exception as e:
-                            print(f"Error clicking load more button: {str(e)}")
-                
-                if load_button_clicked:
-                    break
-            
-            # If no "load more" button was found or clicked, try alternative approach
-            if not load_button_clicked:
-                print("No 'Load more' button found. Trying alternative approaches...")
-                
-                # Try to scroll to potential hidden buttons
-                try:
-                    # Scroll to the bottom of the comments section
-                    comment_sections = safe_find_elements(driver, By.XPATH, 
-                        '//div[contains(@class, "comments-comments-list")]')
-                    
-                    if comment_sections:
-                        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'end'});", 
-                                              comment_sections[0])
-                        time.sleep(random.uniform(1, 2))
-                except Exception as e:
-                    print(f"Error scrolling to comments section: {str(e)}")
-            
-            # Multiple XPath options for comments
-            comment_xpath_options = [
-                '//article[contains(@class, "comments-comment-item")]',
-                '//div[contains(@class, "comments-comment-item")]',
-                '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@class, "comments-comment-item")]',
-                '//div[contains(@data-test-id, "comments-container")]//article',
-                '//div[contains(@class, "comments-comment-social-activity")]//ancestor::article'
-            ]
-            
-            comment_elements = []
-            for xpath in comment_xpath_options:
-                comment_elements = safe_find_elements(driver, By.XPATH, xpath)
-                if comment_elements:
-                    print(f"Found {len(comment_elements)} comment elements")
-                    break
+                            print(f"Error clicking expand comments button: {str(e)}")
+        
+            # Now try to load more comments - multiple approaches
+            load_more_attempts = 0
+            max_load_attempts = 10  # Try up to 10 times to load more comments
+            consecutive_no_new = 0
+            max_consecutive_no_new = 3  # Give up after 3 tries with no new comments
+        
+            print("Starting to load more comments...")
+        
+            while load_more_attempts < max_load_attempts and consecutive_no_new < max_consecutive_no_new and len(comments_data) < max_comments:
+                load_more_attempts += 1
+            
+                # Current count of comments before loading more
+                current_comment_count = len(comments_data)
+            
+                # Multiple XPath options for "Load more comments" buttons
+                load_more_buttons_xpath = [
+                    '//button[contains(@class, "comments-comments-list__show-previous") or contains(text(), "Load more comments")]',
+                    '//button[contains(@class, "comments-comments-list__load-more-comments-button")]',
+                    '//button[contains(text(), "Load") and contains(text(), "comments")]',
+                    '//button[contains(text(), "Show previous comments")]',
+                    '//span[contains(text(), "previous comments")]/ancestor::button',
+                    '//button[contains(@class, "artdeco-button") and contains(@class, "comments")]'
+                ]
             
-            new_comments_found = 0
+                load_button_clicked = False
             
-            for comment in comment_elements:
-                if len(comments_data) >= max_comments:
-                    print(f"Reached maximum comments limit ({max_comments})")
-                    break
-                
-                comment_info = {}
-                
-                # Try to get a unique identifier for the comment
-                comment_id = None
-                try:
-                    comment_id = comment.get_attribute('id') or comment.get_attribute('data-id')
-                    if not comment_id:
-                        # If no ID, try to create a composite key from the comment's text
-                        comment_text_elems = comment.find_elements(By.XPATH, './/p')
-                        if comment_text_elems:
-                            comment_text = comment_text_elems[0].text.strip()
-                            # Use just first 50 chars as part of ID to avoid issues with long comments
-                            comment_id = comment_text[:50] if comment_text else None
-                except:
-                    pass
-                
-                # Skip this comment if we've already processed it
-                if comment_id and comment_id in comment_ids_seen:
-                    continue
-                
-                # Multiple XPath options for profile info
-                profile_xpath_options = [
-                    './/a[contains(@class, "comments-post-meta__actor-link")]',
-                    './/a[contains(@class, "tap-target")]',
-                    './/a[contains(@class, "comment-actor")]',
-                    './/a[contains(@href, "/in/")]'
-                ]
+                # Try each XPath for load more buttons
+                for xpath in load_more_buttons_xpath:
+                    buttons = safe_find_elements(driver, By.XPATH, xpath)
+                    for button in buttons:
+                        if button.is_displayed():
+                            try:
+                                print(f"Attempting to load more comments (attempt {load_more_attempts}/{max_load_attempts})...")
+                                safe_click(driver, button)
+                                time.sleep(random.uniform(2, 4))
+                                load_button_clicked = True
+                                break
+                            except Exception as e:
+                                print(f"Error clicking load more button: {str(e)}")
                 
-                profile_element = None
-                for xpath in profile_xpath_options:
-                    profile_elements = comment.find_elements(By.XPATH, xpath)
-                    if profile_elements:
-                        profile_element = profile_elements[0]
+                    if load_button_clicked:
                         break
+            
+                # If no "load more" button was found or clicked, try alternative approach
+                if not load_button_clicked:
+                    print("No 'Load more' button found. Trying alternative approaches...")
                 
-                if profile_element:
-                    comment_info["Profile Link"] = profile_element.get_attribute('href')
-                    
-                    # Get the author name more reliably
-                    name_xpath_options = [
-                        './/span[contains(@class, "comments-post-meta__name")]',
-                        './/span[contains(@class, "feed-shared-actor__name")]',
-                        './/span[contains(@class, "hoverable-link-text")]',
-                        './/span[contains(@aria-hidden, "true")]',
-                        './/span[contains(@class, "actor__name")]'
-                    ]
+                    # Try to scroll to potential hidden buttons
+                    try:
+                        # Scroll to the bottom of the comments section
+                        comment_sections = safe_find_elements(driver, By.XPATH, 
+                            '//div[contains(@class, "comments-comments-list")]')
                     
-                    author_name = ""
-                    for name_xpath in name_xpath_options:
-                        name_elements = comment.find_elements(By.XPATH, name_xpath)
-                        if name_elements:
-                            author_name = name_elements[0].text.strip()
+                        if comment_sections:
+                            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'end'});", 
+                                                  comment_sections[0])
+                            time.sleep(random.uniform(1, 2))
+                    except Exception as e:
+                        print(f"Error scrolling to comments section: {str(e)}")
+            
+                if extraction_mode == "js":
+                    items = COMMENT_SELECTORS.extract(driver, cursor=comment_cursor)
+                    if items:
+                        print(f"Found {len(items)} comment elements")
+                    extracted = (comment_info_from_item(item) for item in items)
+                else:
+                    comment_elements = []
+                    for xpath in COMMENT_XPATHS:
+                        comment_elements = safe_find_elements(driver, By.XPATH, xpath)
+                        if comment_elements:
+                            print(f"Found {len(comment_elements)} comment elements")
                             break
-                    
-                    # If we got a name, use it, otherwise use the profile element text
-                    if author_name:
-                        comment_info["Profile Handle"] = author_name
-                    else:
-                        comment_info["Profile Handle"] = profile_element.text.strip()
-                
-                # Multiple XPath options for comment text
-                text_xpath_options = [
-                    './/div[contains(@class, "comments-comment-item__main-content")]',
-                    './/div[contains(@class, "feed-shared-text")]',
-                    './/span[contains(@class, "comments-comment-item__main-content")]',
-                    './/div[contains(@class, "comments-comment-text-container")]',
-                    './/p'
-                ]
-                
-                for xpath in text_xpath_options:
-                    text_elements = comment.find_elements(By.XPATH, xpath)
-                    if text_elements:
-                        comment_info["Comment Text"] = text_elements[0].text.strip()
+                    extracted = (extract_comment_dom(comment) for comment in comment_elements)
+            
+                new_comments_found = 0
+            
+                for comment_id, comment_info in extracted:
+                    if len(comments_data) >= max_comments:
+                        print(f"Reached maximum comments limit ({max_comments})")
                         break
                 
-                # Multiple XPath options for timestamp
-                time_xpath_options = [
-                    './/span[contains(@class, "comments-comment-item__timestamp")]',
-                    './/time',
-                    './/span[contains(@class, "feed-shared-actor__sub-description")]',
-                    './/span[contains(@class, "artdeco-text-duration")]',
-                    './/span[contains(@class, "comments-comment-item__time-string")]'
-                ]
-                
-                for xpath in time_xpath_options:
-                    time_elements = comment.find_elements(By.XPATH, xpath)
-                    if time_elements:
-                        raw_timestamp = time_elements[0].text
-                        comment_info["Timestamp"] = clean_timestamp(raw_timestamp)
-                        break
+                    # Skip this comment if we've already processed it
+                    if comment_id and comment_id in comment_ids_seen:
+                        continue
                 
-                if "Comment Text" in comment_info:
-                    comment_info["Original Post URL"] = post_url
+                    if "Comment Text" in comment_info:
+                        comment_info["Original Post URL"] = post_url
                     
-                    # Add to our dataset only if this is a new comment
-                    if comment_id:
-                        comment_ids_seen.add(comment_id)
+                        # Add to our dataset only if this is a new comment
+                        if comment_id:
+                            comment_ids_seen.add(comment_id)
                     
-                    comments_data.append(comment_info)
-                    new_comments_found += 1
+                        comments_data.append(comment_info)
+                        new_comments_found += 1
             
-            print(f"Found {new_comments_found} new comments in this load attempt")
+                print(f"Found {new_comments_found} new comments in this load attempt")
             
-            # Check if we found any new comments
-            if new_comments_found == 0:
-                consecutive_no_new += 1
-                print(f"No new comments found. Consecutive attempts with no new comments: {consecutive_no_new}/{max_consecutive_no_new}")
-            else:
-                consecutive_no_new = 0  # Reset the counter
+                # Check if we found any new comments
+                if new_comments_found == 0:
+                    consecutive_no_new += 1
+                    print(f"No new comments found. Consecutive attempts with no new comments: {consecutive_no_new}/{max_consecutive_no_new}")
+                else:
+                    consecutive_no_new = 0  # Reset the counter
             
-            # If we haven't found new comments and no buttons were clicked, try scrolling
-            if new_comments_found == 0 and not load_button_clicked:
-                print("Trying to scroll the page to reveal more comments...")
-                try:
-                    # Scroll down a bit
-                    driver.execute_script("window.scrollBy(0, 500);")
-                    time.sleep(1)
-                    # Scroll back up
-                    driver.execute_script("window.scrollBy(0, -300);")
-                    time.sleep(random.uniform(2, 3))
-                except Exception as e:
-                    print(f"Error during scroll attempt: {str(e)}")
+                # If we haven't found new comments and no buttons were clicked, try scrolling
+                if new_comments_found == 0 and not load_button_clicked:
+                    print("Trying to scroll the page to reveal more comments...")
+                    try:
+                        # Scroll down a bit
+                        driver.execute_script("window.scrollBy(0, 500);")
+                        time.sleep(1)
+                        # Scroll back up
+                        driver.execute_script("window.scrollBy(0, -300);")
+                        time.sleep(random.uniform(2, 3))
+                    except Exception as e:
+                        print(f"Error during scroll attempt: {str(e)}")
                 
-            # If we've loaded a reasonable number of comments, break out
-            if len(comments_data) >= max_comments:
-                print(f"Reached target of {max_comments} comments. Stopping.")
-                break
+                # If we've loaded a reasonable number of comments, break out
+                if len(comments_data) >= max_comments:
+                    print(f"Reached target of {max_comments} comments. Stopping.")
+                    break
                 
-    except Exception as e:
-        print(f"Error scraping comments: {str(e)}")
-    finally:
-        driver.quit()
+        except Exception as e:
+            print(f"Error scraping comments: {str(e)}")
     
-    print(f"Total comments scraped: {len(comments_data)}")
-    return comments_data
+        print(f"Total comments scraped: {len(comments_data)}")
+        return comments_data
 
 
 
 def extract_profile_handle(driver, post):
     """Extract profile handle with multiple approaches and better error handling"""
     try:
-        # Try multiple XPath patterns for profile name
-        profile_name_xpath_options = [
-            './/span[contains(@class, "update-components-actor__name")]',
-            './/span[contains(@class, "feed-shared-actor__name")]',
-            './/span[contains(@class, "update-components-actor__title")]',
-            './/a[contains(@class, "app-aware-link") and contains(@href, "/in/")]//span',
-            './/a[contains(@href, "/in/")]//span[1]'
-        ]
-        
-        for xpath in profile_name_xpath_options:
+        for xpath in POST_PROFILE_NAME_XPATHS:
             name_elements = post.find_elements(By.XPATH, xpath)
             if name_elements:
                 name = name_elements[0].text.strip()
@@ -481,16 +590,7 @@ def extract_profile_handle(driver, post):
 def extract_profile_link(post):
     """Extract profile link with multiple approaches and better error handling"""
     try:
-        # Try multiple XPath patterns for profile link
-        profile_link_xpath_options = [
-            './/div[contains(@class, "update-components-actor")]//a[contains(@class, "update-components-actor__container-link")]',
-            './/a[contains(@class, "app-aware-link") and contains(@href, "/in/")]',
-            './/a[contains(@class, "feed-shared-actor__container-link")]',
-            './/span[contains(@class, "update-components-actor__name")]//ancestor::a[contains(@href, "/in/")]',
-            './/a[contains(@href, "/in/")]'
-        ]
-        
-        for xpath in profile_link_xpath_options:
+        for xpath in POST_PROFILE_LINK_XPATHS:
             link_elements = post.find_elements(By.XPATH, xpath)
             if link_elements:
                 href = link_elements[0].get_attribute('href')
@@ -502,287 +602,289 @@ def extract_profile_link(post):
         print(f"Error extracting profile link: {str(e)}")
         return ""
 
-def scrape_linkedin_posts(keyword, num_posts=100):
-    driver = setup_driver()
+def extract_post_dom(driver, post):
+    """Extract (post_info, post_id) from one post element with per-field find_elements calls."""
+    post_info = {}
+
+    # Get profile handle more reliably
+    post_info["Profile Handle"] = extract_profile_handle(driver, post)
+
+    # Get profile link more reliably - use the dedicated function
+    post_info["Profile Link"] = extract_profile_link(post)
+
+    # Try to get post content with multiple selectors
+    for xpath in POST_CONTENT_XPATHS:
+        content_elements = post.find_elements(By.XPATH, xpath)
+        if content_elements:
+            post_info["Post"] = content_elements[0].text.strip()
+            break
+
+    # Try to get post URL with multiple selectors
+    post_id = None
+    for xpath in POST_URL_XPATHS:
+        url_elements = post.find_elements(By.XPATH, xpath)
+        if url_elements:
+            if xpath.endswith('data-urn, "urn:li:activity")]'):
+                # Extract post ID from data-urn attribute
+                try:
+                    urn = post.get_attribute('data-urn')
+                    if urn and ":" in urn:
+                        activity_id = urn.split(":")[-1]
+                        post_info["DocURL"] = f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+                        post_id = activity_id
+                except:
+                    pass
+            else:
+                href = url_elements[0].get_attribute('href')
+                post_info["DocURL"] = href
+                # Try to extract ID from the URL
+                if "activity" in href:
+                    try:
+                        post_id = href.split("activity:")[1].split("?")[0]
+                    except:
+                        pass
+            break
+
+    # Try to get timestamp with multiple selectors
+    for xpath in POST_TIME_XPATHS:
+        time_elements = post.find_elements(By.XPATH, xpath)
+        if time_elements:
+            raw_timestamp = time_elements[0].text
+            post_info["Timestamp"] = clean_timestamp(raw_timestamp)
+            break
+    
+    return post_info, post_id
+
+def post_info_from_item(item):
+    """Build (post_info, post_id) from one POST_SELECTORS item."""
+    post_info = {
+        "Profile Handle": item.get("Profile Handle", "Unknown Profile"),
+        "Profile Link": item.get("Profile Link", ""),
+    }
+    if "Post" in item:
+        post_info["Post"] = item["Post"]
+    
+    post_id = None
+    href = item.get("DocURL")
+    if href:
+        post_info["DocURL"] = href
+        # Try to extract ID from the URL
+        if "activity:" in href:
+            post_id = href.split("activity:")[1].split("?")[0]
+    elif ":" in item.get("URN", ""):
+        # Fall back to the post's data-urn attribute
+        post_id = item["URN"].split(":")[-1]
+        post_info["DocURL"] = f"https://www.linkedin.com/feed/update/urn:li:activity:{post_id}"
+    
+    if "Timestamp" in item:
+        post_info["Timestamp"] = clean_timestamp(item["Timestamp"])
+    return post_info, post_id
+
+def scrape_linkedin_posts(keyword, num_posts=100, driver_pool=None, extraction_mode="js", scroll_timeout=5):
+    """
+    Search LinkedIn for keyword and scroll the results collecting up to num_posts posts.
+    extraction_mode "js" reads all visible posts with one POST_SELECTORS script;
+    "dom" walks each post element with find_elements calls.
+    After each scroll it waits until new posts load, at most scroll_timeout seconds.
+    """
+    with driver_session(driver_pool, setup_driver) as driver:
 
-    print("Opening LinkedIn...")
+        print("Opening LinkedIn...")
     
-    try:
-        # First go to LinkedIn homepage to ensure we're logged in
-        driver.get("https://www.linkedin.com")
-        time.sleep(random.uniform(4, 7))
-        
-        # Try different search approaches
-        search_urls = [
-            f"https://www.linkedin.com/search/results/content/?keywords={keyword}&origin=GLOBAL_SEARCH_HEADER",
-            f"https://www.linkedin.com/feed/",  # Go to feed and then search
-            f"https://www.linkedin.com/feed/hashtag/{keyword}/"  # Try hashtag search
-        ]
-        
-        for url in search_urls:
-            try:
-                driver.get(url)
-                time.sleep(random.uniform(5, 8))
+        try:
+            # First go to LinkedIn homepage to ensure we're logged in
+            driver.get("https://www.linkedin.com")
+            time.sleep(random.uniform(4, 7))
+        
+            # Try different search approaches
+            search_urls = [
+                f"https://www.linkedin.com/search/results/content/?keywords={keyword}&origin=GLOBAL_SEARCH_HEADER",
+                f"https://www.linkedin.com/feed/",  # Go to feed and then search
+                f"https://www.linkedin.com/feed/hashtag/{keyword}/"  # Try hashtag search
+            ]
+        
+            for url in search_urls:
+                try:
+                    driver.get(url)
+                    time.sleep(random.uniform(5, 8))
                 
-                if "feed/hashtag" not in url and "search/results" in url:
-                    # Only try to sort if we're on search results page
-                    try:
-                        # Try different approaches to sort by recent
-                        sort_buttons = safe_find_elements(driver, By.XPATH, 
-                            '//button[contains(@class, "search-reusables__filter-trigger") or contains(@aria-label, "Sort by")]')
+                    if "feed/hashtag" not in url and "search/results" in url:
+                        # Only try to sort if we're on search results page
+                        try:
+                            # Try different approaches to sort by recent
+                            sort_buttons = safe_find_elements(driver, By.XPATH, 
+                                '//button[contains(@class, "search-reusables__filter-trigger") or contains(@aria-label, "Sort by")]')
                         
-                        if sort_buttons:
-                            safe_click(driver, sort_buttons[0])
-                            time.sleep(random.uniform(1, 2))
+                            if sort_buttons:
+                                safe_click(driver, sort_buttons[0])
+                                time.sleep(random.uniform(1, 2))
                             
-                            recent_options = safe_find_elements(driver, By.XPATH, 
-                                '//span[text()="Recent" or contains(text(), "Most recent")]')
+                                recent_options = safe_find_elements(driver, By.XPATH, 
+                                    '//span[text()="Recent" or contains(text(), "Most recent")]')
                             
-                            if recent_options:
-                                safe_click(driver, recent_options[0])
-                                time.sleep(random.uniform(3, 5))
-                                print("Successfully sorted by recent.")
-                    except Exception as e:
-                        print(f"Could not switch to recent posts, continuing with default sort: {str(e)}")
+                                if recent_options:
+                                    safe_click(driver, recent_options[0])
+                                    time.sleep(random.uniform(3, 5))
+                                    print("Successfully sorted by recent.")
+                        except Exception as e:
+                            print(f"Could not switch to recent posts, continuing with default sort: {str(e)}")
                 
-                # Test if we can find any posts
-                post_elements = safe_find_elements(driver, By.XPATH, '//div[contains(@class, "feed-shared-update-v2")]')
-                if post_elements:
-                    print(f"Found {len(post_elements)} initial posts on {url}")
-                    break  # Found posts, continue with this URL
-                else:
-                    post_elements = safe_find_elements(driver, By.XPATH, '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@class, "feed-shared")]')
+                    # Test if we can find any posts
+                    post_elements = safe_find_elements(driver, By.XPATH, '//div[contains(@class, "feed-shared-update-v2")]')
                     if post_elements:
-                        print(f"Found {len(post_elements)} initial posts on {url} (alternative selector)")
-                        break
+                        print(f"Found {len(post_elements)} initial posts on {url}")
+                        break  # Found posts, continue with this URL
+                    else:
+                        post_elements = safe_find_elements(driver, By.XPATH, '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@class, "feed-shared")]')
+                        if post_elements:
+                            print(f"Found {len(post_elements)} initial posts on {url} (alternative selector)")
+                            break
             
-            except Exception as e:
-                print(f"Error with URL {url}: {str(e)}")
-        
-        posts_data = []
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        post_ids_seen = set()  # Track post IDs to avoid duplicates
-        consecutive_no_new_posts = 0
-        scroll_attempts = 0
-        max_scroll_attempts = 40  # Increased from 30 for more persistence
-        max_consecutive_no_new = 5  # Stop after 5 consecutive scrolls with no new posts
-        
-        # Multiple XPath options for finding posts
-        post_xpath_options = [
-            '//div[contains(@class, "feed-shared-update-v2")]',
-            '//div[contains(@class, "update-components-actor")]//ancestor::div[contains(@class, "feed-shared")]',
-            '//div[contains(@class, "scaffold-finite-scroll__content")]//div[contains(@data-urn, "urn:li:activity")]',
-            '//div[contains(@class, "search-results__cluster-content")]//div[contains(@class, "feed-shared")]'
-        ]
-
-        print(f"Beginning infinite scroll to collect {num_posts} posts...")
-        
-        while len(posts_data) < num_posts and scroll_attempts < max_scroll_attempts and consecutive_no_new_posts < max_consecutive_no_new:
-            scroll_attempts += 1
-            print(f"Scroll attempt {scroll_attempts}/{max_scroll_attempts}, posts found: {len(posts_data)}/{num_posts}")
+                except Exception as e:
+                    print(f"Error with URL {url}: {str(e)}")
+        
+            posts_data = []
+            last_height = driver.execute_script("return document.body.scrollHeight")
+            post_ids_seen = set()  # Track post IDs to avoid duplicates
+            consecutive_no_new_posts = 0
+            scroll_attempts = 0
+            max_scroll_attempts = 40  # Increased from 30 for more persistence
+            max_consecutive_no_new = 5  # Stop after 5 consecutive scrolls with no new posts
+        
+            # Wait for new posts after each scroll; min_wait keeps the pace human-like
+            scroll_waiter = ScrollWaiter(" | ".join(POST_XPATHS), timeout=scroll_timeout, min_wait=1.0)
+            # Only posts that appeared since the previous scroll are read
+            post_cursor = FeedCursor()
+
+            print(f"Beginning infinite scroll to collect {num_posts} posts...")
+        
+            while len(posts_data) < num_posts and scroll_attempts < max_scroll_attempts and consecutive_no_new_posts < max_consecutive_no_new:
+                scroll_attempts += 1
+                print(f"Scroll attempt {scroll_attempts}/{max_scroll_attempts}, posts found: {len(posts_data)}/{num_posts}")
             
-            # Try different XPath selectors for posts
-            post_elements = []
-            for xpath in post_xpath_options:
-                post_elements = safe_find_elements(driver, By.XPATH, xpath)
-                if post_elements:
-                    break
+                initial_post_count = len(posts_data)
             
-            initial_post_count = len(posts_data)
+                if extraction_mode == "js":
+                    extracted = (post_info_from_item(item) for item in POST_SELECTORS.extract(driver, cursor=post_cursor))
+                else:
+                    # Try different XPath selectors for posts
+                    post_elements = []
+                    for xpath in POST_XPATHS:
+                        post_elements = safe_find_elements(driver, By.XPATH, xpath)
+                        if post_elements:
+                            break
+                    extracted = (extract_post_dom(driver, post) for post in post_elements)
             
-            for post in post_elements:
-                if len(posts_data) >= num_posts:
-                    break
-                    
-                post_info = {}
-                
-                # Get profile handle more reliably
-                post_info["Profile Handle"] = extract_profile_handle(driver, post)
-                
-                # Get profile link more reliably - use the dedicated function
-                post_info["Profile Link"] = extract_profile_link(post)
-                
-                # Try to get post content with multiple selectors
-                content_xpath_options = [
-                    './/div[contains(@class, "update-components-text")]',
-                    './/div[contains(@class, "feed-shared-update-v2__description")]',
-                    './/div[contains(@class, "feed-shared-text")]',
-                    './/span[contains(@class, "break-words")]'
-                ]
-                
-                for xpath in content_xpath_options:
-                    content_elements = post.find_elements(By.XPATH, xpath)
-                    if content_elements:
-                        post_info["Post"] = content_elements[0].text.strip()
+                for post_info, post_id in extracted:
+                    if len(posts_data) >= num_posts:
                         break
-                
-                # Try to get post URL with multiple selectors
-                url_xpath_options = [
-                    './/a[contains(@class, "app-aware-link") and contains(@href, "/feed/update/")]',
-                    './/a[contains(@href, "activities/shares")]',
-                    './/div[contains(@class, "feed-shared-control-menu")]//ancestor::div[contains(@data-urn, "urn:li:activity")]'
-                ]
-                
-                post_id = None
-                for xpath in url_xpath_options:
-                    url_elements = post.find_elements(By.XPATH, xpath)
-                    if url_elements:
-                        if xpath.endswith('data-urn, "urn:li:activity")]'):
-                            # Extract post ID from data-urn attribute
-                            try:
-                                urn = post.get_attribute('data-urn')
-                                if urn and ":" in urn:
-                                    activity_id = urn.split(":")[-1]
-                                    post_info["DocURL"] = f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
-                                    post_id = activity_id
-                            except:
-                                pass
-                        else:
-                            href = url_elements[0].get_attribute('href')
-                            post_info["DocURL"] = href
-                            # Try to extract ID from the URL
-                            if "activity" in href:
-                                try:
-                                    post_id = href.split("activity:")[1].split("?")[0]
-                                except:
-                                    pass
-                        break
-                
-                # Try to get timestamp with multiple selectors
-                time_xpath_options = [
-                    './/span[contains(@class, "update-components-actor__sub-description")]',
-                    './/span[contains(@class, "feed-shared-actor__sub-description")]',
-                    './/span[contains(@class, "visually-hidden") and contains(text(), "ago")]',
-                    './/time'
-                ]
-                
-                for xpath in time_xpath_options:
-                    time_elements = post.find_elements(By.XPATH, xpath)
-                    if time_elements:
-                        raw_timestamp = time_elements[0].text
-                        post_info["Timestamp"] = clean_timestamp(raw_timestamp)
-                        break
-                
-                # Check if we have enough data and this post is unique by ID or URL
-                if "Post" in post_info and "DocURL" in post_info:
-                    # Use post_id if available, otherwise use URL for deduplication
-                    dedup_key = post_id if post_id else post_info.get("DocURL", "")
                     
-                    if dedup_key and dedup_key not in post_ids_seen:
-                        post_ids_seen.add(dedup_key)
-                        posts_data.append(post_info)
-                        print(f"Found new post {len(posts_data)}/{num_posts}")
-            
-            # Check if new posts were found in this scroll
-            if len(posts_data) > initial_post_count:
-                consecutive_no_new_posts = 0  # Reset counter when we find new posts
-            else:
-                consecutive_no_new_posts += 1
-                print(f"No new posts found on scroll {scroll_attempts}. Consecutive no new posts: {consecutive_no_new_posts}/{max_consecutive_no_new}")
-            
-            # Advanced scrolling technique - mix of scroll positions for better coverage
-            scrolling_technique = random.choice([
-                # Smooth scroll by smaller increments
-                lambda: driver.execute_script(f"window.scrollBy(0, {random.randint(300, 700)});"),
-                # Jump to random position
-                lambda: driver.execute_script(f"window.scrollTo(0, {random.randint(last_height//4, last_height)});"),
-                # Scroll to bottom
-                lambda: driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            ])
-            
-            scrolling_technique()
-            time.sleep(random.uniform(2.5, 5))  # Longer wait times for content to load
-            
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            
-            # If scroll height hasn't changed, try to click "Show more" buttons
-            if new_height == last_height:
-                show_more_xpath_options = [
-                    '//button[contains(@class, "scaffold-finite-scroll__load-button")]',
-                    '//button[contains(text(), "Show more results")]',
-                    '//button[contains(text(), "Load more")]',
-                    '//span[contains(text(), "Show more")]/ancestor::button',
-                    '//div[contains(@class, "feed-shared-show-more")]'
-                ]
+                    # Check if we have enough data and this post is unique by ID or URL
+                    if "Post" in post_info and "DocURL" in post_info:
+                        # Use post_id if available, otherwise use URL for deduplication
+                        dedup_key = post_id if post_id else post_info.get("DocURL", "")
+                    
+                        if dedup_key and dedup_key not in post_ids_seen:
+                            post_ids_seen.add(dedup_key)
+                            posts_data.append(post_info)
+                            print(f"Found new post {len(posts_data)}/{num_posts}")
+            
+                # Check if new posts were found in this scroll
+                if len(posts_data) > initial_post_count:
+                    consecutive_no_new_posts = 0  # Reset counter when we find new posts
+                else:
+                    consecutive_no_new_posts += 1
+                    print(f"No new posts found on scroll {scroll_attempts}. Consecutive no new posts: {consecutive_no_new_posts}/{max_consecutive_no_new}")
+            
+                # Advanced scrolling technique - mix of scroll positions for better coverage
+                scrolling_technique = random.choice([
+                    # Smooth scroll by smaller increments
+                    lambda: driver.execute_script(f"window.scrollBy(0, {random.randint(300, 700)});"),
+                    # Jump to random position
+                    lambda: driver.execute_script(f"window.scrollTo(0, {random.randint(last_height//4, last_height)});"),
+                    # Scroll to bottom
+                    lambda: driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                ])
+            
+                before_scroll = scroll_waiter.snapshot(driver)
+                scrolling_technique()
+                new_height = scroll_waiter.wait(driver, before_scroll)["height"]
+            
+                # If scroll height hasn't changed, try to click "Show more" buttons
+                if new_height == last_height:
+                    show_more_xpath_options = [
+                        '//button[contains(@class, "scaffold-finite-scroll__load-button")]',
+                        '//button[contains(text(), "Show more results")]',
+                        '//button[contains(text(), "Load more")]',
+                        '//span[contains(text(), "Show more")]/ancestor::button',
+                        '//div[contains(@class, "feed-shared-show-more")]'
+                    ]
                 
-                button_clicked = False
-                for xpath in show_more_xpath_options:
-                    show_more_buttons = safe_find_elements(driver, By.XPATH, xpath)
-                    for button in show_more_buttons:
-                        if button.is_displayed():
-                            try:
-                                print("Found 'Show more' button, attempting to click...")
-                                safe_click(driver, button)
-                                time.sleep(random.uniform(3, 6))  # Longer wait after clicking a button
-                                button_clicked = True
-                                break
-                            except Exception as e:
-                                print(f"Failed to click 'Show more' button: {str(e)}")
+                    button_clicked = False
+                    for xpath in show_more_xpath_options:
+                        show_more_buttons = safe_find_elements(driver, By.XPATH, xpath)
+                        for button in show_more_buttons:
+                            if button.is_displayed():
+                                try:
+                                    print("Found 'Show more' button, attempting to click...")
+                                    safe_click(driver, button)
+                                    time.sleep(random.uniform(3, 6))  # Longer wait after clicking a button
+                                    button_clicked = True
+                                    break
+                                except Exception as e:
+                                    print(f"Failed to click 'Show more' button: {str(e)}")
                     
-                    if button_clicked:
-                        break
+                        if button_clicked:
+                            break
                 
-                # If no button was found or clicked, try JavaScript to trigger loading more content
-                if not button_clicked:
-                    try:
-                        # Try to scroll in different ways to trigger lazy loading
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(1)
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight - 500);")
-                        time.sleep(1)
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(random.uniform(2, 4))
-                        new_height = driver.execute_script("return document.body.scrollHeight")
-                    except Exception as e:
-                        print(f"Error during alternative scroll: {str(e)}")
+                    # If no button was found or clicked, try JavaScript to trigger loading more content
+                    if not button_clicked:
+                        try:
+                            # Try to scroll in different ways to trigger lazy loading
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            time.sleep(1)
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight - 500);")
+                            time.sleep(1)
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            time.sleep(random.uniform(2, 4))
+                            new_height = driver.execute_script("return document.body.scrollHeight")
+                        except Exception as e:
+                            print(f"Error during alternative scroll: {str(e)}")
             
-            last_height = new_height
+                last_height = new_height
             
-            # Break if we've been stuck with the same height and no new posts for too long
-            if consecutive_no_new_posts >= max_consecutive_no_new:
-                print(f"Reached {consecutive_no_new_posts} consecutive scrolls with no new posts. Stopping scroll.")
+                # Break if we've been stuck with the same height and no new posts for too long
+                if consecutive_no_new_posts >= max_consecutive_no_new:
+                    print(f"Reached {consecutive_no_new_posts} consecutive scrolls with no new posts. Stopping scroll.")
         
-        print(f"Finished scrolling. Total posts found: {len(posts_data)}/{num_posts}")
+            print(f"Finished scrolling. Total posts found: {len(posts_data)}/{num_posts}")
+            print(scroll_waiter.summary())
         
-    except Exception as e:
-        print(f"Error in scrape_linkedin_posts: {str(e)}")
-    finally:
-        driver.quit()
+        except Exception as e:
+            print(f"Error in scrape_linkedin_posts: {str(e)}")
     
-    print(f"Scraped {len(posts_data)} LinkedIn posts.")
-    return posts_data
+        print(f"Scraped {len(posts_data)} LinkedIn posts.")
+        return posts_data
 
 
 
 
 def analyze_posts(posts_data):
-    results = []
-    posts_text = [post["Post"] for post in posts_data if "Post" in post]
+    posts_data = [post for post in posts_data if "Post" in post]
     
-    if not posts_text:
+    if not posts_data:
         return pd.DataFrame()
         
-    similarity_scores = calculate_similarity_scores(posts_text, intent_data)
+    posts_text = [post["Post"] for post in posts_data]
+    best_match_indices, best_match_scores = match_intents(posts_text, intent_data)
 
-    for i, post in enumerate(posts_data):
-        if "Post" not in post:
-            continue
-            
-        best_match_index = similarity_scores[i].argmax()
-        best_match_score = similarity_scores[i, best_match_index].item()
-        best_match_intent = intent_data[best_match_index]
-
-        results.append({
-            "Profile Handle": post.get("Profile Handle", "Unknown"),
-            "Profile Link": post.get("Profile Link", ""),  # Ensure profile link is stored
-            "DocURL": post.get("DocURL", ""),
-            "Timestamp": post.get("Timestamp", ""),
-            "Target Sentence": post.get("Post", ""),
-            "Best Matched Intent": best_match_intent,
-            "Similarity Score": round(best_match_score, 6)
-        })
-
-    df = pd.DataFrame(results)
+    df = build_intent_frame(posts_data, [
+        ("Profile Handle", "Profile Handle", "Unknown"),
+        ("Profile Link", "Profile Link", ""),  # Ensure profile link is stored
+        ("DocURL", "DocURL", ""),
+        ("Timestamp", "Timestamp", ""),
+        ("Target Sentence", "Post", ""),
+    ], intent_data, best_match_indices, best_match_scores)
     return df
 
 def analyze_comments(comments_data):
@@ -790,34 +892,42 @@ def analyze_comments(comments_data):
     if not comments_data:
         return pd.DataFrame()
         
-    results = []
-    comments_text = [comment["Comment Text"] for comment in comments_data if "Comment Text" in comment]
+    comments_data = [comment for comment in comments_data if "Comment Text" in comment]
     
-    if not comments_text:
+    if not comments_data:
         return pd.DataFrame()
         
-    similarity_scores = calculate_similarity_scores(comments_text, intent_data)
+    comments_text = [comment["Comment Text"] for comment in comments_data]
+    best_match_indices, best_match_scores = match_intents(comments_text, intent_data)
 
-    for i, comment in enumerate(comments_data):
-        if "Comment Text" not in comment:
-            continue
-            
-        best_match_index = similarity_scores[i].argmax()
-        best_match_score = similarity_scores[i, best_match_index].item()
-        best_match_intent = intent_data[best_match_index]
-
-        results.append({
-            "Profile Handle": comment.get("Profile Handle", "Unknown"),
-            "Profile Link": comment.get("Profile Link", ""),
-            "Original Post URL": comment.get("Original Post URL", ""),
-            "Comment Text": comment.get("Comment Text", ""),
-            "Best Matched Intent": best_match_intent,
-            "Similarity Score": round(best_match_score, 6)
-        })
-
-    df = pd.DataFrame(results)
+    df = build_intent_frame(comments_data, [
+        ("Profile Handle", "Profile Handle", "Unknown"),
+        ("Profile Link", "Profile Link", ""),
+        ("Original Post URL", "Original Post URL", ""),
+        ("Comment Text", "Comment Text", ""),
+    ], intent_data, best_match_indices, best_match_scores)
     return df
 
+def save_results(df, name, key_column, keyword, csv_path, write_mode=LINKEDIN_WRITE_MODE):
+    """
+    Save an analysis DataFrame locally and return where it went.
+
+    Args:
+        name: Result store table (e.g. "linkedin_posts")
+        key_column: Column (or tuple of columns) identifying a row
+        csv_path: CSV file used by the csv backend and by overwrite mode
+        write_mode: "append" adds the rows not stored yet through the result store
+            (CSV, Parquet or SQLite, see result_store.py); "overwrite" replaces csv_path with df
+    """
+    if write_mode == "overwrite":
+        df.to_csv(csv_path, index=False)
+        return csv_path
+    if write_mode != "append":
+        raise ValueError(f"Unknown LinkedIn write mode: {write_mode}")
+    store = open_result_store(name, key_column, keyword, csv_path=csv_path)
+    store.append(df)
+    return store.path
+
 def main():
     try:
         print("Starting LinkedIn scraper...")
@@ -833,22 +943,27 @@ def main():
         keyword = "Critical Thinking Artificial Intelligence"
         num_posts = 5  # Start with a small number to test
         
-        posts_data = scrape_linkedin_posts(keyword, num_posts=num_posts)
+        comment_workers = 1  # Browsers scraping comments in parallel (extra workers need their own logged-in profile)
+        
+        # One warm browser shared by the post and comment scrapers, relaunched every 25 pages
+        driver_pool = DriverPool(setup_driver, size=1, max_uses=25)
+        comment_driver_pools = worker_driver_pools(driver_pool, setup_driver, comment_workers)
+        
+        posts_data = scrape_linkedin_posts(keyword, num_posts=num_posts, driver_pool=driver_pool)
         
         if not posts_data:
             print("No posts were found. Trying alternative approach...")
             # Try a different keyword or approach
             keyword = "AI"
-            posts_data = scrape_linkedin_posts(keyword, num_posts=num_posts)
+            posts_data = scrape_linkedin_posts(keyword, num_posts=num_posts, driver_pool=driver_pool)
             
         # Save posts data
         if posts_data:
             posts_df = analyze_posts(posts_data)
             
-            # Save to local CSV
-            posts_csv_filename = "LinkedIn_posts_result.csv"
-            posts_df.to_csv(posts_csv_filename, index=False)
-            print(f"LinkedIn posts analysis complete! Saved to {posts_csv_filename}")
+            # Save locally (appended to LinkedIn_posts_result.csv by default)
+            posts_location = save_results(posts_df, "linkedin_posts", "DocURL", keyword, POSTS_CSV_FILENAME)
+            print(f"LinkedIn posts analysis complete! Saved to {posts_location}")
             
             # Upload to Google Sheets
             posts_sheet_link = None
@@ -858,22 +973,20 @@ def main():
                     print(f"Posts data uploaded to Google Sheets. Access at: {posts_sheet_link}")
             
             # Scrape and save comments data
-            all_comments = []
-            for i, post in enumerate(posts_data):
-                if "DocURL" in post:
-                    print(f"Scraping comments for post {i+1}/{len(posts_data)}")
-                    post_comments = scrape_linkedin_post_comments(post["DocURL"])
-                    all_comments.extend(post_comments)
-                    # Add a small delay to avoid rate limiting
-                    time.sleep(random.uniform(2, 4))
+            # Keep 2-4 seconds between page loads on linkedin.com across all workers
+            all_comments = scrape_concurrently(
+                [post["DocURL"] for post in posts_data if "DocURL" in post],
+                lambda post_url, pool: scrape_linkedin_post_comments(post_url, driver_pool=pool),
+                comment_driver_pools,
+                rate_limiter=DomainRateLimiter(default_interval=2, jitter=2))
             
             if all_comments:
                 comments_df = analyze_comments(all_comments)
                 
-                # Save to local CSV
-                comments_csv_filename = "LinkedIn_comments.csv"
-                comments_df.to_csv(comments_csv_filename, index=False)
-                print(f"Comments analysis complete! Saved to {comments_csv_filename}")
+                # Save locally (appended to LinkedIn_comments.csv by default)
+                comments_location = save_results(comments_df, "linkedin_comments", COMMENT_KEY, keyword,
+                                                 COMMENTS_CSV_FILENAME)
+                print(f"Comments analysis complete! Saved to {comments_location}")
                 print(f"Total comments scraped: {len(all_comments)}")
                 
                 # Upload to Google Sheets
@@ -895,6 +1008,10 @@ def main():
             
     except Exception as e:
         print(f"Error in main function: {str(e)}")
+    finally:
+        if 'comment_driver_pools' in locals():
+            for pool in comment_driver_pools:
+                pool.close()
         
     print("LinkedIn scraper completed.")
 
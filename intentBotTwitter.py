@@ -1,15 +1,24 @@
 import pandas as pd
 import time
 import pytz
-import os
+import atexit
 from datetime import datetime
 import undetected_chromedriver as uc
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from cosine_sim import calculate_similarity_scores  # Ensure cosine_sim.py exists
+from cosine_sim import match_intents, build_intent_frame  # Ensure cosine_sim.py exists
+from driver_pool import DriverPool, driver_session
+from scrape_scheduler import DomainRateLimiter, scrape_concurrently, worker_driver_pools
+from scroll_wait import ScrollWaiter
+from feed_cursor import FeedCursor
+from pipeline import ScoringPipeline
+from result_store import open_result_store
+from seen_filter import SeenSet
+from data_catalog import DataCatalog
+from lean_browsing import LEAN_BROWSING, HEADLESS, lean_chrome_options, block_heavy_requests
+from x_network import (NETWORK_CAPTURE, SEARCH_OPERATION, CONVERSATION_OPERATION, enable_network_logging,
+                       start_capture, conversation_id_of, conversation_replies, tweet_id_from_url)
 
 # New imports for Google Sheets API
 import gspread
@@ -99,54 +108,43 @@ def append_to_sheets(df, sheet_name, tab_name):
         print(f"Error working with Google Sheets: {str(e)}")
         return None, df
 
-def append_to_csv(df, filename):
-    """Append dataframe to CSV file, preserving existing data."""
-    combined_df = df
-    
-    try:
-        if os.path.exists(filename):
-            # Read existing data
-            existing_df = pd.read_csv(filename)
-            print(f"Found existing data in file: {len(existing_df)} rows")
-            
-            # Concatenate with new data
-            combined_df = pd.concat([existing_df, df], ignore_index=True)
-            
-            # Remove duplicates based on URL (DocURL or ReplyURL)
-            if 'DocURL' in combined_df.columns:
-                combined_df = combined_df.drop_duplicates(subset=['DocURL'], keep='last')
-            elif 'ReplyURL' in combined_df.columns:
-                combined_df = combined_df.drop_duplicates(subset=['ReplyURL'], keep='last')
-        
-        # Save combined data
-        combined_df.to_csv(filename, index=False)
-        print(f"Data appended to {filename}")
-        print(f"Total rows in file now: {len(combined_df)}")
-        
-    except Exception as e:
-        print(f"Error appending to CSV: {str(e)}")
-        # Attempt to save just the new data if there was an error
-        try:
-            df.to_csv(filename, index=False)
-            print(f"Saved new data only to {filename}")
-        except:
-            print(f"Failed to save data to {filename}")
-    
-    return combined_df
+# Logged-in Chrome profile used by the scraper
+CHROME_USER_DATA_DIR = r'C:\Users\Shubham Dutta\AppData\Local\Google\Chrome\User Data'
+CHROME_PROFILE_DIRECTORY = 'Profile 2'
 
-def setup_driver():
+# How tweets and replies are read by default; "network" parses X's own timeline
+# responses and needs browsers launched with capture_network (X_NETWORK_CAPTURE=1)
+TWEET_EXTRACTION_MODE = "network" if NETWORK_CAPTURE else "js"
+REPLY_EXTRACTION_MODE = "network" if NETWORK_CAPTURE else "dom"
+
+def setup_driver(user_data_dir=CHROME_USER_DATA_DIR, profile_directory=CHROME_PROFILE_DIRECTORY,
+                 lean=LEAN_BROWSING, headless=HEADLESS, capture_network=NETWORK_CAPTURE):
+    """
+    Launch undetected Chrome on the given profile. lean blocks images, media,
+    fonts and trackers (see lean_browsing.py); headless runs without a window;
+    capture_network enables the performance log that "network" extraction reads.
+    """
     print("Setting up Chrome driver...")
     chrome_options = uc.ChromeOptions()
 
-    chrome_options.add_argument(r'--user-data-dir=C:\Users\Shubham Dutta\AppData\Local\Google\Chrome\User Data')
-    chrome_options.add_argument(r'--profile-directory=Profile 2')
+    chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+    chrome_options.add_argument(f'--profile-directory={profile_directory}')
 
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
 
+    if lean:
+        lean_chrome_options(chrome_options, headless=headless)
+    elif headless:
+        chrome_options.add_argument("--headless=new")
+    if capture_network:
+        enable_network_logging(chrome_options)
+
     driver = uc.Chrome(options=chrome_options)
+    if lean:
+        block_heavy_requests(driver)
     return driver
 
 def convert_to_ist(utc_datetime_str):
@@ -156,191 +154,338 @@ def convert_to_ist(utc_datetime_str):
     ist_datetime = utc_datetime.astimezone(ist_timezone)
     return ist_datetime.strftime("%Y-%m-%d"), ist_datetime.strftime("%H:%M:%S")
 
-def get_existing_urls(tweets_filename, replies_filename):
-    """Get sets of existing URLs to avoid duplicates when scraping."""
-    existing_tweet_urls = set()
-    existing_reply_urls = set()
-    
+# Reads url, author, text and timestamp of every cellInnerDiv on the page in one
+# WebDriver round-trip. Mirrors the XPaths used by the "dom" extraction mode.
+# With a mark ({attribute, token}), cells already returned complete are skipped
+# and new complete cells are tagged. X recycles cell nodes while scrolling, so
+# the tag holds the tweet URL and a recycled cell showing another tweet is read again.
+EXTRACT_TWEET_CELLS_JS = """
+var mark = arguments[0];
+var records = [];
+document.querySelectorAll('div[data-testid="cellInnerDiv"]').forEach(function (cell) {
+    var status = cell.querySelector('a[href*="status"]');
+    var url = status ? status.href : null;
+    if (mark && url && cell.getAttribute(mark.attribute) === mark.token + ' ' + url) return;
+    var userName = cell.querySelector('div[data-testid="User-Name"]');
+    var userLinks = userName ? userName.querySelectorAll('a') : [];
+    var profile = userLinks.length > 1 ? userLinks[1] : null;
+    var text = cell.querySelector('div[data-testid="tweetText"]');
+    var time = cell.querySelector('time');
+    var record = {
+        url: url,
+        profile_link: profile ? profile.href : null,
+        handle: profile ? profile.innerText : null,
+        text: text ? text.innerText : null,
+        datetime: time ? time.getAttribute('datetime') : null
+    };
+    if (mark && url && profile && text && time) cell.setAttribute(mark.attribute, mark.token + ' ' + url);
+    records.push(record);
+});
+return records;
+"""
+
+def extract_tweet_cells(driver, cursor=None):
+    """
+    Return a list of {url, profile_link, handle, text, datetime} dicts for the visible tweets.
+    With a FeedCursor, tweets already returned complete by an earlier call are left out.
+    """
+    mark = {"attribute": cursor.attribute, "token": cursor.token} if cursor is not None else None
     try:
-        if os.path.exists(tweets_filename):
-            tweets_df = pd.read_csv(tweets_filename)
-            if 'DocURL' in tweets_df.columns:
-                existing_tweet_urls = set(tweets_df['DocURL'].dropna().tolist())
-                print(f"Loaded {len(existing_tweet_urls)} existing tweet URLs")
+        return driver.execute_script(EXTRACT_TWEET_CELLS_JS, mark) or []
+    except Exception as e:
+        print(f"Error extracting tweets with JavaScript: {str(e)}")
+        return []
+
+def tweet_info_from_network(tweet):
+    """Convert a parsed SearchTimeline tweet (see x_network.parse_tweet) to a tweet record."""
+    date, time_of_day = convert_to_ist(tweet["created_at"])
+    return {
+        "DocURL": tweet["url"],
+        "Profile Link": f"https://x.com/{tweet['handle']}",
+        "Profile Handle": f"@{tweet['handle']}",
+        "Post": tweet["text"],
+        "Date": date,
+        "Time": time_of_day,
+    }
+
+def tweet_info_from_cell(cell):
+    """Convert one extract_tweet_cells entry to a tweet record, or None if fields are missing."""
+    if cell.get("profile_link") is None or cell.get("text") is None or not cell.get("datetime"):
+        return None
+    try:
+        date, time_of_day = convert_to_ist(cell["datetime"])
+    except Exception:
+        return None
+    return {
+        "DocURL": cell["url"],
+        "Profile Link": cell["profile_link"],
+        "Profile Handle": cell["handle"],
+        "Post": cell["text"],
+        "Date": date,
+        "Time": time_of_day,
+    }
+
+def get_existing_urls(tweets_store, replies_store):
+    """
+    Seen-URL sets for the tweet and reply scrapers. Each is a persistent Bloom
+    filter next to the result store, confirmed against the store on a hit (see
+    seen_filter.py), so no set of every stored URL is built here. The scrapers
+    add the URLs they collect.
+    """
+    try:
+        existing_tweet_urls = SeenSet(tweets_store)
+        print(f"Seen-URL filter holds {len(existing_tweet_urls)} tweet URLs")
     except Exception as e:
         print(f"Error loading existing tweets: {str(e)}")
+        existing_tweet_urls = set()
     
     try:
-        if os.path.exists(replies_filename):
-            replies_df = pd.read_csv(replies_filename)
-            if 'ReplyURL' in replies_df.columns:
-                existing_reply_urls = set(replies_df['ReplyURL'].dropna().tolist())
-                print(f"Loaded {len(existing_reply_urls)} existing reply URLs")
+        existing_reply_urls = SeenSet(replies_store)
+        print(f"Seen-URL filter holds {len(existing_reply_urls)} reply URLs")
     except Exception as e:
         print(f"Error loading existing replies: {str(e)}")
+        existing_reply_urls = set()
     
     return existing_tweet_urls, existing_reply_urls
 
-def scrape_tweet_replies(tweet_url, existing_reply_urls=None, max_replies=50):
-    """Scrape replies for a specific tweet, skipping already seen URLs."""
-    if existing_reply_urls is None:
-        existing_reply_urls = set()
-        
-    driver = setup_driver()
-    print(f"Opening tweet URL: {tweet_url}")
-    driver.get(tweet_url)
-    time.sleep(5)
-    
+def reply_info_from_network(tweet, tweet_url):
+    """Convert a parsed TweetDetail reply (see x_network.parse_tweet) to a reply record."""
+    date, time_of_day = convert_to_ist(tweet["created_at"])
+    return {
+        "ReplyURL": tweet["url"],
+        "Profile Link": f"https://x.com/{tweet['handle']}",
+        "Profile Handle": f"@{tweet['handle']}",
+        "Reply Text": tweet["text"],
+        "Date": date,
+        "Time": time_of_day,
+        "Original Tweet URL": tweet_url,
+    }
+
+def replies_from_network(driver, capture, tweet_url, existing_reply_urls, max_replies, max_scrolls=30,
+                         on_record=None):
+    """Collect replies from the conversation's TweetDetail responses while scrolling, without reading the DOM."""
+    tweet_id = tweet_id_from_url(tweet_url)
+    conversation_id = None
     replies_data = []
     seen_reply_urls = set()
     scroll_count = 0
-    max_scrolls = 30  # Limit scrolling to avoid infinite loops
     no_new_replies_count = 0
     
-    try:
-        # First, make sure the tweet loads
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.XPATH, '//article[@data-testid="tweet"]'))
-        )
+    while len(replies_data) < max_replies and scroll_count < max_scrolls and no_new_replies_count < 5:
+        new_replies_found = False
+        tweets = capture.tweets(CONVERSATION_OPERATION)
+        if conversation_id is None:
+            conversation_id = conversation_id_of(tweets, tweet_id)  # the focal tweet comes in the first response
+        for reply in conversation_replies(tweets, tweet_id, conversation_id):
+            reply_url = reply["url"]
+            if not reply["text"] or reply_url in seen_reply_urls or reply_url in existing_reply_urls:
+                continue
+            seen_reply_urls.add(reply_url)
+            new_replies_found = True
+            reply_info = reply_info_from_network(reply, tweet_url)
+            replies_data.append(reply_info)
+            existing_reply_urls.add(reply_url)
+            if on_record is not None:
+                on_record(reply_info)
+            if len(replies_data) >= max_replies:
+                break
         
-        # Wait a bit more to ensure replies have a chance to load
+        no_new_replies_count = 0 if new_replies_found else no_new_replies_count + 1
+        
+        # Scrolling makes the page fetch the next page of replies
+        driver.execute_script("window.scrollBy(0, 1000)")
         time.sleep(3)
+        scroll_count += 1
+        print(f"Scrolled {scroll_count} times, found {len(replies_data)} replies so far")
+    
+    print(f"Found {len(replies_data)} replies in the network responses")
+    return replies_data
+
+def scrape_tweet_replies(tweet_url, existing_reply_urls=None, max_replies=50, driver_pool=None,
+                         extraction_mode=REPLY_EXTRACTION_MODE, on_record=None):
+    """
+    Scrape replies for a specific tweet, skipping already seen URLs.
+    Uses a warm browser from driver_pool when given, otherwise launches its own.
+    extraction_mode "network" parses the TweetDetail responses; "dom" reads the rendered replies.
+    on_record, if given, is called with each valid reply as soon as it is scraped.
+    """
+    if existing_reply_urls is None:
+        existing_reply_urls = set()
         
-        # Try different approaches to find replies
-        reply_containers_xpath = '//div[@aria-label="Timeline: Conversation" or @data-testid="reply"]//article'
+    with driver_session(driver_pool, setup_driver) as driver:
+        capture = start_capture(driver, [CONVERSATION_OPERATION]) if extraction_mode == "network" else None
         
-        print("Waiting for replies to load...")
+        print(f"Opening tweet URL: {tweet_url}")
+        driver.get(tweet_url)
+        time.sleep(5)
         
-        while len(replies_data) < max_replies and scroll_count < max_scrolls and no_new_replies_count < 5:
-            # Find all reply elements (excluding the original tweet)
-            reply_elements = driver.find_elements(By.XPATH, reply_containers_xpath)
+        if capture is not None:
+            try:
+                return replies_from_network(driver, capture, tweet_url, existing_reply_urls, max_replies,
+                                            on_record=on_record)
+            except Exception as e:
+                print(f"Error during reply scraping: {str(e)}")
+                return []
+    
+        replies_data = []
+        seen_reply_urls = set()
+        scroll_count = 0
+        max_scrolls = 30  # Limit scrolling to avoid infinite loops
+        no_new_replies_count = 0
+    
+        try:
+            # First, make sure the tweet loads
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.XPATH, '//article[@data-testid="tweet"]'))
+            )
+        
+            # Wait a bit more to ensure replies have a chance to load
+            time.sleep(3)
+        
+            # Try different approaches to find replies
+            reply_containers_xpath = '//div[@aria-label="Timeline: Conversation" or @data-testid="reply"]//article'
+        
+            print("Waiting for replies to load...")
+        
+            while len(replies_data) < max_replies and scroll_count < max_scrolls and no_new_replies_count < 5:
+                # Find all reply elements (excluding the original tweet)
+                reply_elements = driver.find_elements(By.XPATH, reply_containers_xpath)
             
-            # Debug output
-            print(f"Found {len(reply_elements)} potential reply elements on screen")
+                # Debug output
+                print(f"Found {len(reply_elements)} potential reply elements on screen")
             
-            if len(reply_elements) <= 1:  # Only original tweet or no replies
-                print("No replies found yet. Scrolling to load more content...")
-                driver.execute_script("window.scrollBy(0, 800)")
-                time.sleep(3)
-                scroll_count += 1
-                continue
+                if len(reply_elements) <= 1:  # Only original tweet or no replies
+                    print("No replies found yet. Scrolling to load more content...")
+                    driver.execute_script("window.scrollBy(0, 800)")
+                    time.sleep(3)
+                    scroll_count += 1
+                    continue
                 
-            new_replies_found = False
+                new_replies_found = False
             
-            for reply in reply_elements:
-                try:
-                    # Skip elements that might be the original tweet
-                    if scroll_count == 0 and reply_elements.index(reply) == 0:
-                        continue
+                for reply in reply_elements:
+                    try:
+                        # Skip elements that might be the original tweet
+                        if scroll_count == 0 and reply_elements.index(reply) == 0:
+                            continue
                         
-                    # Try to get reply URL first
-                    links = reply.find_elements(By.XPATH, './/a[contains(@href, "/status/")]')
-                    if not links:
-                        continue
+                        # Try to get reply URL first
+                        links = reply.find_elements(By.XPATH, './/a[contains(@href, "/status/")]')
+                        if not links:
+                            continue
                         
-                    reply_url = links[0].get_attribute('href')
+                        reply_url = links[0].get_attribute('href')
                     
-                    # Skip if we've already seen this reply in this session or in previous runs
-                    if reply_url in seen_reply_urls or reply_url in existing_reply_urls:
-                        continue
+                        # Skip if we've already seen this reply in this session or in previous runs
+                        if reply_url in seen_reply_urls or reply_url in existing_reply_urls:
+                            continue
                     
-                    # Skip if this is actually the original tweet URL
-                    if reply_url == tweet_url:
-                        continue
+                        # Skip if this is actually the original tweet URL
+                        if reply_url == tweet_url:
+                            continue
                         
-                    # Extract reply data
-                    reply_info = {}
-                    seen_reply_urls.add(reply_url)
-                    reply_info["ReplyURL"] = reply_url
-                    new_replies_found = True
+                        # Extract reply data
+                        reply_info = {}
+                        seen_reply_urls.add(reply_url)
+                        reply_info["ReplyURL"] = reply_url
+                        new_replies_found = True
                     
-                    # Try to get profile info
-                    try:
-                        profile_element = reply.find_element(By.XPATH, './/div[@data-testid="User-Name"]')
-                        profile_links = profile_element.find_elements(By.XPATH, './/a')
-                        if len(profile_links) >= 2:
-                            reply_info["Profile Link"] = profile_links[1].get_attribute('href')
-                            reply_info["Profile Handle"] = profile_links[1].text
-                        else:
-                            reply_info["Profile Link"] = profile_links[0].get_attribute('href')
-                            reply_info["Profile Handle"] = profile_links[0].text
-                    except Exception as e:
-                        print(f"Error getting profile info: {str(e)}")
-                        reply_info["Profile Link"] = ""
-                        reply_info["Profile Handle"] = ""
+                        # Try to get profile info
+                        try:
+                            profile_element = reply.find_element(By.XPATH, './/div[@data-testid="User-Name"]')
+                            profile_links = profile_element.find_elements(By.XPATH, './/a')
+                            if len(profile_links) >= 2:
+                                reply_info["Profile Link"] = profile_links[1].get_attribute('href')
+                                reply_info["Profile Handle"] = profile_links[1].text
+                            else:
+                                reply_info["Profile Link"] = profile_links[0].get_attribute('href')
+                                reply_info["Profile Handle"] = profile_links[0].text
+                        except Exception as e:
+                            print(f"Error getting profile info: {str(e)}")
+                            reply_info["Profile Link"] = ""
+                            reply_info["Profile Handle"] = ""
                     
-                    # Try to get reply text
-                    try:
-                        tweet_text_element = reply.find_element(By.XPATH, './/div[@data-testid="tweetText"]')
-                        reply_info["Reply Text"] = tweet_text_element.text
-                    except Exception as e:
-                        print(f"Error getting reply text: {str(e)}")
-                        # Try an alternative approach
+                        # Try to get reply text
                         try:
-                            reply_info["Reply Text"] = reply.text.split('\n')[2]  # Often the text is in the third line
-                        except:
-                            reply_info["Reply Text"] = "[Text extraction failed]"
+                            tweet_text_element = reply.find_element(By.XPATH, './/div[@data-testid="tweetText"]')
+                            reply_info["Reply Text"] = tweet_text_element.text
+                        except Exception as e:
+                            print(f"Error getting reply text: {str(e)}")
+                            # Try an alternative approach
+                            try:
+                                reply_info["Reply Text"] = reply.text.split('\n')[2]  # Often the text is in the third line
+                            except:
+                                reply_info["Reply Text"] = "[Text extraction failed]"
                     
-                    # Try to get time
-                    try:
-                        time_element = reply.find_element(By.XPATH, './/time')
-                        utc_datetime_str = time_element.get_attribute('datetime')
-                        reply_info["Date"], reply_info["Time"] = convert_to_ist(utc_datetime_str)
-                    except Exception as e:
-                        print(f"Error getting time: {str(e)}")
-                        reply_info["Date"] = ""
-                        reply_info["Time"] = ""
+                        # Try to get time
+                        try:
+                            time_element = reply.find_element(By.XPATH, './/time')
+                            utc_datetime_str = time_element.get_attribute('datetime')
+                            reply_info["Date"], reply_info["Time"] = convert_to_ist(utc_datetime_str)
+                        except Exception as e:
+                            print(f"Error getting time: {str(e)}")
+                            reply_info["Date"] = ""
+                            reply_info["Time"] = ""
                     
-                    reply_info["Original Tweet URL"] = tweet_url
-                    replies_data.append(reply_info)
+                        reply_info["Original Tweet URL"] = tweet_url
+                        replies_data.append(reply_info)
+                        existing_reply_urls.add(reply_url)
+                        if on_record is not None and reply_info.get("Reply Text"):
+                            on_record(reply_info)
                     
-                    # Print progress
-                    if len(replies_data) % 5 == 0:
-                        print(f"Found {len(replies_data)} new replies so far")
+                        # Print progress
+                        if len(replies_data) % 5 == 0:
+                            print(f"Found {len(replies_data)} new replies so far")
                         
-                except Exception as e:
-                    print(f"Error processing a reply: {str(e)}")
-                    continue
+                    except Exception as e:
+                        print(f"Error processing a reply: {str(e)}")
+                        continue
             
-            # Scroll down to load more replies
-            driver.execute_script("window.scrollBy(0, 1000)")
-            time.sleep(3)
-            scroll_count += 1
+                # Scroll down to load more replies
+                driver.execute_script("window.scrollBy(0, 1000)")
+                time.sleep(3)
+                scroll_count += 1
             
-            # Check if we found new replies in this scroll
-            if not new_replies_found:
-                no_new_replies_count += 1
-                print(f"No new replies found in scroll #{scroll_count}. Attempt {no_new_replies_count}/5")
-            else:
-                no_new_replies_count = 0
+                # Check if we found new replies in this scroll
+                if not new_replies_found:
+                    no_new_replies_count += 1
+                    print(f"No new replies found in scroll #{scroll_count}. Attempt {no_new_replies_count}/5")
+                else:
+                    no_new_replies_count = 0
                 
-            # Print scroll status
-            print(f"Scrolled {scroll_count} times, found {len(replies_data)} replies so far")
+                # Print scroll status
+                print(f"Scrolled {scroll_count} times, found {len(replies_data)} replies so far")
                 
-    except Exception as e:
-        print(f"Error during reply scraping: {str(e)}")
+        except Exception as e:
+            print(f"Error during reply scraping: {str(e)}")
     
-    # Extra validation before returning
-    valid_replies = []
-    for reply in replies_data:
-        if "Reply Text" in reply and reply["Reply Text"] and "ReplyURL" in reply:
-            valid_replies.append(reply)
+        # Extra validation before returning
+        valid_replies = []
+        for reply in replies_data:
+            if "Reply Text" in reply and reply["Reply Text"] and "ReplyURL" in reply:
+                valid_replies.append(reply)
     
-    print(f"Found {len(valid_replies)} valid replies out of {len(replies_data)} total")
-    driver.quit()
-    return valid_replies
+        print(f"Found {len(valid_replies)} valid replies out of {len(replies_data)} total")
+        return valid_replies
 
 
     
-def scrape_tweets_with_metadata(keyword, existing_urls=None, max_tweets=1000, max_time_minutes=30):
+def scrape_tweets_with_metadata(keyword, existing_urls=None, max_tweets=1000, max_time_minutes=30, driver_pool=None,
+                                extraction_mode=TWEET_EXTRACTION_MODE, scroll_timeout=5, on_record=None):
     """
     Scrape tweets with infinite scrolling capability, skipping already seen URLs.
     
     Args:
         keyword: Search term to use
-        existing_urls: Set of URLs that have already been scraped
+        existing_urls: Set of URLs that have already been scraped (e.g. a SeenSet); new URLs are added to it
         max_tweets: Maximum number of new tweets to collect
         max_time_minutes: Maximum time to run the scraper in minutes
+        driver_pool: Optional DriverPool to borrow the browser from
+        extraction_mode: "network" parses the SearchTimeline responses the page fetches;
+            "js" reads every visible tweet with a single execute_script per scroll;
+            "dom" walks each tweet with find_element calls
+        scroll_timeout: Maximum seconds to wait for new tweets after each scroll
+        on_record: Optional callback receiving each new tweet as soon as it is scraped
         
     Returns:
         List of tweet data dictionaries
@@ -348,116 +493,158 @@ def scrape_tweets_with_metadata(keyword, existing_urls=None, max_tweets=1000, ma
     if existing_urls is None:
         existing_urls = set()
         
-    driver = setup_driver()
-    tweets_data = []
+    with driver_session(driver_pool, setup_driver) as driver:
+        tweets_data = []
+        
+        def collect(tweet_info):
+            tweets_data.append(tweet_info)
+            existing_urls.add(tweet_info.get("DocURL"))
+            if on_record is not None:
+                on_record(tweet_info)
+    
+        # Track seen tweet URLs to avoid duplicates within this session
+        seen_tweet_urls = set()
+    
+        # Initialize tracking variables
+        start_time = time_module.time()
+        max_time_seconds = max_time_minutes * 60
+        last_tweets_count = 0
+        consecutive_no_new_tweets = 0
+        scroll_count = 0
+    
+        capture = None
+        if extraction_mode == "network":
+            capture = start_capture(driver, [SEARCH_OPERATION])
+            if capture is None:
+                extraction_mode = "js"
+    
+        print(f"Opening Twitter to search for '{keyword}'...")
+        search_url = f"https://x.com/search?q={keyword}&src=typed_query&f=live"
+        driver.get(search_url)
+        time.sleep(5)
     
-    # Track seen tweet URLs to avoid duplicates within this session
-    seen_tweet_urls = set()
+        divxpath = '//div[@data-testid="cellInnerDiv"]'
+        try:
+            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, divxpath)))
+        except Exception as e:
+            print(f"Error waiting for tweets to load: {str(e)}")
+            return tweets_data
     
-    # Initialize tracking variables
-    start_time = time_module.time()
-    max_time_seconds = max_time_minutes * 60
-    last_tweets_count = 0
-    consecutive_no_new_tweets = 0
-    scroll_count = 0
+        scroll_waiter = ScrollWaiter(divxpath, timeout=scroll_timeout)
+        # Only tweets that appeared since the previous scroll are read
+        tweet_cursor = FeedCursor()
     
-    print(f"Opening Twitter to search for '{keyword}'...")
-    search_url = f"https://x.com/search?q={keyword}&src=typed_query&f=live"
-    driver.get(search_url)
-    time.sleep(5)
+        print(f"Starting infinite scroll to collect up to {max_tweets} new tweets (max time: {max_time_minutes} minutes)...")
+        print(f"Skipping {len(existing_urls)} already scraped tweets")
     
-    divxpath = '//div[@data-testid="cellInnerDiv"]'
-    try:
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, divxpath)))
-    except Exception as e:
-        print(f"Error waiting for tweets to load: {str(e)}")
-        driver.quit()
-        return tweets_data
-    
-    print(f"Starting infinite scroll to collect up to {max_tweets} new tweets (max time: {max_time_minutes} minutes)...")
-    print(f"Skipping {len(existing_urls)} already scraped tweets")
-    
-    # Main scrolling loop
-    while len(tweets_data) < max_tweets and (time_module.time() - start_time) < max_time_seconds:
-        scroll_count += 1
-        try:
-            # Find all tweet elements currently on the page
-            tweet_elements = driver.find_elements(By.XPATH, divxpath)
-            
-            new_tweets_found = False
+        # Main scrolling loop
+        while len(tweets_data) < max_tweets and (time_module.time() - start_time) < max_time_seconds:
+            scroll_count += 1
+            try:
+                new_tweets_found = False
             
-            # Process visible tweets
-            for tweet in tweet_elements:
-                tweet_info = {}
-                tweet_url = None
+                if extraction_mode == "network":
+                    # Tweets come from the search responses fetched so far; the page isn't read
+                    for tweet in capture.tweets(SEARCH_OPERATION):
+                        tweet_url = tweet["url"]
+                        if tweet_url in seen_tweet_urls or tweet_url in existing_urls:
+                            continue
+                        
+                        seen_tweet_urls.add(tweet_url)
+                        new_tweets_found = True
+                        collect(tweet_info_from_network(tweet))
+                elif extraction_mode == "js":
+                    # One execute_script call returns the fields of every visible tweet
+                    for cell in extract_tweet_cells(driver, cursor=tweet_cursor):
+                        tweet_url = cell.get("url")
+                        
+                        # Skip if we've already seen this tweet in this session or in previous runs
+                        if not tweet_url or tweet_url in seen_tweet_urls or tweet_url in existing_urls:
+                            continue
+                        
+                        seen_tweet_urls.add(tweet_url)
+                        new_tweets_found = True
+                        
+                        tweet_info = tweet_info_from_cell(cell)
+                        if tweet_info:
+                            collect(tweet_info)
+                else:
+                    # Find all tweet elements currently on the page
+                    tweet_elements = driver.find_elements(By.XPATH, divxpath)
                 
-                try:
-                    # Try to get tweet URL first to check if we've seen it
-                    tweet_url = tweet.find_elements(By.XPATH, './/a[contains(@href,"status")]')[0].get_attribute('href')
+                    # Process visible tweets
+                    for tweet in tweet_elements:
+                        tweet_info = {}
+                        tweet_url = None
+                
+                        try:
+                            # Try to get tweet URL first to check if we've seen it
+                            tweet_url = tweet.find_elements(By.XPATH, './/a[contains(@href,"status")]')[0].get_attribute('href')
                     
-                    # Skip if we've already seen this tweet in this session or in previous runs
-                    if tweet_url in seen_tweet_urls or tweet_url in existing_urls:
-                        continue
+                            # Skip if we've already seen this tweet in this session or in previous runs
+                            if tweet_url in seen_tweet_urls or tweet_url in existing_urls:
+                                continue
                         
-                    seen_tweet_urls.add(tweet_url)
-                    tweet_info["DocURL"] = tweet_url
-                    new_tweets_found = True
+                            seen_tweet_urls.add(tweet_url)
+                            tweet_info["DocURL"] = tweet_url
+                            new_tweets_found = True
                     
-                    # Now extract other data
-                    profile = tweet.find_element(By.XPATH, './/div[@data-testid="User-Name"]')
-                    tweet_info["Profile Link"] = profile.find_elements(By.XPATH, './/a')[1].get_attribute('href')
-                    tweet_info["Profile Handle"] = profile.find_elements(By.XPATH, './/a')[1].text
+                            # Now extract other data
+                            profile = tweet.find_element(By.XPATH, './/div[@data-testid="User-Name"]')
+                            tweet_info["Profile Link"] = profile.find_elements(By.XPATH, './/a')[1].get_attribute('href')
+                            tweet_info["Profile Handle"] = profile.find_elements(By.XPATH, './/a')[1].text
                     
-                    tweet_info["Post"] = tweet.find_element(By.XPATH, ".//div[@data-testid='tweetText']").text
+                            tweet_info["Post"] = tweet.find_element(By.XPATH, ".//div[@data-testid='tweetText']").text
                     
-                    utc_datetime_str = tweet.find_element(By.XPATH, './/time').get_attribute('datetime')
-                    tweet_info["Date"], tweet_info["Time"] = convert_to_ist(utc_datetime_str)
+                            utc_datetime_str = tweet.find_element(By.XPATH, './/time').get_attribute('datetime')
+                            tweet_info["Date"], tweet_info["Time"] = convert_to_ist(utc_datetime_str)
                     
-                    tweets_data.append(tweet_info)
+                            collect(tweet_info)
                     
-                except Exception:
-                    # If we couldn't get the URL or other required data, just skip this tweet
-                    pass
+                        except Exception:
+                            # If we couldn't get the URL or other required data, just skip this tweet
+                            pass
             
-            # Scroll down to load more tweets
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for new content to load
+                # Scroll down and wait until new tweets have loaded (or scroll_timeout passes)
+                before_scroll = scroll_waiter.snapshot(driver)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                scroll_waiter.wait(driver, before_scroll)
             
-            # Check if we're getting new tweets
-            if not new_tweets_found:
-                consecutive_no_new_tweets += 1
-                if consecutive_no_new_tweets >= 5:  # If no new tweets after 5 consecutive scrolls
-                    print("No new tweets found after multiple scrolls. Probably reached the end or rate limited.")
-                    break
-            else:
-                consecutive_no_new_tweets = 0
+                # Check if we're getting new tweets
+                if not new_tweets_found:
+                    consecutive_no_new_tweets += 1
+                    if consecutive_no_new_tweets >= 5:  # If no new tweets after 5 consecutive scrolls
+                        print("No new tweets found after multiple scrolls. Probably reached the end or rate limited.")
+                        break
+                else:
+                    consecutive_no_new_tweets = 0
             
-            # Print progress update every 20 tweets or 10 scrolls
-            if len(tweets_data) % 20 == 0 or scroll_count % 10 == 0:
-                elapsed_time = time_module.time() - start_time
-                elapsed_formatted = str(timedelta(seconds=int(elapsed_time)))
-                print(f"Scroll #{scroll_count}: Scraped {len(tweets_data)} new tweets so far. Elapsed time: {elapsed_formatted}")
+                # Print progress update every 20 tweets or 10 scrolls
+                if len(tweets_data) % 20 == 0 or scroll_count % 10 == 0:
+                    elapsed_time = time_module.time() - start_time
+                    elapsed_formatted = str(timedelta(seconds=int(elapsed_time)))
+                    print(f"Scroll #{scroll_count}: Scraped {len(tweets_data)} new tweets so far. Elapsed time: {elapsed_formatted}")
                 
-                # Occasional longer pause to avoid rate limiting
-                if scroll_count % 30 == 0:
-                    print("Taking a short break to avoid rate limiting...")
-                    time.sleep(5)
+                    # Occasional longer pause to avoid rate limiting
+                    if scroll_count % 30 == 0:
+                        print("Taking a short break to avoid rate limiting...")
+                        time.sleep(5)
             
-        except Exception as e:
-            print(f"Error during scrolling: {str(e)}")
-            # Try to recover from errors by scrolling a bit and continuing
-            try:
-                driver.execute_script("window.scrollBy(0, 500);")
-                time.sleep(3)
-            except:
-                pass
+            except Exception as e:
+                print(f"Error during scrolling: {str(e)}")
+                # Try to recover from errors by scrolling a bit and continuing
+                try:
+                    driver.execute_script("window.scrollBy(0, 500);")
+                    time.sleep(3)
+                except:
+                    pass
     
-    # Calculate and print final stats
-    total_time = time_module.time() - start_time
-    print(f"Scraping complete! Collected {len(tweets_data)} new tweets in {str(timedelta(seconds=int(total_time)))}")
+        # Calculate and print final stats
+        total_time = time_module.time() - start_time
+        print(f"Scraping complete! Collected {len(tweets_data)} new tweets in {str(timedelta(seconds=int(total_time)))}")
+        print(scroll_waiter.summary())
     
-    driver.quit()
-    return tweets_data
+        return tweets_data
 
 def analyze_tweets(tweets_data):
     if not tweets_data:
@@ -465,27 +652,17 @@ def analyze_tweets(tweets_data):
         return pd.DataFrame()
         
     print(f"Analyzing {len(tweets_data)} tweets...")
-    results = []
     tweets_text = [tweet["Post"] for tweet in tweets_data]
-    similarity_scores = calculate_similarity_scores(tweets_text, intent_data)
-
-    for i, tweet in enumerate(tweets_data):
-        best_match_index = similarity_scores[i].argmax()
-        best_match_score = similarity_scores[i, best_match_index].item()
-        best_match_intent = intent_data[best_match_index]
+    best_match_indices, best_match_scores = match_intents(tweets_text, intent_data)
 
-        results.append({
-            "Profile Handle": tweet.get("Profile Handle", ""),
-            "Profile Link": tweet.get("Profile Link", ""),
-            "DocURL": tweet.get("DocURL", ""),
-            "Date": tweet.get("Date", ""),
-            "Time": tweet.get("Time", ""),
-            "Target Sentence": tweets_text[i],
-            "Best Matched Intent": best_match_intent,
-            "Similarity Score": round(best_match_score, 6)
-        })
-
-    df = pd.DataFrame(results)
+    df = build_intent_frame(tweets_data, [
+        ("Profile Handle", "Profile Handle", ""),
+        ("Profile Link", "Profile Link", ""),
+        ("DocURL", "DocURL", ""),
+        ("Date", "Date", ""),
+        ("Time", "Time", ""),
+        ("Target Sentence", "Post", ""),
+    ], intent_data, best_match_indices, best_match_scores)
     return df
 
 def analyze_replies(replies_data):
@@ -493,35 +670,23 @@ def analyze_replies(replies_data):
     if not replies_data:
         return pd.DataFrame()
         
-    results = []
-    replies_text = [reply["Reply Text"] for reply in replies_data if "Reply Text" in reply]
+    replies_data = [reply for reply in replies_data if "Reply Text" in reply]
     
-    if not replies_text:
+    if not replies_data:
         return pd.DataFrame()
         
-    similarity_scores = calculate_similarity_scores(replies_text, intent_data)
-
-    for i, reply in enumerate(replies_data):
-        if "Reply Text" not in reply:
-            continue
-            
-        best_match_index = similarity_scores[i].argmax()
-        best_match_score = similarity_scores[i, best_match_index].item()
-        best_match_intent = intent_data[best_match_index]
+    replies_text = [reply["Reply Text"] for reply in replies_data]
+    best_match_indices, best_match_scores = match_intents(replies_text, intent_data)
 
-        results.append({
-            "Profile Handle": reply.get("Profile Handle", ""),
-            "Profile Link": reply.get("Profile Link", ""),
-            "ReplyURL": reply.get("ReplyURL", ""),
-            "Original Tweet URL": reply.get("Original Tweet URL", ""),
-            "Date": reply.get("Date", ""),
-            "Time": reply.get("Time", ""),
-            "Reply Text": reply.get("Reply Text", ""),
-            "Best Matched Intent": best_match_intent,
-            "Similarity Score": round(best_match_score, 6)
-        })
-
-    df = pd.DataFrame(results)
+    df = build_intent_frame(replies_data, [
+        ("Profile Handle", "Profile Handle", ""),
+        ("Profile Link", "Profile Link", ""),
+        ("ReplyURL", "ReplyURL", ""),
+        ("Original Tweet URL", "Original Tweet URL", ""),
+        ("Date", "Date", ""),
+        ("Time", "Time", ""),
+        ("Reply Text", "Reply Text", ""),
+    ], intent_data, best_match_indices, best_match_scores)
     return df
 
 if __name__ == "__main__":
@@ -532,14 +697,32 @@ if __name__ == "__main__":
     max_replies_per_tweet = 50  # Increased max replies to collect per tweet
     spreadsheet_name = "Twitter_AI_Analysis"
     
+    reply_workers = 1  # Browsers scraping replies in parallel (extra workers need their own logged-in profile)
+    
+    # One warm browser shared by the tweet and reply scrapers, relaunched every 25 pages
+    driver_pool = DriverPool(setup_driver, size=1, max_uses=25)
+    reply_driver_pools = worker_driver_pools(driver_pool, setup_driver, reply_workers)
+    for pool in reply_driver_pools:
+        atexit.register(pool.close)
+    # Keep at least 5 seconds between page loads on x.com across all workers
+    x_rate_limiter = DomainRateLimiter(default_interval=5)
+    
     # Define filenames for local storage
     tweets_csv_filename = f"Twitter_{keyword.replace(' ', '_')}_tweets.csv"
     replies_csv_filename = f"Twitter_{keyword.replace(' ', '_')}_replies.csv"
+    # CSV files above, or Parquet under results/ with RESULT_STORE_BACKEND=parquet
+    tweets_store = open_result_store("tweets", "DocURL", keyword, csv_path=tweets_csv_filename, date_column="Date")
+    replies_store = open_result_store("replies", "ReplyURL", keyword, csv_path=replies_csv_filename,
+                                      date_column="Date")
+    # Each dataset is read at most once per run; counts and loaded rows follow the appends
+    catalog = DataCatalog()
+    tweets = catalog.register("tweets", tweets_store, columns=["DocURL", "Date", "Time"])
+    replies = catalog.register("replies", replies_store)
     
     start_time = time_module.time()
     
     # Get existing URLs to avoid re-scraping
-    existing_tweet_urls, existing_reply_urls = get_existing_urls(tweets_csv_filename, replies_csv_filename)
+    existing_tweet_urls, existing_reply_urls = get_existing_urls(tweets_store, replies_store)
     
     # Option to skip tweet scraping and use existing tweets for reply scraping
     skip_tweet_scraping = False  # Set to True if you want to skip tweet scraping
@@ -547,15 +730,16 @@ if __name__ == "__main__":
     if not skip_tweet_scraping:
         # Scrape new tweets with infinite scrolling
         print(f"Starting Twitter scraper for keyword '{keyword}'")
-        new_tweets_data = scrape_tweets_with_metadata(keyword, existing_urls=existing_tweet_urls, 
-                                                   max_tweets=max_tweets, max_time_minutes=max_runtime_minutes)
+        # Tweets are scored and appended to the result store in micro-batches while the browser keeps scrolling
+        tweets_pipeline = ScoringPipeline(analyze_tweets, tweets.append,
+                                          name="tweets", dedupe_key="DocURL")
+        with tweets_pipeline:
+            new_tweets_data = scrape_tweets_with_metadata(keyword, existing_urls=existing_tweet_urls, 
+                                                       max_tweets=max_tweets, max_time_minutes=max_runtime_minutes,
+                                                       driver_pool=driver_pool, on_record=tweets_pipeline.submit)
         
         if new_tweets_data:
-            # Analyze new tweets
-            new_tweets_df = analyze_tweets(new_tweets_data)
-            
-            # Append to local CSV
-            updated_tweets_df = append_to_csv(new_tweets_df, tweets_csv_filename)
+            new_tweets_df = tweets_pipeline.scored_frame()
             
             # Append to Google Sheets
             tweets_sheet_url, _ = append_to_sheets(new_tweets_df, spreadsheet_name, "Tweets")
@@ -564,19 +748,17 @@ if __name__ == "__main__":
         else:
             print("No new tweets were collected.")
             # If no new tweets, use existing ones for reply scraping
-            try:
-                updated_tweets_df = pd.read_csv(tweets_csv_filename)
-            except:
+            updated_tweets_df = tweets.frame()
+            if updated_tweets_df.empty:
                 print("No existing tweets found either. Exiting.")
                 exit()
     else:
         # Use existing tweets for reply scraping
-        try:
-            updated_tweets_df = pd.read_csv(tweets_csv_filename)
-            print(f"Using {len(updated_tweets_df)} existing tweets for reply scraping.")
-        except:
+        updated_tweets_df = tweets.frame()
+        if updated_tweets_df.empty:
             print("No existing tweets found. Please run without skip_tweet_scraping=True first.")
             exit()
+        print(f"Using {len(updated_tweets_df)} existing tweets for reply scraping.")
     
     # Get tweet URLs to scrape replies from
     tweet_urls_for_replies = []
@@ -589,13 +771,9 @@ if __name__ == "__main__":
     
     # If we don't have enough from new tweets, supplement with existing tweets
     if len(tweet_urls_for_replies) < 20:
+        # Most recent stored tweets first (read once, sorted once)
+        updated_tweets_df = tweets.recent()
         if 'DocURL' in updated_tweets_df.columns:
-            # Sort by recency (if Date and Time columns exist)
-            if 'Date' in updated_tweets_df.columns and 'Time' in updated_tweets_df.columns:
-                updated_tweets_df['DateTime'] = pd.to_datetime(updated_tweets_df['Date'] + ' ' + updated_tweets_df['Time'], 
-                                                            errors='coerce')
-                updated_tweets_df = updated_tweets_df.sort_values('DateTime', ascending=False)
-            
             # Get more URLs from existing tweets
             more_urls = updated_tweets_df['DocURL'].tolist()
             for url in more_urls:
@@ -607,30 +785,23 @@ if __name__ == "__main__":
     # Now scrape replies for our collected tweet URLs
     print(f"Starting to scrape replies for {len(tweet_urls_for_replies)} tweets...")
     
-    all_new_replies = []
-    for i, tweet_url in enumerate(tweet_urls_for_replies):
-        print(f"\nScraping replies for tweet {i+1}/{len(tweet_urls_for_replies)}")
-        print(f"Tweet URL: {tweet_url}")
-        
-        tweet_replies = scrape_tweet_replies(tweet_url, 
-                                          existing_reply_urls=existing_reply_urls,
-                                          max_replies=max_replies_per_tweet)
-        
-        if tweet_replies:
-            print(f"Successfully scraped {len(tweet_replies)} replies for this tweet")
-            all_new_replies.extend(tweet_replies)
-        else:
-            print("No replies found or scraped for this tweet")
-        
-        # Add a delay between tweets to avoid rate limiting
-        time.sleep(5)
+    # Replies from every worker stream into one scoring pipeline
+    replies_pipeline = ScoringPipeline(analyze_replies, replies.append,
+                                       name="replies", dedupe_key="ReplyURL")
+    with replies_pipeline:
+        all_new_replies = scrape_concurrently(
+            tweet_urls_for_replies,
+            lambda tweet_url, pool: scrape_tweet_replies(tweet_url,
+                                                         existing_reply_urls=existing_reply_urls,
+                                                         max_replies=max_replies_per_tweet,
+                                                         driver_pool=pool,
+                                                         on_record=replies_pipeline.submit),
+            reply_driver_pools,
+            rate_limiter=x_rate_limiter,
+            dedupe_key="ReplyURL")
     
     if all_new_replies:
-        # Analyze new replies
-        new_replies_df = analyze_replies(all_new_replies)
-        
-        # Append to local CSV
-        updated_replies_df = append_to_csv(new_replies_df, replies_csv_filename)
+        new_replies_df = replies_pipeline.scored_frame()
         
         # Append to Google Sheets
         replies_sheet_url, _ = append_to_sheets(new_replies_df, spreadsheet_name, "Replies")
@@ -645,14 +816,9 @@ if __name__ == "__main__":
     total_time = time_module.time() - start_time
     print(f"Total execution time: {str(timedelta(seconds=int(total_time)))}")
     
-    # Print summary
+    # Print summary (from the catalog's running counts, no file is read)
     try:
-        total_tweets = pd.read_csv(tweets_csv_filename).shape[0]
-        print(f"Total tweets in database: {total_tweets}")
-        
-        if os.path.exists(replies_csv_filename):
-            total_replies = pd.read_csv(replies_csv_filename).shape[0]
-            print(f"Total replies in database: {total_replies}")
+        print(catalog.summary())
     except Exception as e:
         print(f"Error getting final stats: {str(e)}")
     # Configuration
@@ -665,23 +831,31 @@ if __name__ == "__main__":
     # Define filenames for local storage
     tweets_csv_filename = f"Twitter_{keyword.replace(' ', '_')}_tweets.csv"
     replies_csv_filename = f"Twitter_{keyword.replace(' ', '_')}_replies.csv"
+    # CSV files above, or Parquet under results/ with RESULT_STORE_BACKEND=parquet
+    tweets_store = open_result_store("tweets", "DocURL", keyword, csv_path=tweets_csv_filename, date_column="Date")
+    replies_store = open_result_store("replies", "ReplyURL", keyword, csv_path=replies_csv_filename,
+                                      date_column="Date")
+    # Each dataset is read at most once per run; counts and loaded rows follow the appends
+    catalog = DataCatalog()
+    tweets = catalog.register("tweets", tweets_store, columns=["DocURL", "Date", "Time"])
+    replies = catalog.register("replies", replies_store)
     
     start_time = time_module.time()
     
     # Get existing URLs to avoid re-scraping
-    existing_tweet_urls, existing_reply_urls = get_existing_urls(tweets_csv_filename, replies_csv_filename)
+    existing_tweet_urls, existing_reply_urls = get_existing_urls(tweets_store, replies_store)
     
     # Scrape new tweets with infinite scrolling
     print(f"Starting Twitter scraper for keyword '{keyword}'")
-    new_tweets_data = scrape_tweets_with_metadata(keyword, existing_urls=existing_tweet_urls, 
-                                               max_tweets=max_tweets, max_time_minutes=max_runtime_minutes)
+    tweets_pipeline = ScoringPipeline(analyze_tweets, tweets.append,
+                                      name="tweets", dedupe_key="DocURL")
+    with tweets_pipeline:
+        new_tweets_data = scrape_tweets_with_metadata(keyword, existing_urls=existing_tweet_urls, 
+                                                   max_tweets=max_tweets, max_time_minutes=max_runtime_minutes,
+                                                   driver_pool=driver_pool, on_record=tweets_pipeline.submit)
     
     if new_tweets_data:
-        # Analyze new tweets
-        new_tweets_df = analyze_tweets(new_tweets_data)
-        
-        # Append to local CSV
-        updated_tweets_df = append_to_csv(new_tweets_df, tweets_csv_filename)
+        new_tweets_df = tweets_pipeline.scored_frame()
         
         # Append to Google Sheets
         tweets_sheet_url, _ = append_to_sheets(new_tweets_df, spreadsheet_name, "Tweets")
@@ -698,23 +872,22 @@ if __name__ == "__main__":
         # Limit to first 10 tweets to avoid excessive runtime
         tweets_for_replies = new_tweets_data[:10]
         
-        all_new_replies = []
-        for i, tweet in enumerate(tweets_for_replies):
-            if "DocURL" in tweet:
-                print(f"Scraping replies for tweet {i+1}/{len(tweets_for_replies)}")
-                tweet_replies = scrape_tweet_replies(tweet["DocURL"], 
-                                                    existing_reply_urls=existing_reply_urls,
-                                                    max_replies=max_replies_per_tweet)
-                all_new_replies.extend(tweet_replies)
-                # Add a small delay to avoid rate limiting
-                time.sleep(3)
+        replies_pipeline = ScoringPipeline(analyze_replies, replies.append,
+                                           name="replies", dedupe_key="ReplyURL")
+        with replies_pipeline:
+            all_new_replies = scrape_concurrently(
+                [tweet["DocURL"] for tweet in tweets_for_replies if "DocURL" in tweet],
+                lambda tweet_url, pool: scrape_tweet_replies(tweet_url,
+                                                             existing_reply_urls=existing_reply_urls,
+                                                             max_replies=max_replies_per_tweet,
+                                                             driver_pool=pool,
+                                                             on_record=replies_pipeline.submit),
+                reply_driver_pools,
+                rate_limiter=x_rate_limiter,
+                dedupe_key="ReplyURL")
         
         if all_new_replies:
-            # Analyze new replies
-            new_replies_df = analyze_replies(all_new_replies)
-            
-            # Append to local CSV
-            updated_replies_df = append_to_csv(new_replies_df, replies_csv_filename)
+            new_replies_df = replies_pipeline.scored_frame()
             
             # Append to Google Sheets
             replies_sheet_url, _ = append_to_sheets(new_replies_df, spreadsheet_name, "Replies")
@@ -729,13 +902,8 @@ if __name__ == "__main__":
     total_time = time_module.time() - start_time
     print(f"Total execution time: {str(timedelta(seconds=int(total_time)))}")
     
-    # Print summary
+    # Print summary (from the catalog's running counts, no file is read)
     try:
-        total_tweets = pd.read_csv(tweets_csv_filename).shape[0]
-        print(f"Total tweets in database: {total_tweets}")
-        
-        if os.path.exists(replies_csv_filename):
-            total_replies = pd.read_csv(replies_csv_filename).shape[0]
-            print(f"Total replies in database: {total_replies}")
+        print(catalog.summary())
     except Exception as e:
         print(f"Error getting final stats: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+
+# Lean browsing mode for the scrapers. We only read text, links and timestamps,
+# so images, video, fonts and ad/analytics trackers are wasted bandwidth, CPU
+# and memory per browser. Lean mode switches image loading off at launch and
+# blocks the rest through the DevTools protocol once the driver is up.
+#
+# Enable with LEAN_BROWSING=1; HEADLESS=1 additionally runs Chrome headless.
+# Headless is off by default because X and LinkedIn sometimes refuse to serve
+# logged-in feeds to headless browsers.
+
+LEAN_BROWSING = os.environ.get("LEAN_BROWSING", "0") == "1"
+HEADLESS = os.environ.get("HEADLESS", "0") == "1"
+
+# Chrome switches only, no prefs: undetected_chromedriver writes prefs into the
+# profile, which would leave the user's real Chrome profile without images.
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--autoplay-policy=user-gesture-required",
+    "--mute-audio",
+    "--disable-background-networking",
+    "--disable-features=MediaRouter,OptimizationHints",
+]
+
+# URL patterns for Network.setBlockedURLs (* matches any characters)
+BLOCKED_URL_PATTERNS = [
+    # Images and video
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*",
+    "*video.twimg.com*", "*pbs.twimg.com/media*", "*media.licdn.com/dms/image*", "*dms.licdn.com*",
+    # Fonts
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    # Ads and analytics
+    "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*ads-twitter.com*", "*ads-api.twitter.com*", "*analytics.twitter.com*", "*static.ads-twitter.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*ads.linkedin.com*",
+    "*connect.facebook.net*", "*scorecardresearch.com*", "*bat.bing.com*", "*hotjar.com*",
+]
+
+
+def lean_chrome_options(chrome_options, headless=False):
+    """Add the lean-mode switches (and optionally headless) to ChromeOptions before launch."""
+    for argument in LEAN_CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    return chrome_options
+
+
+def block_heavy_requests(driver, patterns=None):
+    """Block media, fonts and trackers for this browser through CDP; returns False if CDP isn't available."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        print(f"Could not enable request blocking: {str(e)}")
+        return False
@@ -0,0 +1,182 @@
+import time
+import queue
+import threading
+import pandas as pd
+
+# Streaming scrape -> score -> sink pipeline. The scrapers hand each record to
+# submit() as soon as they have it; a scoring thread embeds records in
+# micro-batches while the browser keeps scrolling, and a sink thread persists
+# every scored batch. Both queues are bounded, so a slow stage makes the one
+# before it wait instead of buffering without limit.
+
+_DONE = object()
+
+
+class StageStats:
+    """Items, batches, busy time and time spent blocked on a full queue for one stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def as_dict(self, elapsed):
+        return {
+            "stage": self.name,
+            "items": self.items,
+            "batches": self.batches,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "items_per_sec": round(self.items / elapsed, 2) if elapsed else None,
+        }
+
+
+class ScoringPipeline:
+    """
+    Runs scoring and persistence concurrently with a scraper.
+
+    Args:
+        score: Called with a list of records, returns a scored DataFrame (e.g. analyze_tweets)
+        sink: Called with each scored DataFrame (e.g. appends it to a CSV); its last return
+            value is kept in sink_result
+        name: Label for progress and throughput messages
+        batch_size: Records scored together
+        max_batch_wait: Seconds to wait for a batch to fill before scoring a partial one
+        queue_size: Capacity of each queue; submit() blocks when the scoring queue is full
+        dedupe_key: If set, records whose value for this key was already submitted are dropped
+    """
+
+    def __init__(self, score, sink, name="records", batch_size=32, max_batch_wait=2.0, queue_size=256,
+                 dedupe_key=None):
+        self.score = score
+        self.sink = sink
+        self.name = name
+        self.batch_size = batch_size
+        self.max_batch_wait = max_batch_wait
+        self.dedupe_key = dedupe_key
+        self.sink_result = None
+        self.scored = []  # every scored DataFrame, in order
+        self.stats = {stage: StageStats(stage) for stage in ("scrape", "score", "sink")}
+        self._records = queue.Queue(maxsize=queue_size)
+        self._frames = queue.Queue(maxsize=max(1, queue_size // batch_size))
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._started = None
+        self._elapsed = None
+        self._threads = []
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._threads = [threading.Thread(target=self._score_loop, daemon=True),
+                         threading.Thread(target=self._sink_loop, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def submit(self, record):
+        """Queue one scraped record for scoring; blocks while the scoring stage is behind. Thread-safe."""
+        if self.dedupe_key is not None:
+            key = record.get(self.dedupe_key)
+            with self._lock:
+                if key in self._seen:
+                    return
+                self._seen.add(key)
+        start = time.perf_counter()
+        self._records.put(record)
+        with self._lock:
+            self.stats["scrape"].items += 1
+            self.stats["scrape"].blocked_seconds += time.perf_counter() - start
+
+    def _next_batch(self):
+        """Up to batch_size records, waiting at most max_batch_wait once the first has arrived."""
+        first = self._records.get()
+        if first is _DONE:
+            return None, True
+        batch = [first]
+        deadline = time.perf_counter() + self.max_batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                record = self._records.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if record is _DONE:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def _score_loop(self):
+        stats = self.stats["score"]
+        done = False
+        while not done:
+            batch, done = self._next_batch()
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                frame = self.score(batch)
+            except Exception as e:
+                print(f"[{self.name}] Error scoring a batch of {len(batch)}: {str(e)}")
+                stats.errors += 1
+                frame = None
+            stats.busy_seconds += time.perf_counter() - start
+            stats.batches += 1
+            stats.items += len(batch)
+            if frame is not None and not frame.empty:
+                start = time.perf_counter()
+                self._frames.put(frame)
+                stats.blocked_seconds += time.perf_counter() - start
+        self._frames.put(_DONE)
+
+    def _sink_loop(self):
+        stats = self.stats["sink"]
+        while True:
+            frame = self._frames.get()
+            if frame is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                self.sink_result = self.sink(frame)
+                self.scored.append(frame)
+            except Exception as e:
+                print(f"[{self.name}] Error writing {len(frame)} scored rows: {str(e)}")
+                stats.errors += 1
+            stats.busy_seconds += time.perf_counter() - start
+            stats.batches += 1
+            stats.items += len(frame)
+
+    def close(self):
+        """Flush the remaining records through both stages and wait for them to finish."""
+        if not self._threads:
+            return
+        self._records.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._elapsed = time.perf_counter() - self._started
+        print(self.report())
+
+    def scored_frame(self):
+        """All scored rows as one DataFrame."""
+        return pd.concat(self.scored, ignore_index=True) if self.scored else pd.DataFrame()
+
+    def throughput(self):
+        elapsed = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        return [stats.as_dict(elapsed) for stats in self.stats.values()]
+
+    def report(self):
+        lines = [f"[{self.name}] pipeline throughput:"]
+        for row in self.throughput():
+            lines.append(f"  {row['stage']:<6} {row['items']:>6} items in {row['batches'] or '-':>4} batches  "
+                         f"{row['items_per_sec']} items/s  busy {row['busy_seconds']}s  "
+                         f"blocked {row['blocked_seconds']}s  errors {row['errors']}")
+        return "\n".join(lines)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,856 @@
+import os
+import csv
+import sys
+import glob
+import uuid
+import sqlite3
+import json
+import hashlib
+import threading
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from seen_filter import update_seen_filter
+
+# Append-only storage for scored results. append_to_csv used to read the whole
+# CSV, concatenate, de-duplicate and rewrite it on every call, so each run paid
+# for the entire history. A CsvResultStore only ever appends: new rows go to
+# the end of the CSV, a key index next to it (a small SQLite file, see
+# KeyIndex) answers "have we stored this already?" without loading every key
+# into memory, and rows whose columns don't match the CSV header go
+# to a new partition file next to it. Rewriting everything into one file
+# happens only in compact():
+#
+#     python result_store.py compact Twitter_Artificial_Intelligence_tweets.csv DocURL
+#
+# ParquetResultStore keeps the same tables as typed, columnar files partitioned
+# by keyword and day, so reading the history or filtering by intent or score
+# only touches the columns and partitions involved. Pick the backend with
+# RESULT_STORE_BACKEND=csv|parquet|sqlite (see open_result_store); existing CSV
+# history can be copied over once:
+#
+#     python result_store.py import Twitter_Artificial_Intelligence_tweets.csv results/tweets DocURL "Artificial Intelligence"
+#
+# SqliteResultStore keeps every table in one WAL-mode database with a unique
+# index on the key, so "have we stored this URL?" is an index lookup instead of
+# a set built at startup, and several scraper processes can write at once.
+
+RESULT_STORE_BACKEND = os.environ.get("RESULT_STORE_BACKEND", "csv")
+RESULT_STORE_DIR = os.environ.get("RESULT_STORE_DIR", "results")
+SQLITE_DATABASE = "results.db"  # every table of the sqlite backend, under RESULT_STORE_DIR
+
+# Hive-style partition columns of a ParquetResultStore: <path>/keyword=<slug>/day=<YYYY-MM-DD>/
+PARTITION_COLUMNS = ["keyword", "day"]
+
+
+def row_keys(df, key_column):
+    """
+    Key of every row as a string Series (NaN where the key is missing), or None if
+    df lacks the key column(s). A tuple of columns is hashed into one key.
+    """
+    if key_column is None:
+        return None
+    if isinstance(key_column, str):
+        if key_column not in df.columns:
+            return None
+        return df[key_column].astype(str).where(df[key_column].notna())
+    columns = list(key_column)
+    if not all(column in df.columns for column in columns):
+        return None
+    joined = df[columns].fillna("").astype(str).agg("\x1f".join, axis=1)
+    return joined.map(lambda value: hashlib.sha1(value.encode("utf-8")).hexdigest())
+
+
+def new_rows(df, key_values, keys):
+    """Rows of df whose key is neither in keys nor repeated earlier in df; rows without a key are kept."""
+    if key_values is None:
+        return df, pd.Series(dtype=str)
+    mask = ~key_values.isin(keys) & ~(key_values.duplicated() & key_values.notna())
+    return df[mask], key_values[mask]
+
+
+def filter_results(df, intent=None, min_score=None):
+    """Rows of a result frame matching the best intent and/or reaching a similarity score."""
+    if intent is not None:
+        df = df[df["Best Matched Intent"] == intent] if "Best Matched Intent" in df.columns else df.iloc[0:0]
+    if min_score is not None:
+        df = df[df["Similarity Score"] >= min_score] if "Similarity Score" in df.columns else df.iloc[0:0]
+    return df
+
+
+def files_signature(paths):
+    """Name, size and modification time of each file, as one string; any write, removal or replacement changes it."""
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return json.dumps(signature)
+
+
+class KeyIndex:
+    """
+    Persistent set of row keys in a small SQLite file next to a CSV or Parquet store.
+    Membership tests and counts go through the primary key, so nothing is loaded
+    into memory and a lookup costs the same with ten rows stored or ten million.
+
+    The index also records the signature of the data files it describes (see
+    files_signature); a store rebuilds it when the files no longer match, e.g.
+    after the CSV was deleted or replaced.
+
+    Args:
+        path: Index file (created if missing)
+    """
+
+    BATCH = 500  # keys per IN (...) query, below SQLite's bound-parameter limit
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # sqlite3 connections can't be shared between threads
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._local.connection = connection
+        return connection
+
+    def __contains__(self, key):
+        row = self._connection().execute("SELECT 1 FROM keys WHERE key = ?", (str(key),)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def __iter__(self):
+        for (key,) in self._connection().execute("SELECT key FROM keys"):
+            yield key
+
+    def _meta(self, name):
+        row = self._connection().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def source(self):
+        """Signature of the data files as of the last write, or None for a new index."""
+        return self._meta("source")
+
+    def rows(self):
+        """Rows in the data files, keyed or not, as counted by add and replace."""
+        return int(self._meta("rows") or 0)
+
+    def stored(self, keys):
+        """The subset of keys already in the index."""
+        keys = list(dict.fromkeys(str(key) for key in keys))
+        connection = self._connection()
+        found = set()
+        for start in range(0, len(keys), self.BATCH):
+            batch = keys[start:start + self.BATCH]
+            rows = connection.execute(f"SELECT key FROM keys WHERE key IN ({', '.join('?' * len(batch))})", batch)
+            found.update(key for (key,) in rows)
+        return found
+
+    def add(self, keys, source, rows=0):
+        """Add keys of rows just written to the data files, whose signature is now source."""
+        connection = self._connection()
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((str(key),) for key in keys))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (source,))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (str(self.rows() + rows),))
+
+    def replace(self, keys, source, rows=0):
+        """
+        Make keys the whole content of the index for files with this signature.
+
+        Args:
+            keys: Iterable of keys, consumed once
+            source: files_signature of the data files
+            rows: Rows in those files, or a function returning it once keys are consumed
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM keys")
+            connection.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((str(key),) for key in keys))
+            rows = rows() if callable(rows) else rows
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (source,))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('rows', ?)", (str(rows),))
+
+
+class CsvResultStore:
+    """
+    Append-only CSV table with a persistent index of its key column.
+
+    Args:
+        path: Main CSV file; partitions are written next to it as <name>.part-NNNN.csv
+        key_column: Column identifying a row (e.g. DocURL), or a tuple of columns; rows
+            whose key is already stored are not written again. None stores every row.
+    """
+
+    def __init__(self, path, key_column):
+        self.path = path
+        self.key_column = key_column
+        self.index_path = path + ".keys.db"
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _partition_pattern(self):
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}.part-*{ext}"
+
+    def files(self):
+        """The main CSV (if present) followed by its partitions, oldest first."""
+        files = [self.path] if os.path.exists(self.path) else []
+        return files + sorted(glob.glob(self._partition_pattern()))
+
+    def _scan_keys(self, counted):
+        """
+        Keys of every stored row, read from the key column a chunk at a time;
+        counted["rows"] counts every row read, with or without a key.
+        """
+        columns = []
+        if self.key_column is not None:
+            columns = [self.key_column] if isinstance(self.key_column, str) else list(self.key_column)
+        for path in self.files():
+            header = self._header(path)
+            if not header:
+                continue
+            keyed = bool(columns) and all(column in header for column in columns)
+            for chunk in pd.read_csv(path, usecols=columns if keyed else header[:1], chunksize=100_000):
+                counted["rows"] += len(chunk)
+                if keyed:
+                    yield from row_keys(chunk, self.key_column).dropna()
+
+    def _key_index(self):
+        if self._index is not None:
+            return self._index
+        index = KeyIndex(self.index_path)
+        source = files_signature(self.files())
+        if index.source() != source:
+            # New index, or the CSV files changed behind it (deleted, replaced, edited by hand)
+            if self.files():
+                print(f"Building key index for {self.path}...")
+            counted = {"rows": 0}
+            index.replace(self._scan_keys(counted), source, lambda: counted["rows"])
+        self._index = index
+        return index
+
+    def keys(self):
+        """Set of every key stored so far. Loads the whole key index."""
+        with self._lock:
+            return set(self._key_index())
+
+    def __contains__(self, key):
+        """Index lookup of one key; nothing else is loaded."""
+        with self._lock:
+            return key in self._key_index()
+
+    def count(self):
+        """Number of rows stored (with or without a key), kept in the key index; no CSV is read."""
+        with self._lock:
+            return self._key_index().rows()
+
+    def __len__(self):
+        return self.count()
+
+    @staticmethod
+    def _header(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return next(csv.reader(f), [])
+
+    def _target_file(self, columns):
+        """File whose header matches columns exactly, or a new partition path."""
+        for path in self.files():
+            if self._header(path) == columns:
+                return path
+        if not os.path.exists(self.path):
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}.part-{len(self.files()):04d}{ext}"
+
+    def append(self, df):
+        """
+        Append the rows of df whose key isn't stored yet. Cost is proportional to len(df).
+
+        Returns:
+            The rows actually written
+        """
+        if df is None or df.empty:
+            return df
+        with self._lock:
+            index = self._key_index()
+            key_values = row_keys(df, self.key_column)
+            stored = index.stored(key_values.dropna()) if key_values is not None else set()
+            df, key_values = new_rows(df, key_values, stored)
+            if df.empty:
+                print(f"No new rows for {self.path}")
+                return df
+
+            target = self._target_file(list(df.columns))
+            df.to_csv(target, mode="a", header=not os.path.exists(target), index=False)
+
+            # Keys go to the index after the rows are on disk, so a crash can't hide unwritten rows
+            new_keys = list(key_values.dropna())
+            index.add(new_keys, files_signature(self.files()), rows=len(df))
+            update_seen_filter(self, new_keys, len(df))
+
+        print(f"Appended {len(df)} rows to {target}")
+        return df
+
+    def read(self, columns=None, intent=None, min_score=None):
+        """
+        Stored rows as one DataFrame. CSV has no column or row skipping, so every
+        partition is parsed and the filters are applied afterwards.
+
+        Args:
+            columns: Columns to return (all if None)
+            intent: Keep only rows whose Best Matched Intent is this
+            min_score: Keep only rows whose Similarity Score is at least this
+        """
+        frames = [pd.read_csv(path) for path in self.files()]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        df = filter_results(df, intent, min_score)
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return df.reset_index(drop=True)
+
+    def compact(self):
+        """Merge all partitions into the main CSV, keeping the last row per key, and rebuild the index."""
+        with self._lock:
+            files = self.files()
+            if not files:
+                return pd.DataFrame()
+            index = self._key_index()
+            combined = pd.concat([pd.read_csv(path) for path in files], ignore_index=True)
+            key_values = row_keys(combined, self.key_column)
+            if key_values is not None:
+                combined = combined[~(key_values.duplicated(keep="last") & key_values.notna())]
+
+            temp_path = self.path + ".compacting"
+            combined.to_csv(temp_path, index=False)
+            os.replace(temp_path, self.path)
+            for path in files[1:] if files[0] == self.path else files:
+                os.remove(path)
+
+            key_values = row_keys(combined, self.key_column)
+            keys = key_values.dropna() if key_values is not None else []
+            index.replace(keys, files_signature(self.files()), len(combined))
+        print(f"Compacted {len(files)} files into {self.path}: {len(combined)} rows")
+        return combined
+
+
+
+def typed_result_frame(df):
+    """
+    Copy of a result frame with storage types: float32 similarity scores, categorical
+    intents and a "Posted At" timestamp built from the Date and Time columns.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if column.startswith("Similarity Score"):
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float32")
+        elif column == "Best Matched Intent" or column.startswith("Matched Intent"):
+            df[column] = df[column].astype("category")
+    if "Date" in df.columns and "Time" in df.columns:
+        posted_at = pd.to_datetime(df["Date"].astype(str) + " " + df["Time"].astype(str), errors="coerce")
+        df["Posted At"] = posted_at.astype("datetime64[ms]")
+    return df
+
+
+def partition_value(text):
+    """Directory-safe partition value (keywords are stored with underscores, as in the CSV names)."""
+    return str(text).strip().replace(" ", "_").replace("/", "_") or "unknown"
+
+
+class ParquetResultStore:
+    """
+    Append-only, typed Parquet table partitioned by keyword and day.
+
+    Every append writes new files under <path>/keyword=<keyword>/day=<YYYY-MM-DD>/, and
+    reads go through pyarrow.dataset, so only the requested columns are decoded and
+    partitions outside a keyword/day filter are never opened. Needs pyarrow.
+
+    Args:
+        path: Directory holding the dataset (shared by every keyword)
+        key_column: Column identifying a row (e.g. DocURL), or a tuple of columns;
+            rows whose key is already stored are not written again. None stores every row.
+        keyword: Search keyword written as the keyword partition of new rows
+        date_column: Column holding each row's YYYY-MM-DD date (e.g. Date for tweets);
+            rows without one are filed under the day they were stored
+    """
+
+    def __init__(self, path, key_column, keyword=None, date_column=None):
+        self.path = path
+        self.key_column = key_column
+        self.keyword = keyword
+        self.date_column = date_column
+        self.index_path = path.rstrip("/\\") + ".keys.db"  # next to the dataset, shared by every keyword
+        self._index = None
+        self._lock = threading.Lock()
+
+    def files(self):
+        """Every Parquet file of the dataset, in path order."""
+        return sorted(glob.glob(os.path.join(self.path, "**", "*.parquet"), recursive=True))
+
+    @staticmethod
+    def _partitioning():
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        return ds.partitioning(pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive")
+
+    def _dataset(self):
+        """The dataset with one schema unified across files written with different columns, or None."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        if not self.files():
+            return None
+        partitioning = self._partitioning()
+        dataset = ds.dataset(self.path, format="parquet", partitioning=partitioning)
+        schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+        schema = pa.unify_schemas(schemas + [partitioning.schema], promote_options="permissive")
+        return ds.dataset(self.path, format="parquet", partitioning=partitioning, schema=schema)
+
+    def _scan_keys(self):
+        """Keys of every stored row, decoding only the key column(s), a record batch at a time."""
+        dataset = self._dataset()
+        columns = [self.key_column] if isinstance(self.key_column, str) else list(self.key_column)
+        if dataset is None or not all(column in dataset.schema.names for column in columns):
+            return
+        for batch in dataset.to_batches(columns=columns):
+            yield from row_keys(batch.to_pandas(), self.key_column).dropna()
+
+    def _key_index(self):
+        if self._index is not None:
+            return self._index
+        index = KeyIndex(self.index_path)
+        source = files_signature(self.files())
+        if self.key_column is not None and index.source() != source:
+            # New index, or files were removed, replaced or added behind it
+            if self.files():
+                print(f"Building key index for {self.path}...")
+            index.replace(self._scan_keys(), source)
+        self._index = index
+        return index
+
+    def keys(self):
+        """Set of every key stored so far. Loads the whole key index."""
+        with self._lock:
+            return set(self._key_index())
+
+    def __contains__(self, key):
+        """Index lookup of one key; no Parquet file is opened."""
+        with self._lock:
+            return key in self._key_index()
+
+    def count(self):
+        """
+        Number of rows stored, from the row counts in the file footers; no column is decoded.
+        append() never writes a stored key again, so this is also the number of distinct keys.
+        """
+        import pyarrow.parquet as pq
+        with self._lock:
+            return sum(pq.ParquetFile(path).metadata.num_rows for path in self.files())
+
+    def __len__(self):
+        return self.count()
+
+    def _arrow_table(self, df):
+        """df as an Arrow table with fixed dictionary index types, so files written by different runs agree."""
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        fields = [pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+                  if pa.types.is_dictionary(field.type) else field for field in table.schema]
+        return table.cast(pa.schema(fields))
+
+    def append(self, df):
+        """
+        Append the rows of df whose key isn't stored yet as new files in their partitions.
+
+        Returns:
+            The rows actually written (as given, without the storage types)
+        """
+        import pyarrow.parquet as pq
+        if df is None or df.empty:
+            return df
+        with self._lock:
+            index = self._key_index()
+            key_values = row_keys(df, self.key_column)
+            stored = index.stored(key_values.dropna()) if key_values is not None else set()
+            df, key_values = new_rows(df, key_values, stored)
+            if df.empty:
+                print(f"No new rows for {self.path}")
+                return df
+
+            typed = typed_result_frame(df)
+            typed["keyword"] = partition_value(self.keyword or "unknown")
+            today = date.today().isoformat()
+            if self.date_column in typed.columns:
+                days = pd.to_datetime(typed[self.date_column], errors="coerce").dt.strftime("%Y-%m-%d")
+                typed["day"] = days.fillna(today)
+            else:
+                typed["day"] = today
+            pq.write_to_dataset(self._arrow_table(typed), self.path, partition_cols=PARTITION_COLUMNS,
+                                basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet")
+
+            new_keys = list(key_values.dropna())
+            index.add(new_keys, files_signature(self.files()))
+            update_seen_filter(self, new_keys, len(df))
+
+        print(f"Appended {len(df)} rows to {self.path}")
+        return df
+
+    def read(self, columns=None, intent=None, min_score=None, keyword=None, since=None, until=None):
+        """
+        Stored rows as one typed DataFrame. Filters are pushed down to the scan: keyword
+        and day skip whole partitions, intent and score use the files' row-group statistics.
+
+        Args:
+            columns: Columns to return (all, including keyword and day, if None)
+            intent: Keep only rows whose Best Matched Intent is this
+            min_score: Keep only rows whose Similarity Score is at least this
+            keyword: Keep only rows scraped for this keyword
+            since, until: Keep only days in this inclusive YYYY-MM-DD range
+        """
+        import pyarrow.dataset as ds
+        dataset = self._dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+
+        names = dataset.schema.names
+        conditions = []
+        if intent is not None:
+            conditions.append(ds.field("Best Matched Intent") == intent if "Best Matched Intent" in names else None)
+        if min_score is not None:
+            conditions.append(ds.field("Similarity Score") >= min_score if "Similarity Score" in names else None)
+        if keyword is not None:
+            conditions.append(ds.field("keyword") == partition_value(keyword))
+        if since is not None:
+            conditions.append(ds.field("day") >= str(since))
+        if until is not None:
+            conditions.append(ds.field("day") <= str(until))
+        if any(condition is None for condition in conditions):
+            return pd.DataFrame(columns=columns)  # filtering on a column this dataset doesn't have
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        if columns is not None:
+            columns = [column for column in columns if column in names]
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def compact(self):
+        """Merge the files of each partition into one, keeping the last row per key."""
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        with self._lock:
+            dataset = self._dataset()
+            if dataset is None:
+                return 0
+            index = self._key_index()
+            by_partition = {}
+            for path in self.files():
+                by_partition.setdefault(os.path.dirname(path), []).append(path)
+
+            merged = 0
+            for directory, files in by_partition.items():
+                if len(files) < 2:
+                    continue
+                # Partition columns live in the directory names, not in the files
+                schema = dataset.schema
+                for column in PARTITION_COLUMNS:
+                    schema = schema.remove(schema.get_field_index(column))
+                table = ds.dataset(files, format="parquet", schema=schema).to_table()
+                frame = table.to_pandas()
+                key_values = row_keys(frame, self.key_column)
+                if key_values is not None:
+                    frame = frame[~(key_values.duplicated(keep="last") & key_values.notna())]
+                # Drop columns that are empty in every merged file
+                frame = frame.dropna(axis=1, how="all")
+                temp_path = os.path.join(directory, f"compacted-{uuid.uuid4().hex}.parquet.tmp")
+                pq.write_table(self._arrow_table(frame), temp_path)
+                os.replace(temp_path, temp_path[:-len(".tmp")])
+                for path in files:
+                    os.remove(path)
+                merged += len(files)
+            index.add([], files_signature(self.files()))  # same keys, new files
+        print(f"Compacted {merged} files in {self.path}")
+        return merged
+
+
+def sql_type(column, series):
+    """SQLite column type for a DataFrame column: REAL for scores and floats, INTEGER for ints and bools."""
+    if score_column(column) or pd.api.types.is_float_dtype(series):
+        return "REAL"
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    return "TEXT"
+
+
+def score_column(column):
+    return column.startswith("Similarity Score")
+
+
+def sql_value(value):
+    """A DataFrame cell as a type sqlite3 can bind: None for missing values, ISO text for dates and times."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, (str, int, float, bytes)):
+        return value
+    return str(value)
+
+
+class SqliteResultStore:
+    """
+    One table of a shared SQLite database, with a unique index on its key.
+
+    Rows are written with INSERT OR IGNORE, so a key stored by this or any other
+    process is skipped by the index itself. Membership tests and counts are SQL
+    queries; nothing is loaded at startup. Columns missing from the table are
+    added as they first appear, typed from the DataFrame (see sql_type).
+
+    Args:
+        path: Database file (created if missing)
+        table: Table name (e.g. "tweets")
+        key_column: Column identifying a row (e.g. DocURL), or a tuple of columns
+            indexed together. None stores every row.
+        keyword: Search keyword stored in the keyword column of new rows
+    """
+
+    def __init__(self, path, table, key_column, keyword=None):
+        self.path = path
+        self.table = table
+        self.key_column = key_column
+        self.keyword = keyword
+        if key_column is None:
+            self.key_columns = []
+        else:
+            self.key_columns = [key_column] if isinstance(key_column, str) else list(key_column)
+        self._local = threading.local()  # sqlite3 connections can't be shared between threads
+        self._columns = None
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            self._create_table(connection)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _quote(name):
+        return '"' + str(name).replace('"', '""') + '"'
+
+    def _create_table(self, connection):
+        columns = ["keyword TEXT", "stored_at TEXT"] + [f"{self._quote(column)} TEXT" for column in self.key_columns]
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {self._quote(self.table)} ({', '.join(columns)})")
+        if self.key_columns:
+            connection.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {self._quote(self.table + '_key')} "
+                               f"ON {self._quote(self.table)} ({', '.join(map(self._quote, self.key_columns))})")
+
+    def _table_columns(self, connection):
+        rows = connection.execute(f"PRAGMA table_info({self._quote(self.table)})").fetchall()
+        return [row[1] for row in rows]
+
+    def _add_columns(self, connection, df):
+        """Add the columns the table doesn't have yet; another process may be adding them too."""
+        columns = [str(column) for column in df.columns]
+        if self._columns is None or not set(columns) <= set(self._columns):
+            self._columns = self._table_columns(connection)
+        for column, name in zip(df.columns, columns):
+            if name in self._columns:
+                continue
+            column_type = sql_type(name, df[column])
+            try:
+                connection.execute(f"ALTER TABLE {self._quote(self.table)} ADD COLUMN {self._quote(name)} {column_type}")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e):
+                    raise
+            self._columns.append(name)
+
+    def files(self):
+        """The database file, if this table has any rows."""
+        return [self.path] if self.count() else []
+
+    def __contains__(self, key):
+        """Index lookup of one key (a tuple of values for a composite key)."""
+        if not self.key_columns:
+            return False
+        values = list(key) if isinstance(key, tuple) else [key]
+        where = " AND ".join(f"{self._quote(column)} = ?" for column in self.key_columns)
+        row = self._connection().execute(
+            f"SELECT 1 FROM {self._quote(self.table)} WHERE {where} LIMIT 1", values).fetchone()
+        return row is not None
+
+    def keys(self):
+        """Set of every key stored so far (composite keys hashed as in row_keys). Loads the whole key index."""
+        if not self.key_columns:
+            return set()
+        frame = pd.read_sql_query(f"SELECT {', '.join(map(self._quote, self.key_columns))} "
+                                  f"FROM {self._quote(self.table)}", self._connection())
+        return set(row_keys(frame, self.key_column).dropna())
+
+    def count(self):
+        """Number of rows stored."""
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self._quote(self.table)}").fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def append(self, df):
+        """
+        Insert the rows of df; rows whose key is already in the table are ignored by the unique index.
+
+        Returns:
+            The rows actually written
+        """
+        if df is None or df.empty:
+            return df
+        columns = [str(column) for column in df.columns]
+        values = df.astype(object)
+        stored_at = datetime.now().isoformat(timespec="seconds")
+        connection = self._connection()
+        with self._lock:
+            with connection:
+                self._add_columns(connection, df)
+                statement = (f"INSERT OR IGNORE INTO {self._quote(self.table)} "
+                             f"(keyword, stored_at, {', '.join(map(self._quote, columns))}) "
+                             f"VALUES ({', '.join('?' * (len(columns) + 2))})")
+                written = [connection.execute(statement, [self.keyword, stored_at] + [sql_value(v) for v in row]
+                                              ).rowcount == 1
+                           for row in values.itertuples(index=False, name=None)]
+        df = df[written]
+        if df.empty:
+            print(f"No new rows for {self.table} in {self.path}")
+        else:
+            key_values = row_keys(df, self.key_column)
+            update_seen_filter(self, key_values.dropna() if key_values is not None else [], len(df))
+            print(f"Appended {len(df)} rows to {self.table} in {self.path}")
+        return df
+
+    def read(self, columns=None, intent=None, min_score=None, keyword=None):
+        """
+        Stored rows as one DataFrame; only the requested columns are selected and
+        the filters run in SQL.
+
+        Args:
+            columns: Columns to return (all, including keyword and stored_at, if None)
+            intent: Keep only rows whose Best Matched Intent is this
+            min_score: Keep only rows whose Similarity Score is at least this
+            keyword: Keep only rows scraped for this keyword
+        """
+        connection = self._connection()
+        table_columns = self._table_columns(connection)
+        if columns is not None:
+            columns = [column for column in columns if column in table_columns]
+            if not columns:
+                return pd.DataFrame()
+        conditions, parameters = [], []
+        for column, operator, value in (("Best Matched Intent", "=", intent), ("Similarity Score", ">=", min_score),
+                                        ("keyword", "=", keyword)):
+            if value is None:
+                continue
+            if column not in table_columns:
+                return pd.DataFrame(columns=columns)
+            conditions.append(f"{self._quote(column)} {operator} ?")
+            parameters.append(value)
+        query = f"SELECT {', '.join(map(self._quote, columns)) if columns else '*'} FROM {self._quote(self.table)}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return pd.read_sql_query(query + " ORDER BY rowid", connection, params=parameters)
+
+    def compact(self):
+        """Fold the write-ahead log into the database and reclaim free pages."""
+        connection = self._connection()
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+        print(f"Compacted {self.path}")
+        return self.count()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_csv_store(path, key_column):
+    """Shared CsvResultStore for path, so every writer in the process sees the same key index."""
+    with _stores_lock:
+        store = _stores.get(("csv", path))
+        if store is None:
+            store = _stores[("csv", path)] = CsvResultStore(path, key_column)
+        return store
+
+
+def get_parquet_store(path, key_column, keyword=None, date_column=None):
+    """Shared ParquetResultStore for path and keyword."""
+    with _stores_lock:
+        store = _stores.get(("parquet", path, keyword))
+        if store is None:
+            store = _stores[("parquet", path, keyword)] = ParquetResultStore(path, key_column, keyword, date_column)
+        return store
+
+
+def get_sqlite_store(path, table, key_column, keyword=None):
+    """Shared SqliteResultStore for one table of the database at path."""
+    with _stores_lock:
+        store = _stores.get(("sqlite", path, table, keyword))
+        if store is None:
+            store = _stores[("sqlite", path, table, keyword)] = SqliteResultStore(path, table, key_column, keyword)
+        return store
+
+
+def open_result_store(name, key_column, keyword=None, csv_path=None, date_column=None, backend=None):
+    """
+    The result store for one table, on the backend chosen by RESULT_STORE_BACKEND.
+
+    Every backend offers append, keys, `key in store`, count, read(columns, intent,
+    min_score), files and compact.
+
+    Args:
+        name: Table name, used as the Parquet directory or SQLite table (e.g. "tweets")
+        key_column: Column (or tuple of columns) identifying a row
+        keyword: Search keyword; the Parquet keyword partition of new rows
+        csv_path: CSV file for the csv backend (defaults to <name>.csv)
+        date_column: Column holding each row's date, for the Parquet day partition
+        backend: "csv", "parquet" or "sqlite"; defaults to RESULT_STORE_BACKEND
+    """
+    backend = backend or RESULT_STORE_BACKEND
+    if backend == "csv":
+        return get_csv_store(csv_path or f"{name}.csv", key_column)
+    if backend == "parquet":
+        return get_parquet_store(os.path.join(RESULT_STORE_DIR, name), key_column, keyword, date_column)
+    if backend == "sqlite":
+        return get_sqlite_store(os.path.join(RESULT_STORE_DIR, SQLITE_DATABASE), name, key_column, keyword)
+    raise ValueError(f"Unknown result store backend: {backend}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "compact":
+        if os.path.isdir(sys.argv[2]):
+            ParquetResultStore(sys.argv[2], sys.argv[3]).compact()
+        else:
+            CsvResultStore(sys.argv[2], sys.argv[3]).compact()
+    elif len(sys.argv) in (5, 6) and sys.argv[1] == "import":
+        # Copy a CSV history into a Parquet dataset; keys already there are skipped
+        history = CsvResultStore(sys.argv[2], sys.argv[4]).read()
+        keyword = sys.argv[5] if len(sys.argv) == 6 else None
+        date_column = "Date" if "Date" in history.columns else None
+        ParquetResultStore(sys.argv[3], sys.argv[4], keyword, date_column).append(history)
+    else:
+        print("Usage: python result_store.py compact <csv file or parquet directory> <key column>")
+        print("       python result_store.py import <csv file> <parquet directory> <key column> [keyword]")
+        sys.exit(1)
@@ -0,0 +1,128 @@
+import os
+import time
+import queue
+import random
+import threading
+from urllib.parse import urlparse
+from driver_pool import DriverPool
+
+# Runs a per-URL scrape function (reply or comment harvesting) on several
+# browsers at once. Each worker thread owns one DriverPool, so every worker has
+# its own Chrome profile directory, and all workers pull URLs from one queue.
+# Page loads are spaced out per domain so K workers don't hit a site K times
+# as often as the sequential loop did.
+
+# Where extra worker browsers keep their Chrome profiles. Log in to each site
+# once in every worker profile before running with several workers.
+WORKER_PROFILES_DIR = os.environ.get("WORKER_PROFILES_DIR", os.path.abspath("chrome_profiles"))
+
+
+def worker_profile_dir(worker_index):
+    """Chrome user-data-dir for worker `worker_index` (created if missing)."""
+    path = os.path.join(WORKER_PROFILES_DIR, f"worker_{worker_index}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def worker_driver_pools(first_pool, setup_driver, workers, max_uses=25):
+    """
+    Driver pools for `workers` parallel browsers. Worker 0 reuses first_pool
+    (the scraper's main, logged-in profile); the others launch setup_driver
+    with their own profile directory under WORKER_PROFILES_DIR.
+    """
+    pools = [first_pool]
+    for index in range(1, workers):
+        profile_dir = worker_profile_dir(index)
+        factory = lambda profile_dir=profile_dir: setup_driver(user_data_dir=profile_dir,
+                                                               profile_directory="Default")
+        pools.append(DriverPool(factory, size=1, max_uses=max_uses))
+    return pools
+
+
+class DomainRateLimiter:
+    """
+    Spaces out page loads per domain across all workers.
+
+    Args:
+        default_interval: Minimum seconds between two loads on the same domain
+        intervals: Optional {domain: seconds} overrides
+        jitter: Extra random delay of up to this many seconds per load
+    """
+
+    def __init__(self, default_interval=5.0, intervals=None, jitter=0.0):
+        self.default_interval = default_interval
+        self.intervals = intervals or {}
+        self.jitter = jitter
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until this worker may load `url`."""
+        domain = urlparse(url).netloc.lower()
+        interval = self.intervals.get(domain, self.default_interval) + random.uniform(0, self.jitter)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def scrape_concurrently(urls, scrape_func, driver_pools, rate_limiter=None, dedupe_key=None):
+    """
+    Scrape every URL with one worker thread per driver pool.
+
+    Args:
+        urls: URLs to process; each is handled exactly once
+        scrape_func: Called as scrape_func(url, driver_pool) and returns a list of records
+        driver_pools: One DriverPool per worker
+        rate_limiter: Optional DomainRateLimiter shared by the workers
+        dedupe_key: If set, drop merged records whose value for this key was already seen
+
+    Returns:
+        All records, merged in the order of `urls`
+    """
+    urls = list(urls)
+    work = queue.Queue()
+    for position, url in enumerate(urls):
+        work.put((position, url))
+
+    results = [[] for _ in urls]
+    done = [0]
+    progress_lock = threading.Lock()
+
+    def worker(worker_index, driver_pool):
+        while True:
+            try:
+                position, url = work.get_nowait()
+            except queue.Empty:
+                return
+            if rate_limiter is not None:
+                rate_limiter.wait(url)
+            try:
+                results[position] = scrape_func(url, driver_pool) or []
+            except Exception as e:
+                print(f"[worker {worker_index}] Error scraping {url}: {str(e)}")
+            with progress_lock:
+                done[0] += 1
+                print(f"[worker {worker_index}] {done[0]}/{len(urls)} done, "
+                      f"{len(results[position])} records from {url}")
+
+    workers = [threading.Thread(target=worker, args=(index, pool), daemon=True)
+               for index, pool in enumerate(driver_pools)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    merged = []
+    seen = set()
+    for records in results:
+        for record in records:
+            if dedupe_key is not None:
+                key = record.get(dedupe_key)
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(record)
+    return merged
@@ -1,4 +1,5 @@
 import time
+import hashlib
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,6 +11,9 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 import logging
 from dotenv import dotenv_values
+from scroll_wait import ScrollWaiter
+from feed_cursor import FeedCursor
+from lean_browsing import LEAN_BROWSING, HEADLESS, lean_chrome_options, block_heavy_requests
 
 
 # Configure logging
@@ -19,8 +23,19 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Search Keyword
 SEARCH_KEYWORD = "Artificial Intelligence"
 
-def setup_driver():
-    """Set up and return a configured ChromeDriver instance"""
+# Post body in the LinkedIn search results
+POST_CONTENT_XPATH = "//div[contains(@class, 'update-components-text relative update-components-update-v2__commentary')]"
+# Author block of a post, relative to its commentary: searched only inside the
+# post's own container (matched on whole class names, not the nested __ blocks)
+POST_AUTHOR_XPATH = ("./ancestor::div[contains(@data-urn, 'urn:li:activity') or "
+                     "contains(concat(' ', normalize-space(@class), ' '), ' feed-shared-update-v2 ')][1]"
+                     "//div[contains(concat(' ', normalize-space(@class), ' '), ' update-components-actor ')]")
+
+def setup_driver(lean=LEAN_BROWSING, headless=HEADLESS):
+    """
+    Set up and return a configured ChromeDriver instance.
+    lean blocks images, media, fonts and trackers; headless runs without a window.
+    """
     logging.info("Setting up Chrome driver")
     try:
         options = webdriver.ChromeOptions()
@@ -36,8 +51,16 @@ def setup_driver():
         }
         options.add_experimental_option("prefs", prefs)
 
+        if lean:
+            logging.info("Lean browsing: blocking images, media, fonts and trackers")
+            lean_chrome_options(options, headless=headless)
+        elif headless:
+            options.add_argument("--headless=new")
+
         logging.info("Installing ChromeDriver using ChromeDriverManager")
         driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        if lean:
+            block_heavy_requests(driver)
         logging.info("Chrome driver setup completed successfully")
         return driver
     except Exception as e:
@@ -118,13 +141,18 @@ def search_keyword(driver):
         logging.error(f"Search failed: {str(e)}")
         return False
 
+def content_hash(text):
+    """Hash of a post's whitespace-normalised text, used to recognise posts already scraped"""
+    return hashlib.sha1(' '.join(text.split()).encode("utf-8")).hexdigest()
+
 def scrape_posts(driver, scroll_delay=2.5):
     """
     Scrolls continuously until no new posts are loaded, scraping all available content
     
     Args:
         driver: Selenium WebDriver instance
-        scroll_delay: Seconds to wait between scrolls (default 2.5)
+        scroll_delay: Maximum seconds to wait for new posts after each scroll (default 2.5);
+            the wait ends as soon as new posts appear
         
     Returns:
         List of dictionaries containing post data (author details, content, comments)
@@ -136,6 +164,9 @@ def scrape_posts(driver, scroll_delay=2.5):
     last_height = driver.execute_script("return document.body.scrollHeight")
     consecutive_no_change = 0
     scroll_count = 0
+    seen_hashes = set()  # content hashes of every post already collected
+    cursor = FeedCursor()  # tags post elements once handled so later scrolls skip them
+    scroll_waiter = ScrollWaiter(POST_CONTENT_XPATH, timeout=scroll_delay)
 
     try:
         # Infinite scroll loop
@@ -143,12 +174,12 @@ def scrape_posts(driver, scroll_delay=2.5):
             scroll_count += 1
             logging.info(f"Scroll attempt #{scroll_count}")
             
-            # Scroll to bottom
+            # Scroll to bottom and wait for the next batch of posts
+            before_scroll = scroll_waiter.snapshot(driver)
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(scroll_delay)
             
             # Check for new content
-            new_height = driver.execute_script("return document.body.scrollHeight")
+            new_height = scroll_waiter.wait(driver, before_scroll)["height"]
             if new_height == last_height:
                 consecutive_no_change += 1
                 if consecutive_no_change >= 3:  # Confirm end of content
@@ -158,25 +189,36 @@ def scrape_posts(driver, scroll_delay=2.5):
                 consecutive_no_change = 0  # Reset counter if content changed
             last_height = new_height
 
-            # Process current batch of posts
-            post_content_elements = WebDriverWait(driver, 15).until(
-                EC.presence_of_all_elements_located((By.XPATH, 
-                    "//div[contains(@class, 'update-components-text relative update-components-update-v2__commentary')]"))
-            )
-            
-            author_containers = driver.find_elements(By.XPATH,
-                "//div[contains(@class, 'update-components-actor')]")
-            
-            if len(post_content_elements) != len(author_containers):
-                logging.warning(f"Mismatch found: {len(post_content_elements)} posts vs {len(author_containers)} authors")
+            # Process only the posts that appeared since the previous scroll
+            if scroll_count == 1:
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_all_elements_located((By.XPATH, POST_CONTENT_XPATH))
+                )
+            post_content_elements = driver.find_elements(By.XPATH, cursor.unseen_xpath(POST_CONTENT_XPATH))
+
+            # Each post's author comes from its own post container, so a missing or
+            # extra author block can't shift the pairing for the posts after it
+            new_pairs = []
+            for content_div in post_content_elements:
+                try:
+                    new_pairs.append((content_div, content_div.find_element(By.XPATH, POST_AUTHOR_XPATH)))
+                except NoSuchElementException:
+                    pass  # author not rendered yet; the post stays unmarked and is read next scroll
+            if len(new_pairs) != len(post_content_elements):
+                logging.warning(f"{len(post_content_elements) - len(new_pairs)} new posts have no author yet")
+            cursor.mark(driver, [content_div for content_div, _ in new_pairs])
+            logging.info(f"{len(new_pairs)} new post elements on this scroll")
             
-            # Process each post with its corresponding author container
-            for index, (content_div, author_div) in enumerate(zip(post_content_elements, author_containers)):
+            # Process each new post with its corresponding author container
+            for content_div, author_div in new_pairs:
                 try:
+                    full_text = content_div.get_attribute("textContent") or ""
+                    
                     # Skip if we've already processed this post
-                    if any(post['Post Content'] == content_div.get_attribute("textContent").strip() 
-                           for post in posts_data):
+                    post_hash = content_hash(full_text)
+                    if post_hash in seen_hashes:
                         continue
+                    seen_hashes.add(post_hash)
                         
                     post_data = {}
                     
@@ -197,7 +239,6 @@ def scrape_posts(driver, scroll_delay=2.5):
                     
                     # --- POST CONTENT EXTRACTION ---
                     try:
-                        full_text = content_div.get_attribute("textContent")
                         post_text = ' '.join(full_text.split()).strip()
                     except Exception as e:
                         post_text = "N/A"
@@ -245,6 +286,7 @@ def scrape_posts(driver, scroll_delay=2.5):
                     continue
 
         logging.info(f"Scraping complete. Total posts collected: {len(posts_data)}")
+        logging.info(scroll_waiter.summary())
         return posts_data
     
     except Exception as e:
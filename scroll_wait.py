@@ -0,0 +1,147 @@
+import time
+import statistics
+
+# Adaptive waits for infinite-scroll pages. After a scroll the scrapers used to
+# sleep a fixed 2-5 seconds whether or not the next batch had already arrived.
+# ScrollWaiter instead returns as soon as more items match its XPath (or the
+# page grows), with a capped timeout for the end of the feed, and records how
+# long every load actually took.
+
+# Waits inside the browser with a MutationObserver, so the whole wait is one
+# WebDriver round-trip. Resolves with the page state once something loaded or
+# the timeout passed.
+WAIT_FOR_ITEMS_JS = r"""
+var xpath = arguments[0], previousCount = arguments[1], previousHeight = arguments[2],
+    timeoutMs = arguments[3], done = arguments[arguments.length - 1];
+
+function count() {
+    return document.evaluate('count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;
+}
+function loaded() {
+    return count() > previousCount || document.body.scrollHeight > previousHeight;
+}
+function state(timedOut) {
+    return {count: count(), height: document.body.scrollHeight, timed_out: timedOut};
+}
+
+if (loaded()) {
+    done(state(false));
+    return;
+}
+
+var finished = false, observer, timer;
+function finish(timedOut) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(state(timedOut));
+}
+observer = new MutationObserver(function () {
+    if (loaded()) finish(false);
+});
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(function () { finish(true); }, timeoutMs);
+"""
+
+SNAPSHOT_JS = r"""
+return {
+    count: document.evaluate('count(' + arguments[0] + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue,
+    height: document.body.scrollHeight
+};
+"""
+
+
+class ScrollWaiter:
+    """
+    Waits for new items after a scroll instead of sleeping a fixed interval.
+
+    Args:
+        xpath: XPath of the items the page loads (tweets, posts); a union of
+            several XPaths with " | " works too
+        timeout: Maximum seconds to wait when nothing new loads
+        min_wait: Always wait at least this long (keeps scraping paced like a person)
+        poll_interval: Seconds between checks when the MutationObserver wait is unavailable
+    """
+
+    def __init__(self, xpath, timeout=5.0, min_wait=0.0, poll_interval=0.25):
+        self.xpath = xpath
+        self.timeout = timeout
+        self.min_wait = min_wait
+        self.poll_interval = poll_interval
+        self.load_times = []  # seconds until new items appeared, one entry per successful wait
+        self.timeouts = 0
+        self._use_observer = True
+        self._timeout_driver = None  # driver whose script timeout already covers self.timeout
+
+    def snapshot(self, driver):
+        """Item count and page height; take this before scrolling and pass it to wait()."""
+        try:
+            return driver.execute_script(SNAPSHOT_JS, self.xpath)
+        except Exception:
+            return {"count": 0, "height": 0}
+
+    def _wait_observer(self, driver, before, timeout):
+        if self._timeout_driver is not driver:
+            driver.set_script_timeout(timeout + 5)
+            self._timeout_driver = driver
+        return driver.execute_async_script(WAIT_FOR_ITEMS_JS, self.xpath, before["count"],
+                                           before["height"], int(timeout * 1000))
+
+    def _wait_poll(self, driver, before, deadline):
+        while True:
+            state = self.snapshot(driver)
+            if state["count"] > before["count"] or state["height"] > before["height"]:
+                state["timed_out"] = False
+                return state
+            if time.perf_counter() >= deadline:
+                state["timed_out"] = True
+                return state
+            time.sleep(self.poll_interval)
+
+    def wait(self, driver, before):
+        """
+        Block until more items than in `before` are on the page, or the timeout passes.
+
+        Returns:
+            Dict with the new "count", "height" and whether the wait "timed_out"
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        state = None
+        if self._use_observer:
+            try:
+                state = self._wait_observer(driver, before, self.timeout)
+            except Exception:
+                # Some drivers don't support async scripts; poll from here on
+                self._use_observer = False
+        if state is None:
+            state = self._wait_poll(driver, before, deadline)
+
+        elapsed = time.perf_counter() - start
+        if state.get("timed_out"):
+            self.timeouts += 1
+        else:
+            self.load_times.append(elapsed)
+        if elapsed < self.min_wait:
+            time.sleep(self.min_wait - elapsed)
+        return state
+
+    def stats(self):
+        """Summary of the recorded load times, in seconds."""
+        loads = self.load_times
+        return {
+            "loads": len(loads),
+            "timeouts": self.timeouts,
+            "mean_load_seconds": round(statistics.mean(loads), 3) if loads else None,
+            "p50_load_seconds": round(statistics.median(loads), 3) if loads else None,
+            "max_load_seconds": round(max(loads), 3) if loads else None,
+            "waited_seconds": round(sum(loads) + self.timeouts * self.timeout, 3),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        if not stats["loads"]:
+            return f"Scroll loads: none ({stats['timeouts']} timeouts)"
+        return (f"Scroll loads: {stats['loads']}, median {stats['p50_load_seconds']}s, "
+                f"max {stats['max_load_seconds']}s, {stats['timeouts']} timeouts")
@@ -0,0 +1,256 @@
+import os
+import sys
+import math
+import mmap
+import struct
+import hashlib
+import threading
+
+# Compact seen-URL set for deduplication against a large history. Instead of
+# loading every stored URL into a Python set at startup, a Bloom filter kept in
+# a memory-mapped file answers "definitely new" for almost every URL the
+# scrapers meet; only when the filter says "maybe seen" is the result store
+# asked for the exact answer, an index lookup on every backend (the key index
+# of the CSV and Parquet stores, the unique index of the sqlite one). The
+# filter holds stored keys only: every store append adds the keys it wrote
+# (update_seen_filter), whichever process or tool writes. URLs collected during
+# a run but not stored yet are kept in a plain in-memory set. The filter also records how many rows the store held when it was last in sync; if
+# the store's count differs when a SeenSet opens it (a compaction, rows written
+# by hand), it is rebuilt:
+#
+#     python seen_filter.py stats results/results.db.tweets.bloom
+
+# File layout: header, then the bit array
+HEADER = struct.Struct("<8sQIIQQ")  # magic, bits, hash count, reserved, keys added, store rows seen
+MAGIC = b"IBBLOOM1"
+KEYS_OFFSET = HEADER.size - 16
+ROWS_OFFSET = HEADER.size - 8
+
+DEFAULT_CAPACITY = 5_000_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+def filter_size(capacity, error_rate):
+    """Bits and hash count for a Bloom filter holding capacity keys at error_rate false positives."""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """
+    Bloom filter stored in a memory-mapped file; bits set by add() are written
+    straight to the page cache, so the file is always current.
+
+    Args:
+        path: Filter file; created sized for capacity and error_rate if missing
+        capacity: Keys the filter is sized for; past it the false-positive rate grows
+        error_rate: Target false-positive rate at capacity
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        self.path = path
+        if not os.path.exists(path):
+            bits, hashes = filter_size(capacity, error_rate)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, bits, hashes, 0, 0, 0))
+                f.truncate(HEADER.size + bits // 8)  # sparse on most filesystems
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, _, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a seen-URL filter")
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        """Distinct keys added so far (adding a key whose bits are all set already doesn't count)."""
+        return struct.unpack_from("<Q", self._map, KEYS_OFFSET)[0]
+
+    @property
+    def store_rows(self):
+        """Rows of the result store whose keys are in the filter, as recorded by add_store_rows."""
+        return struct.unpack_from("<Q", self._map, ROWS_OFFSET)[0]
+
+    def add_store_rows(self, rows):
+        with self._lock:
+            struct.pack_into("<Q", self._map, ROWS_OFFSET, self.store_rows + rows)
+
+    def capacity(self, error_rate=DEFAULT_ERROR_RATE):
+        return int(self.bits * math.log(2) ** 2 / -math.log(error_rate))
+
+    def _positions(self, key):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        second |= 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        """Set the bits of key; returns True if any of them was new (and the key was counted)."""
+        with self._lock:
+            changed = False
+            for position in self._positions(key):
+                offset = HEADER.size + (position >> 3)
+                bit = 1 << (position & 7)
+                if not self._map[offset] & bit:
+                    self._map[offset] |= bit
+                    changed = True
+            if changed:
+                struct.pack_into("<Q", self._map, KEYS_OFFSET, self.count + 1)
+            return changed
+
+    def __contains__(self, key):
+        """False if key was never added; True if it probably was."""
+        for position in self._positions(key):
+            if not self._map[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def fill_ratio(self):
+        """Share of bits set; the false-positive rate is roughly fill_ratio ** hashes."""
+        return int.from_bytes(self._map[HEADER.size:], "little").bit_count() / self.bits
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+
+def default_filter_path(store):
+    """Filter file next to a result store (per table for the sqlite backend, which shares one file)."""
+    table = getattr(store, "table", None)
+    return f"{store.path}.{table}.bloom" if table else f"{store.path}.bloom"
+
+
+_filters = {}
+_filters_lock = threading.Lock()
+
+
+def open_filter(path, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+    """Shared BloomFilter for path, so SeenSets and store appends in one process map the file once."""
+    with _filters_lock:
+        bloom = _filters.get(path)
+        if bloom is None:
+            bloom = _filters[path] = BloomFilter(path, capacity, error_rate)
+        return bloom
+
+
+def close_filter(path):
+    with _filters_lock:
+        bloom = _filters.pop(path, None)
+    if bloom is not None:
+        bloom.close()
+
+
+def update_seen_filter(store, keys, rows):
+    """
+    Add keys a result store just wrote to its seen-URL filter, if it has one.
+
+    Args:
+        store: The result store that appended
+        keys: Keys of the rows written
+        rows: How much store.count() grew with them
+    """
+    path = default_filter_path(store)
+    if not os.path.exists(path):
+        return
+    bloom = open_filter(path)
+    for key in keys:
+        bloom.add(key)
+    bloom.add_store_rows(rows)
+
+
+class SeenSet:
+    """
+    Seen-URL set for a result store: a persistent Bloom filter in front of exact
+    lookups in the store.
+
+    `url in seen` is True for URLs add()ed during this run (an in-memory set), and
+    False straight from the filter for URLs never stored; for the rest the store
+    confirms, so a false positive never makes a scraper skip a new URL. The
+    store adds the keys of every append to the filter. A missing filter file, or one whose recorded row count no
+    longer matches the store, is built from the store's keys.
+
+    Args:
+        store: Result store holding the URLs as its key (see result_store.py)
+        path: Filter file (defaults to next to the store)
+        capacity: Keys the filter is sized for when it has to be created
+        error_rate: Target false-positive rate at capacity
+    """
+
+    def __init__(self, store, path=None, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+        self.store = store
+        self.path = path or default_filter_path(store)
+        self.lookups = 0
+        self.store_checks = 0
+        self.false_positives = 0
+        self._collected = set()  # URLs scraped this run, stored or not
+        rows = store.count()
+        self.filter = None
+        if os.path.exists(self.path):
+            self.filter = open_filter(self.path)
+            if self.filter.store_rows != rows:
+                print(f"Seen-URL filter {self.path} saw {self.filter.store_rows} rows, the store has {rows}")
+                self.filter = None
+        if self.filter is None:
+            self._build(rows, capacity, error_rate)
+        if self.filter.count > self.filter.capacity(error_rate):
+            print(f"Seen-URL filter {self.path} is past its capacity; delete it to rebuild a larger one")
+
+    def _build(self, rows, capacity, error_rate):
+        close_filter(self.path)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        keys = self.store.keys()
+        print(f"Building seen-URL filter {self.path} from {len(keys)} stored keys...")
+        self.filter = open_filter(self.path, max(capacity, 2 * len(keys)), error_rate)
+        for key in keys:
+            self.filter.add(key)
+        self.filter.add_store_rows(rows)
+        self.filter.flush()
+
+    def __contains__(self, key):
+        self.lookups += 1
+        if key in self._collected:
+            return True
+        if key not in self.filter:
+            return False
+        self.store_checks += 1
+        if key in self.store:
+            return True
+        self.false_positives += 1
+        return False
+
+    def add(self, key):
+        """Record a URL the scrapers just collected, so later lookups in this run skip it."""
+        if key:
+            self._collected.add(key)
+
+    def __len__(self):
+        return self.filter.count
+
+    def stats(self):
+        return {"lookups": self.lookups, "store_checks": self.store_checks,
+                "false_positives": self.false_positives, "filter_keys": self.filter.count}
+
+    def close(self):
+        close_filter(self.path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "stats":
+        print("Usage: python seen_filter.py stats <filter file>")
+        sys.exit(1)
+    bloom = BloomFilter(sys.argv[2])
+    fill = bloom.fill_ratio()
+    print(f"{sys.argv[2]}: {bloom.bits} bits, {bloom.hashes} hashes, {bloom.count} keys added, "
+          f"{bloom.store_rows} store rows seen, {fill:.2%} of bits set, ~{fill ** bloom.hashes:.4%} false positives")
+    bloom.close()
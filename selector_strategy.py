@@ -0,0 +1,159 @@
+import threading
+from collections import Counter
+
+# Batched DOM extraction for pages whose markup keeps changing (LinkedIn).
+# Every field has several candidate XPaths. Instead of one WebDriver call per
+# candidate, per field, per element, a SelectorStrategy sends all candidates to
+# the browser in a single script and gets every field of every visible item
+# back. The candidate that matched most items last time is tried first on the
+# next call, so later scrolls rarely have to fall through the list. With a
+# FeedCursor, items already read on an earlier scroll are skipped in the browser.
+
+EXTRACT_JS = r"""
+var containerXPaths = arguments[0], fields = arguments[1], mark = arguments[2];
+
+function snapshot(xpath, context) {
+    try {
+        return document.evaluate(xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        return null;  // invalid XPath for this document, treat as no match
+    }
+}
+
+function readValue(node, read) {
+    var value;
+    if (read === 'text') value = node.innerText;
+    else if (read === 'textContent') value = node.textContent;
+    else if (read === 'href') value = node.href || node.getAttribute('href');
+    else value = node.getAttribute(read);
+    return value ? String(value).trim() : '';
+}
+
+var containers = [], containerIndex = -1;
+for (var c = 0; c < containerXPaths.length; c++) {
+    var found = snapshot(containerXPaths[c], document);
+    if (found && found.snapshotLength) {
+        for (var i = 0; i < found.snapshotLength; i++) containers.push(found.snapshotItem(i));
+        containerIndex = c;
+        break;
+    }
+}
+
+if (mark) {
+    containers = containers.filter(function (container) {
+        return container.getAttribute(mark.attribute) !== mark.token;
+    });
+}
+
+var items = containers.map(function (container) {
+    var item = {};
+    fields.forEach(function (field) {
+        for (var k = 0; k < field.candidates.length; k++) {
+            var candidate = field.candidates[k];
+            var nodes = snapshot(candidate.xpath, container);
+            if (!nodes || !nodes.snapshotLength) continue;
+            var value = readValue(nodes.snapshotItem(0), candidate.read);
+            if (!value || (candidate.contains && value.indexOf(candidate.contains) === -1)) continue;
+            item[field.name] = [value, k];
+            return;
+        }
+    });
+    // Only tag complete items; partly rendered ones are read again next pass
+    if (mark && mark.required.every(function (names) {
+            return names.some(function (name) { return name in item; });
+        })) {
+        container.setAttribute(mark.attribute, mark.token);
+    }
+    return item;
+});
+
+return {container: containerIndex, items: items};
+"""
+
+
+def _candidate(candidate):
+    """Normalise a candidate: a bare XPath string reads the matched node's text."""
+    if isinstance(candidate, str):
+        return {"xpath": candidate, "read": "text", "contains": None}
+    return {"xpath": candidate["xpath"], "read": candidate.get("read", "text"),
+            "contains": candidate.get("contains")}
+
+
+class SelectorStrategy:
+    """
+    Extracts several fields from every item on the page in one execute_script call.
+
+    Args:
+        containers: Candidate XPaths for the items (posts, comments); the first one
+            that matches anything is used
+        fields: {field name: [candidate, ...]}. A candidate is an XPath relative to the
+            item, or a dict with "xpath", "read" ("text", "textContent", "href" or an
+            attribute name) and an optional "contains" substring the value must have.
+            The first candidate giving a non-empty value wins.
+        required: Fields an item must have before a FeedCursor marks it as read; an
+            entry can be a tuple of alternatives, any one of which will do
+    """
+
+    def __init__(self, containers, fields, required=()):
+        self.containers = list(containers)
+        self.required = [[name] if isinstance(name, str) else list(name) for name in required]
+        self.fields = {name: [_candidate(c) for c in candidates] for name, candidates in fields.items()}
+        self._preferred = {}  # field name (None for containers) -> index of last winning candidate
+        self._lock = threading.Lock()  # comment workers share one strategy
+
+    def _order(self, key, count):
+        """Candidate indices to try, last winner first."""
+        order = list(range(count))
+        preferred = self._preferred.get(key)
+        if preferred is not None:
+            order.remove(preferred)
+            order.insert(0, preferred)
+        return order
+
+    def extract(self, driver, cursor=None):
+        """
+        Return one {field: value} dict per item; fields with no matching candidate are left out.
+        With a FeedCursor, only items not returned complete by an earlier call are read.
+        """
+        with self._lock:
+            container_order = self._order(None, len(self.containers))
+            field_orders = {name: self._order(name, len(candidates)) for name, candidates in self.fields.items()}
+
+        payload = [{"name": name, "candidates": [self.fields[name][i] for i in order]}
+                   for name, order in field_orders.items()]
+        mark = None
+        if cursor is not None:
+            mark = {"attribute": cursor.attribute, "token": cursor.token, "required": self.required}
+        try:
+            result = driver.execute_script(EXTRACT_JS, [self.containers[i] for i in container_order], payload, mark)
+        except Exception as e:
+            print(f"Error running batched extraction: {str(e)}")
+            return []
+
+        if not result or result.get("container", -1) < 0:
+            return []
+
+        items = []
+        wins = {name: Counter() for name in self.fields}
+        for raw in result.get("items") or []:
+            item = {}
+            for name, (value, position) in raw.items():
+                item[name] = value
+                wins[name][field_orders[name][position]] += 1
+            items.append(item)
+
+        with self._lock:
+            self._preferred[None] = container_order[result["container"]]
+            for name, counter in wins.items():
+                if counter:
+                    self._preferred[name] = counter.most_common(1)[0][0]
+        return items
+
+    def preferred_selectors(self):
+        """The XPath each field (and the container) will try first on the next call."""
+        with self._lock:
+            preferred = {name: self.fields[name][index]["xpath"]
+                         for name, index in self._preferred.items() if name is not None}
+            if None in self._preferred:
+                preferred["container"] = self.containers[self._preferred[None]]
+        return preferred
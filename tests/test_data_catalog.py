@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from data_catalog import DataCatalog
+from result_store import CsvResultStore, ParquetResultStore, SqliteResultStore
+
+
+def open_store(backend, tmp_path):
+    if backend == "csv":
+        return CsvResultStore(str(tmp_path / "tweets.csv"), "DocURL")
+    if backend == "parquet":
+        return ParquetResultStore(str(tmp_path / "tweets"), "DocURL", keyword="AI")
+    return SqliteResultStore(str(tmp_path / "results.db"), "tweets", "DocURL")
+
+
+@pytest.mark.parametrize("backend", ["csv", "parquet", "sqlite"])
+def test_counts_follow_appends(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    store.append(pd.DataFrame({"DocURL": ["u1", "u2"], "Text": ["a", "b"]}))
+
+    catalog = DataCatalog()
+    tweets = catalog.register("tweets", store)
+    assert tweets.count() == 2
+    tweets.append(pd.DataFrame({"DocURL": ["u2", "u3"], "Text": ["b", "c"]}))
+    assert tweets.count() == 3 == store.count()
+    assert tweets.last_modified is not None
+    assert catalog.summary().startswith("Total tweets in database: 3 ")
+
+
+def test_csv_count_includes_rows_without_a_key(tmp_path):
+    path = str(tmp_path / "tweets.csv")
+    pd.DataFrame({"DocURL": ["u1", None, None], "Text": ["a", "b", "c"]}).to_csv(path, index=False)
+    store = CsvResultStore(path, "DocURL")
+    assert store.count() == 3
+    store.append(pd.DataFrame({"DocURL": [None, "u2"], "Text": ["d", "e"]}))
+    assert store.count() == 5 == len(store.read())
+    assert CsvResultStore(path, "DocURL").count() == 5
+
+
+def test_loaded_frame_and_recent_order_include_appended_rows(tmp_path):
+    store = open_store("csv", tmp_path)
+    store.append(pd.DataFrame({"DocURL": ["u1"], "Date": ["2024-05-15"], "Time": ["10:00:00"]}))
+    tweets = DataCatalog().register("tweets", store)
+    assert tweets.frame()["DocURL"].tolist() == ["u1"]
+
+    tweets.append(pd.DataFrame({"DocURL": ["u2"], "Date": ["2024-05-16"], "Time": ["09:00:00"]}))
+    assert tweets.frame()["DocURL"].tolist() == ["u1", "u2"]
+    assert tweets.recent()["DocURL"].tolist() == ["u2", "u1"]
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from driver_pool import DriverPool, driver_session
+
+
+class FakeDriver:
+    """Stands in for a WebDriver: window_handles fails once the browser has crashed or quit."""
+
+    def __init__(self):
+        self.crashed = False
+        self.quit_calls = 0
+
+    @property
+    def window_handles(self):
+        if self.crashed or self.quit_calls:
+            raise RuntimeError("browser is gone")
+        return ["main"]
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_sessions_reuse_one_browser_until_max_uses():
+    launched = []
+    pool = DriverPool(lambda: launched.append(FakeDriver()) or launched[-1], size=1, max_uses=3)
+    for _ in range(5):
+        with pool.session():
+            pass
+    assert pool.launched == 2 and pool.recycled == 1
+    assert launched[0].quit_calls == 1
+    pool.close()
+    assert launched[1].quit_calls == 1
+
+
+def test_crashed_browser_is_replaced():
+    pool = DriverPool(FakeDriver, size=1)
+    with pool.session() as driver:
+        driver.crashed = True
+    with pool.session() as second:
+        assert second is not driver
+    assert pool.recycled == 1
+    pool.close()
+
+
+def test_error_in_session_quits_the_browser():
+    pool = DriverPool(FakeDriver, size=1)
+    with pytest.raises(ValueError):
+        with pool.session() as driver:
+            raise ValueError("page failed")
+    assert driver.quit_calls == 1
+    pool.close()
+
+
+def test_threads_never_exceed_the_pool_size():
+    lock = threading.Lock()
+    in_use, peak = [0], [0]
+
+    def work(pool):
+        for _ in range(50):
+            with pool.session():
+                with lock:
+                    in_use[0] += 1
+                    peak[0] = max(peak[0], in_use[0])
+                with lock:
+                    in_use[0] -= 1
+
+    pool = DriverPool(FakeDriver, size=2, max_uses=10)
+    threads = [threading.Thread(target=work, args=(pool,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+    assert peak[0] <= 2
+    assert pool.launched - pool.recycled <= 2
+    assert pool.launched >= 300 // 10
+
+
+def test_closed_pool_refuses_sessions():
+    pool = DriverPool(FakeDriver)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_driver_session_without_a_pool_quits_its_browser():
+    with driver_session(None, FakeDriver) as driver:
+        pass
+    assert driver.quit_calls == 1
@@ -0,0 +1,62 @@
+import numpy as np
+
+from cosine_sim import EmbeddingCache, text_key
+
+
+def vectors(n, dim=4, start=0):
+    return np.arange(start, start + n * dim, dtype=np.float32).reshape(n, dim)
+
+
+def open_cache(tmp_path, capacity=4, flush_every=1000):
+    return EmbeddingCache(str(tmp_path), model_name="test-model", capacity=capacity, flush_every=flush_every)
+
+
+def test_put_then_get(tmp_path):
+    cache = open_cache(tmp_path)
+    keys = [text_key("first"), text_key("second")]
+    cache.put_many(keys, vectors(2))
+
+    found = cache.get_many(keys + [text_key("unknown")])
+    assert set(found) == set(keys)
+    np.testing.assert_array_equal(found[keys[1]], vectors(2)[1])
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = open_cache(tmp_path, capacity=2)
+    a, b, c = (text_key(text) for text in "abc")
+    cache.put_many([a, b], vectors(2))
+    cache.get_many([a])  # b is now the least recently used
+    cache.put_many([c], vectors(1, start=100))
+
+    found = cache.get_many([a, b, c])
+    assert set(found) == {a, c}
+    np.testing.assert_array_equal(found[c], vectors(1, start=100)[0])
+
+
+def test_rewriting_cached_keys_does_not_count_towards_a_flush(tmp_path):
+    cache = open_cache(tmp_path, flush_every=3)
+    keys = [text_key("first"), text_key("second")]
+    cache.put_many(keys, vectors(2))
+    cache.put_many(keys, vectors(2))
+    assert cache._unflushed == 2
+
+
+def test_reopen_after_flush(tmp_path):
+    cache = open_cache(tmp_path)
+    keys = [text_key("first"), text_key("second")]
+    cache.put_many(keys, vectors(2))
+    cache.flush()
+
+    reopened = open_cache(tmp_path)
+    assert len(reopened) == 2
+    np.testing.assert_array_equal(reopened.get_many(keys)[keys[0]], vectors(2)[0])
+
+
+def test_capacity_mismatch_runs_without_the_cache(tmp_path):
+    open_cache(tmp_path, capacity=3).put_many([text_key("first")], vectors(1))
+
+    other = open_cache(tmp_path, capacity=5)
+    other.put_many([text_key("second")], vectors(1))  # must not raise
+    assert other.get_many([text_key("first"), text_key("second")]) == {}
+    other.put_many([text_key("third")], vectors(1))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from cosine_sim import IntentIndex
+
+
+def clustered_vectors(n, dim=32, clusters=40, seed=0):
+    """Intent-like embeddings: groups of nearby vectors around random topics."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def build_index(backend, n=2000):
+    vectors = clustered_vectors(n)
+    index = IntentIndex(ann_threshold=500, backend=backend)
+    index.add([f"intent {i}" for i in range(n)], embeddings=vectors)
+    return index, vectors
+
+
+def recall_against_exact(index, vectors, queries, k=5):
+    exact = IntentIndex(ann_threshold=len(vectors) + 1)
+    exact.add(index.intents, embeddings=vectors)
+    assert not exact.is_approximate
+    expected = exact.search(queries, k)[0]
+    found = index.search(queries, k)[0]
+    return np.mean([len(set(a) & set(b)) / k for a, b in zip(expected, found)])
+
+
+@pytest.mark.parametrize("backend", ["ivf", "faiss", "hnswlib"])
+def test_approximate_search_recall(backend):
+    if backend != "ivf":
+        pytest.importorskip(backend)
+    index, vectors = build_index(backend)
+    assert index.is_approximate
+    queries = clustered_vectors(200, seed=1)
+    assert recall_against_exact(index, vectors, queries) >= 0.9
+
+
+def test_exact_search_returns_best_first():
+    vectors = np.eye(3, dtype=np.float32)
+    index = IntentIndex(ann_threshold=10)
+    index.add(["buy", "learn", "hire"], embeddings=vectors)
+    indices, scores = index.search(np.array([[0.1, 0.9, 0.2]]), k=2)
+    assert indices.tolist() == [[1, 2]]
+    assert scores[0, 0] > scores[0, 1]
+
+
+def test_save_load_round_trip(tmp_path):
+    index, vectors = build_index("ivf")
+    path = str(tmp_path / "intents.npz")
+    index.save(path)
+
+    loaded = IntentIndex.load(path)
+    assert loaded.intents == index.intents
+    assert loaded.is_approximate
+    queries = clustered_vectors(50, seed=2)
+    for before, after in zip(index.search(queries, 3), loaded.search(queries, 3)):
+        np.testing.assert_array_equal(before, after)
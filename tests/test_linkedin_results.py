@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import result_store
+from intentBotLinkedIn import save_results, COMMENT_KEY
+
+
+@pytest.fixture(autouse=True)
+def csv_backend(monkeypatch):
+    monkeypatch.setattr(result_store, "RESULT_STORE_BACKEND", "csv")
+
+
+def posts_frame(urls):
+    return pd.DataFrame({
+        "Profile Handle": ["a"] * len(urls),
+        "DocURL": urls,
+        "Target Sentence": [f"post {url}" for url in urls],
+        "Best Matched Intent": ["How can AI improve productivity?"] * len(urls),
+        "Similarity Score": [0.5] * len(urls),
+    })
+
+
+def test_rerun_does_not_duplicate_posts(tmp_path):
+    csv_path = str(tmp_path / "LinkedIn_posts_result.csv")
+    save_results(posts_frame(["u1", "u2"]), "linkedin_posts", "DocURL", "AI", csv_path, write_mode="append")
+    save_results(posts_frame(["u2", "u1", "u3"]), "linkedin_posts", "DocURL", "AI", csv_path, write_mode="append")
+
+    stored = pd.read_csv(csv_path)
+    assert stored["DocURL"].tolist() == ["u1", "u2", "u3"]
+
+
+def test_rerun_does_not_duplicate_comments(tmp_path):
+    csv_path = str(tmp_path / "LinkedIn_comments.csv")
+    comments = pd.DataFrame({
+        "Profile Link": ["p1", "p2", "p1"],
+        "Original Post URL": ["u1", "u1", "u1"],
+        "Comment Text": ["nice", "nice", "agreed"],
+        "Similarity Score": [0.1, 0.2, 0.3],
+    })
+    save_results(comments, "linkedin_comments", COMMENT_KEY, "AI", csv_path, write_mode="append")
+    save_results(comments, "linkedin_comments", COMMENT_KEY, "AI", csv_path, write_mode="append")
+
+    # Several comments per post are kept, each only once
+    assert len(pd.read_csv(csv_path)) == 3
+
+
+def test_overwrite_mode_replaces_the_csv(tmp_path):
+    csv_path = str(tmp_path / "LinkedIn_posts_result.csv")
+    save_results(posts_frame(["u1", "u2"]), "linkedin_posts", "DocURL", "AI", csv_path, write_mode="overwrite")
+    save_results(posts_frame(["u3"]), "linkedin_posts", "DocURL", "AI", csv_path, write_mode="overwrite")
+
+    assert pd.read_csv(csv_path)["DocURL"].tolist() == ["u3"]
@@ -0,0 +1,72 @@
+import threading
+
+import pandas as pd
+
+from pipeline import ScoringPipeline
+
+
+def stub_score(batch):
+    return pd.DataFrame({"id": [record["id"] for record in batch],
+                         "Similarity Score": [record["id"] / 100 for record in batch]})
+
+
+def test_rows_reach_the_sink_in_submit_order():
+    written = []
+    with ScoringPipeline(stub_score, written.append, batch_size=4, max_batch_wait=0.05) as pipeline:
+        for i in range(25):
+            pipeline.submit({"id": i})
+
+    assert pd.concat(written)["id"].tolist() == list(range(25))
+    assert pipeline.scored_frame()["id"].tolist() == list(range(25))
+    assert max(len(frame) for frame in written) <= 4
+    stats = {row["stage"]: row for row in pipeline.throughput()}
+    assert stats["scrape"]["items"] == stats["score"]["items"] == stats["sink"]["items"] == 25
+
+
+def test_duplicate_records_are_dropped():
+    with ScoringPipeline(stub_score, lambda frame: None, max_batch_wait=0.05, dedupe_key="id") as pipeline:
+        for i in [1, 2, 1, 3, 2]:
+            pipeline.submit({"id": i})
+    assert pipeline.scored_frame()["id"].tolist() == [1, 2, 3]
+
+
+def test_a_failing_batch_does_not_stop_the_pipeline():
+    def score(batch):
+        if batch[0]["id"] == 0:
+            raise ValueError("model failed")
+        return stub_score(batch)
+
+    with ScoringPipeline(score, lambda frame: None, batch_size=2, max_batch_wait=0.05) as pipeline:
+        for i in range(6):
+            pipeline.submit({"id": i})
+    assert pipeline.scored_frame()["id"].tolist() == [2, 3, 4, 5]
+    assert pipeline.stats["score"].errors == 1
+
+
+def test_submit_blocks_while_scoring_is_behind():
+    release = threading.Event()
+
+    def slow_score(batch):
+        release.wait(5)
+        return stub_score(batch)
+
+    pipeline = ScoringPipeline(slow_score, lambda frame: None, batch_size=1, max_batch_wait=0.0, queue_size=2).start()
+    submitted = []
+
+    def scrape():
+        for i in range(10):
+            pipeline.submit({"id": i})
+            submitted.append(i)
+
+    scraper = threading.Thread(target=scrape, daemon=True)
+    scraper.start()
+    scraper.join(0.3)
+    # One record is being scored and the queue holds two; the scraper waits for the rest
+    assert scraper.is_alive() and len(submitted) <= 4
+
+    release.set()
+    scraper.join(5)
+    pipeline.close()
+    assert submitted == list(range(10))
+    assert pipeline.scored_frame()["id"].tolist() == list(range(10))
+    assert pipeline.stats["scrape"].blocked_seconds > 0
@@ -0,0 +1,82 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from result_store import CsvResultStore, ParquetResultStore, SqliteResultStore, typed_result_frame
+
+
+def test_sqlite_append_converts_datetime_categorical_and_numpy_values(tmp_path):
+    store = SqliteResultStore(str(tmp_path / "results.db"), "tweets", "DocURL", keyword="AI")
+    df = pd.DataFrame({
+        "DocURL": ["u1", "u2", "u3"],
+        "Date": ["2024-05-15", "2024-05-16", "bad"],
+        "Time": ["10:30:00", "08:00:00", "x"],
+        "Best Matched Intent": ["buy", "learn", "buy"],
+        "Similarity Score": [0.25, 0.5, 0.75],
+        "Likes": np.array([1, 2, 3], dtype=np.int64),
+    })
+    typed = typed_result_frame(df)  # float32 scores, categorical intents, Posted At timestamps (one NaT)
+    typed["Scraped At"] = pd.to_datetime(["2024-05-17 12:00:00+00:00"] * 3)
+    typed["Flag"] = np.array([True, False, True])
+
+    assert len(store.append(typed)) == 3
+    assert len(store.append(typed)) == 0  # the unique index ignores stored keys
+
+    stored = store.read(columns=["DocURL", "Posted At", "Scraped At", "Best Matched Intent",
+                                 "Similarity Score", "Likes", "Flag"])
+    assert stored["DocURL"].tolist() == ["u1", "u2", "u3"]
+    assert stored["Posted At"].tolist()[:2] == ["2024-05-15T10:30:00", "2024-05-16T08:00:00"]
+    assert stored["Posted At"].isna().tolist()[2]
+    assert stored["Scraped At"].tolist()[0] == "2024-05-17T12:00:00+00:00"
+    assert stored["Best Matched Intent"].tolist() == ["buy", "learn", "buy"]
+    assert stored["Similarity Score"].tolist() == [0.25, 0.5, 0.75]
+    assert stored["Likes"].tolist() == [1, 2, 3]
+    assert stored["Flag"].tolist() == [1, 0, 1]
+    assert "u2" in store and "u4" not in store
+    assert store.count() == 3
+
+
+def test_csv_store_looks_keys_up_in_its_index(tmp_path):
+    path = str(tmp_path / "tweets.csv")
+    pd.DataFrame({"DocURL": ["u1", "u2"], "Text": ["a", "b"]}).to_csv(path, index=False)
+
+    store = CsvResultStore(path, "DocURL")  # the index is built once from the key column
+    assert "u1" in store and "u3" not in store
+    assert store.count() == 2
+
+    written = store.append(pd.DataFrame({"DocURL": ["u2", "u3", "u3"], "Text": ["b", "c", "c"]}))
+    assert written["DocURL"].tolist() == ["u3"]
+    assert "u3" in CsvResultStore(path, "DocURL")  # persisted, seen by a fresh store
+    assert store.count() == 3
+
+    store.compact()
+    assert store.keys() == {"u1", "u2", "u3"}
+    assert len(store.read()) == 3
+
+
+def test_csv_index_is_rebuilt_when_the_csv_is_deleted_or_replaced(tmp_path):
+    path = str(tmp_path / "tweets.csv")
+    CsvResultStore(path, "DocURL").append(pd.DataFrame({"DocURL": ["u1", "u2"]}))
+
+    os.remove(path)  # the index file survives
+    store = CsvResultStore(path, "DocURL")
+    assert "u1" not in store
+    assert store.append(pd.DataFrame({"DocURL": ["u1"]}))["DocURL"].tolist() == ["u1"]
+
+    pd.DataFrame({"DocURL": ["u7", "u8"]}).to_csv(path, index=False)  # replaced by hand
+    store = CsvResultStore(path, "DocURL")
+    assert store.keys() == {"u7", "u8"}
+
+
+def test_parquet_index_follows_its_files(tmp_path):
+    path = str(tmp_path / "tweets")
+    store = ParquetResultStore(path, "DocURL", keyword="AI", date_column="Date")
+    store.append(pd.DataFrame({"DocURL": ["u1", "u2"], "Date": ["2024-05-15", "2024-05-16"]}))
+    store.append(pd.DataFrame({"DocURL": ["u3"], "Date": ["2024-05-15"]}))
+    store.compact()
+    assert ParquetResultStore(path, "DocURL").keys() == {"u1", "u2", "u3"}
+
+    shutil.rmtree(path)
+    assert "u1" not in ParquetResultStore(path, "DocURL")
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from result_store import CsvResultStore, SqliteResultStore
+from seen_filter import BloomFilter, SeenSet, default_filter_path
+
+
+def test_bloom_filter_counts_a_key_once(tmp_path):
+    bloom = BloomFilter(str(tmp_path / "urls.bloom"), capacity=1000)
+    assert bloom.add("u1") and not bloom.add("u1")
+    assert bloom.count == 1
+    bloom.close()
+
+
+def test_store_appends_reach_the_filter(tmp_path):
+    store = SqliteResultStore(str(tmp_path / "results.db"), "tweets", "DocURL")
+    store.append(pd.DataFrame({"DocURL": ["u1"]}))
+    seen = SeenSet(store, capacity=1000)
+    assert "u1" in seen
+
+    # Written by another store object (an import, another process), not through seen.add
+    SqliteResultStore(store.path, "tweets", "DocURL").append(pd.DataFrame({"DocURL": ["u2", "u3"]}))
+    assert "u2" in seen and "u3" in seen
+    assert seen.filter.store_rows == store.count() == 3
+    assert seen.store_checks == 3 and seen.false_positives == 0
+    seen.close()
+
+
+def test_filter_is_rebuilt_when_the_store_changed_behind_it(tmp_path):
+    store = CsvResultStore(str(tmp_path / "tweets.csv"), "DocURL")
+    store.append(pd.DataFrame({"DocURL": ["u1", "u2"]}))
+    BloomFilter(default_filter_path(store), capacity=1000).close()  # a filter that never saw those rows
+
+    seen = SeenSet(store, capacity=1000)
+    assert seen.filter.store_rows == 2 and len(seen) == 2
+    assert "u1" in seen and "u2" in seen
+    seen.close()
+
+
+def test_urls_collected_this_run_are_seen_before_they_are_stored(tmp_path):
+    store = SqliteResultStore(str(tmp_path / "results.db"), "replies", "ReplyURL")
+    seen = SeenSet(store, capacity=1000)
+    assert "r1" not in seen
+    seen.add("r1")
+    assert "r1" in seen
+    assert seen.store_checks == 0 and seen.false_positives == 0
+    assert len(seen) == 0  # the filter only learns about r1 once it is stored
+    seen.close()
@@ -0,0 +1,61 @@
+import os
+
+from x_network import (SEARCH_OPERATION, CONVERSATION_OPERATION, load_recording, tweets_from_responses,
+                       conversation_replies, conversation_id_of, tweet_id_from_url)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+FOCAL_ID = "1790400000000000002"
+
+
+def recording(name):
+    return load_recording(os.path.join(FIXTURES, name))
+
+
+def test_search_timeline_tweets():
+    tweets = tweets_from_responses(recording("x_search_timeline.json"), SEARCH_OPERATION)
+
+    assert [tweet["id"] for tweet in tweets] == [
+        "1790500000000000003", "1790400000000000002", "1790300000000000001", "1790200000000000004"]
+    first = tweets[0]
+    assert first["url"] == "https://x.com/ml_weekly/status/1790500000000000003"
+    assert first["handle"] == "ml_weekly"
+    # HTML entities in full_text are unescaped
+    assert first["text"] == ("Which AI tools are worth using this year? Our shortlist for small teams "
+                             "& solo founders https://t.co/abc123")
+    assert first["created_at"] == "2024-05-15T10:30:00+00:00"
+    assert tweets[1]["text"].startswith("Thread on how AI can help small businesses grow.")
+
+
+def test_tweet_detail_replies():
+    tweets = tweets_from_responses(recording("x_tweet_detail.json"), CONVERSATION_OPERATION)
+    assert conversation_id_of(tweets, FOCAL_ID) == FOCAL_ID
+
+    replies = conversation_replies(tweets, FOCAL_ID)
+
+    # The focal tweet and the injected "Discover more" tweet from another conversation are excluded
+    assert [reply["id"] for reply in replies] == [
+        "1790410000000000005", "1790420000000000006", "1790430000000000007"]
+    assert [reply["url"] for reply in replies] == [
+        "https://x.com/data_dan/status/1790410000000000005",
+        "https://x.com/ml_weekly/status/1790420000000000006",
+        "https://x.com/opensource_ai/status/1790430000000000007",
+    ]
+    # Leading @mentions are cut using display_text_range
+    assert replies[2]["text"] == "great thread"
+    assert replies[1]["in_reply_to_id"] == "1790410000000000005"
+
+
+def test_unrelated_conversation_is_not_a_reply():
+    tweets = tweets_from_responses(recording("x_tweet_detail.json"), CONVERSATION_OPERATION)
+    unrelated = [tweet for tweet in tweets if tweet["id"] == "1790440000000000008"]
+    assert unrelated and unrelated[0]["in_reply_to_id"]  # would pass the old id/in_reply_to check
+
+    assert "1790440000000000008" not in {reply["id"] for reply in conversation_replies(tweets, FOCAL_ID)}
+    # Later responses without the focal tweet keep using the conversation found earlier
+    later = [tweet for tweet in tweets if tweet["id"] != FOCAL_ID]
+    assert len(conversation_replies(later, FOCAL_ID, conversation_id=FOCAL_ID)) == 3
+
+
+def test_tweet_id_from_url():
+    assert tweet_id_from_url("https://x.com/priya_builds/status/1790400000000000002?s=20") == FOCAL_ID
+    assert tweet_id_from_url("https://x.com/priya_builds/status/1790400000000000002/photo/1") == FOCAL_ID
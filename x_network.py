@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import html
+import base64
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Network-response capture for X. The search and conversation pages fetch
+# their timelines as GraphQL JSON; instead of scraping the rendered cells we
+# read those responses from Chrome's performance log and parse the tweets out
+# of them. Responses can be saved to a recording and parsed again offline:
+#
+#     python x_network.py fixtures/x_search_timeline.json
+
+# Set X_NETWORK_CAPTURE=1 to launch browsers with network logging and read
+# tweets and replies from the responses instead of the page
+NETWORK_CAPTURE = os.environ.get("X_NETWORK_CAPTURE", "0") == "1"
+
+# GraphQL operations whose responses carry tweets
+SEARCH_OPERATION = "SearchTimeline"
+CONVERSATION_OPERATION = "TweetDetail"
+TIMELINE_OPERATIONS = (SEARCH_OPERATION, CONVERSATION_OPERATION)
+
+
+def enable_network_logging(chrome_options):
+    """Turn on Chrome's performance log (network events only) before the driver is launched."""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return chrome_options
+
+
+def graphql_operation(url):
+    """Operation name of an X GraphQL URL (/i/api/graphql/<query id>/<operation>), or None."""
+    path = urlparse(url).path
+    if "/graphql/" not in path:
+        return None
+    return path.rstrip("/").rsplit("/", 1)[-1]
+
+
+class NetworkCapture:
+    """
+    Collects X timeline responses the page has fetched, from the performance log.
+
+    Args:
+        driver: Chrome driver launched with enable_network_logging
+        operations: GraphQL operations to keep
+    """
+
+    def __init__(self, driver, operations=TIMELINE_OPERATIONS):
+        self.driver = driver
+        self.operations = set(operations)
+        self.recorded = []  # every response returned by responses(), for save()
+        self._pending = {}  # requestId -> url, waiting for Network.loadingFinished
+
+    def reset(self):
+        """Discard everything logged so far (e.g. by the previous page a pooled browser showed)."""
+        self.driver.get_log("performance")
+        self._pending.clear()
+
+    def responses(self):
+        """Parsed JSON bodies of the timeline responses that finished loading since the last call."""
+        finished = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if graphql_operation(url) in self.operations:
+                    self._pending[params["requestId"]] = url
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                finished.append((params["requestId"], self._pending.pop(params["requestId"])))
+
+        responses = []
+        for request_id, url in finished:
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8")
+                responses.append({"operation": graphql_operation(url), "url": url, "body": json.loads(text)})
+            except Exception as e:
+                print(f"Could not read response body for {graphql_operation(url)}: {str(e)}")
+        self.recorded.extend(responses)
+        return responses
+
+    def tweets(self, operation=None):
+        """Tweets from the responses that finished since the last call."""
+        return tweets_from_responses(self.responses(), operation)
+
+    def save(self, path):
+        """Write every response seen so far to a JSON recording (see load_recording)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.recorded, f, ensure_ascii=False, indent=1)
+
+
+def start_capture(driver, operations=TIMELINE_OPERATIONS):
+    """A NetworkCapture with the log cleared, or None if the driver wasn't launched with network logging."""
+    capture = NetworkCapture(driver, operations)
+    try:
+        capture.reset()
+    except Exception as e:
+        print(f"Network capture unavailable ({str(e)}), reading the page instead")
+        return None
+    return capture
+
+
+def load_recording(path):
+    """Responses saved by NetworkCapture.save: a list of {operation, url, body}."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tweet_results(node):
+    """Yield every tweet result in a timeline payload, skipping ads and not descending into quoted tweets."""
+    if isinstance(node, dict):
+        if "tweet_results" in node:
+            if "promotedMetadata" not in node:
+                result = node["tweet_results"].get("result")
+                if result:
+                    yield result
+            return
+        for value in node.values():
+            yield from _tweet_results(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _tweet_results(value)
+
+
+def parse_tweet(result):
+    """Flatten one GraphQL tweet result into a dict, or None for tombstones and unavailable tweets."""
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+    legacy = result.get("legacy")
+    if not legacy or not result.get("rest_id"):
+        return None
+
+    user = result.get("core", {}).get("user_results", {}).get("result", {})
+    screen_name = user.get("core", {}).get("screen_name") or user.get("legacy", {}).get("screen_name")
+    name = user.get("core", {}).get("name") or user.get("legacy", {}).get("name")
+    if not screen_name:
+        return None
+
+    # Long posts carry their full text in note_tweet; legacy.full_text is truncated,
+    # HTML-escaped and starts with the @mentions of the tweets being replied to
+    note = result.get("note_tweet", {}).get("note_tweet_results", {}).get("result", {})
+    if note.get("text"):
+        text = note["text"]
+    else:
+        text = legacy.get("full_text", "")
+        start, end = legacy.get("display_text_range", [0, len(text)])
+        text = html.unescape(text[start:end])
+
+    created_at = datetime.strptime(legacy["created_at"], "%a %b %d %H:%M:%S %z %Y")
+    views = result.get("views", {}).get("count")
+    return {
+        "id": result["rest_id"],
+        "url": f"https://x.com/{screen_name}/status/{result['rest_id']}",
+        "handle": screen_name,
+        "name": name,
+        "text": text,
+        "created_at": created_at.isoformat(),
+        "conversation_id": legacy.get("conversation_id_str"),
+        "in_reply_to_id": legacy.get("in_reply_to_status_id_str"),
+        "reply_count": legacy.get("reply_count"),
+        "retweet_count": legacy.get("retweet_count"),
+        "like_count": legacy.get("favorite_count"),
+        "quote_count": legacy.get("quote_count"),
+        "view_count": int(views) if views else None,
+        "lang": legacy.get("lang"),
+    }
+
+
+def tweets_from_responses(responses, operation=None):
+    """Parse the tweets out of a list of captured responses, once each, in timeline order."""
+    tweets = []
+    seen_ids = set()
+    for response in responses:
+        if operation and response.get("operation") != operation:
+            continue
+        for result in _tweet_results(response.get("body")):
+            tweet = parse_tweet(result)
+            if tweet and tweet["id"] not in seen_ids:
+                seen_ids.add(tweet["id"])
+                tweets.append(tweet)
+    return tweets
+
+
+def tweet_id_from_url(tweet_url):
+    """Status id from a tweet URL such as https://x.com/user/status/123?s=20."""
+    return urlparse(tweet_url).path.rstrip("/").rsplit("/status/", 1)[-1].split("/")[0]
+
+
+def conversation_id_of(tweets, tweet_id):
+    """Conversation the focal tweet belongs to, or None if the responses don't include it."""
+    for tweet in tweets:
+        if tweet["id"] == tweet_id and tweet["conversation_id"]:
+            return tweet["conversation_id"]
+    return None
+
+
+def conversation_replies(tweets, tweet_id, conversation_id=None):
+    """
+    Tweets posted in reply under tweet_id's conversation (the tweet itself and the thread above it
+    excluded). Tweets from other conversations that TweetDetail injects, such as "Discover more"
+    recommendations, are left out.
+
+    Args:
+        conversation_id: The focal tweet's conversation; looked up in tweets when not given,
+            and assumed to be tweet_id if the focal tweet isn't there either
+    """
+    conversation_id = conversation_id or conversation_id_of(tweets, tweet_id) or tweet_id
+    return [tweet for tweet in tweets
+            if tweet["conversation_id"] == conversation_id and tweet["id"] != tweet_id
+            and tweet["in_reply_to_id"] and int(tweet["id"]) > int(tweet_id)]
+
+
+if __name__ == "__main__":
+    # Offline check: parse one or more recordings and print what a scrape would collect
+    for path in sys.argv[1:] or [os.path.join("fixtures", "x_search_timeline.json"),
+                                 os.path.join("fixtures", "x_tweet_detail.json")]:
+        tweets = tweets_from_responses(load_recording(path))
+        print(f"{path}: {len(tweets)} tweets")
+        for tweet in tweets:
+            print(f"  {tweet['created_at']}  @{tweet['handle']:<16} {tweet['like_count']:>5} likes  "
+                  f"{tweet['text'][:60]!r}")